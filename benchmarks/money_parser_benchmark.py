@@ -0,0 +1,81 @@
+"""Micro-benchmark of MoneyParser against the previous regex-per-step implementation.
+
+Run from the project directory:
+
+    python -m benchmarks.money_parser_benchmark
+"""
+import random
+import re
+import timeit
+
+from exception.format_not_supported import FormatNotSupportedException
+from hive.service.money_parser import MoneyParser
+
+FORMATS = ['{:,}.{:02d}', '{}.{:02d}', '{},{:02d}', '{}']
+VALUES = 100000
+REPEAT = 5
+
+
+class LegacyMoneyParser:
+    """The parser as it was before the compiled grammar, kept as the baseline."""
+
+    def convert(self, data, append_penny=True):
+        if data is None:
+            raise FormatNotSupportedException(data)
+        if self.__match_us_german_penny_format(data):
+            return self.__convert_to_int(data)
+        if re.match(r'^(\d{1,3}( \d{3})*)\.\d{3}$', data):
+            result = data[:-1] if append_penny else data[:-3]
+            return self.__convert_to_int(result)
+        result = re.sub(r'[^\d.,]+|[.,](?=\d+\.\d+|$)', '', data)
+        if re.search(r'[.,]\d{3}(?![\d.,])', result):
+            result = re.sub(r'[.,]', '', result)
+        if result.isdigit():
+            if append_penny:
+                result = result + '00'
+            return self.__convert_to_int(result)
+        if re.match(r'^\d*[.,]\d$', result):
+            return self.__convert_to_int(result) * 10
+        if result.endswith('.') or result.endswith(','):
+            return self.__convert_to_int(result) * 100
+        raise FormatNotSupportedException(data)
+
+    @staticmethod
+    def __convert_to_int(data):
+        return int(re.sub(r'[., ]', '', data))
+
+    @staticmethod
+    def __match_us_german_penny_format(data):
+        return re.match(r'^((?:\d+)(?:,\d{3})+)\.(\d{2})$', data) \
+            or re.match(r'^(\d{1,3}( \d{3})*)\.\d{3},\d{2}$', data) \
+            or re.match(r'^(\d+)[.,](\d{2})$', data)
+
+
+def prepare_values(distinct: int) -> list:
+    random.seed(distinct)
+    literals = [FORMATS[i % len(FORMATS)].format(random.randint(0, 10 ** 7), random.randint(0, 99))
+                for i in range(distinct)]
+    return [random.choice(literals) for _ in range(VALUES)]
+
+
+def measure(function) -> float:
+    return min(timeit.repeat(function, number=1, repeat=REPEAT))
+
+
+def main():
+    legacy_parser = LegacyMoneyParser()
+    money_parser = MoneyParser()
+    print(f"{'values':>8} {'distinct':>9} {'legacy':>9} {'convert':>9} {'convert_many':>13} {'speedup':>8}")
+    for distinct in (VALUES, 1000, 10):
+        values = prepare_values(distinct)
+        expected = [legacy_parser.convert(value) for value in values]
+        if money_parser.convert_many(values) != expected:
+            raise AssertionError("MoneyParser results differ from the legacy parser.")
+        legacy = measure(lambda: [legacy_parser.convert(value) for value in values])
+        single = measure(lambda: [money_parser.convert(value) for value in values])
+        many = measure(lambda: money_parser.convert_many(values))
+        print(f"{VALUES:>8} {distinct:>9} {legacy:>8.3f}s {single:>8.3f}s {many:>12.3f}s {legacy / many:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,16 +8,44 @@ class HiveConfig(AppConfig):
     name = 'hive'
 
     def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
         from hive.di.base_container import BaseContainer
         from hive.di.repository_container import RepositoryContainer
+        from hive.entity.entity_model import Entity
 
         repository_container = RepositoryContainer()
         base_container = BaseContainer()
         base_container.wire(modules=["hive.controllers.create_controller",
                                      "hive.controllers.delete_controller",
-                                     "hive.controllers.storage_controller"
+                                     "hive.controllers.storage_controller",
+                                     "hive.controllers.batch_storage_controller",
+                                     "hive.controllers.read_storage_controller",
+                                     "hive.controllers.multiget_storage_controller",
+                                     "hive.controllers.export_storage_controller",
+                                     "hive.controllers.aggregate_storage_controller",
+                                     "hive.controllers.index_controller",
+                                     "hive.controllers.trash_controller",
+                                     "hive.controllers.metrics_controller",
+                                     "hive.controllers.async_storage_controller",
+                                     "hive.controllers.async_read_storage_controller"
                                      ])
         repository_container.wire(modules=["hive.controllers.create_controller",
                                            "hive.controllers.delete_controller",
-                                           "hive.controllers.storage_controller"
+                                           "hive.controllers.storage_controller",
+                                           "hive.controllers.batch_storage_controller",
+                                           "hive.controllers.read_storage_controller",
+                                           "hive.controllers.multiget_storage_controller",
+                                           "hive.controllers.export_storage_controller",
+                                           "hive.controllers.aggregate_storage_controller",
+                                           "hive.controllers.index_controller",
+                                           "hive.controllers.trash_controller",
+                                           "hive.controllers.metrics_controller",
+                                           "hive.controllers.async_storage_controller",
+                                           "hive.controllers.async_read_storage_controller"
                                            ])
+
+        entity_change_service = base_container.entity_change_service()
+        post_save.connect(entity_change_service.on_entity_changed, sender=Entity, weak=False)
+        post_delete.connect(entity_change_service.on_entity_changed, sender=Entity, weak=False)
+        self.base_container = base_container
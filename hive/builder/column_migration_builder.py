@@ -0,0 +1,73 @@
+from psycopg import sql
+
+
+class ColumnMigrationBuilder:
+    """Builds the statements of an online column migration, each one a short catalog change."""
+
+    def __init__(self, schema: str, table_name: str):
+        self.__schema = schema
+        self.__table_name = table_name
+
+    def alter_type(self, column: str, sql_type: str) -> sql.Composed:
+        return self.__alter_table(sql.SQL("ALTER COLUMN {} TYPE {}").format(sql.Identifier(column), sql.SQL(sql_type)))
+
+    def set_default(self, column: str, default) -> sql.Composed:
+        if default is None:
+            return self.__alter_table(sql.SQL("ALTER COLUMN {} DROP DEFAULT").format(sql.Identifier(column)))
+        return self.__alter_table(sql.SQL("ALTER COLUMN {} SET DEFAULT {}").format(sql.Identifier(column),
+                                                                                   sql.Literal(default)))
+
+    def set_not_null(self, column: str) -> sql.Composed:
+        return self.__alter_table(sql.SQL("ALTER COLUMN {} SET NOT NULL").format(sql.Identifier(column)))
+
+    def drop_not_null(self, column: str) -> sql.Composed:
+        return self.__alter_table(sql.SQL("ALTER COLUMN {} DROP NOT NULL").format(sql.Identifier(column)))
+
+    def add_not_null_check(self, column: str, constraint: str) -> sql.Composed:
+        # NOT VALID skips the scan, existing rows are checked later by VALIDATE without blocking writes
+        return self.__alter_table(sql.SQL("ADD CONSTRAINT {} CHECK ({} IS NOT NULL) NOT VALID").format(
+            sql.Identifier(constraint), sql.Identifier(column)))
+
+    def add_length_check(self, column: str, length: int, constraint: str) -> sql.Composed:
+        return self.__alter_table(sql.SQL("ADD CONSTRAINT {} CHECK (char_length(CAST({} AS text)) <= {}) "
+                                          "NOT VALID").format(sql.Identifier(constraint), sql.Identifier(column),
+                                                              sql.Literal(length)))
+
+    def validate_constraint(self, constraint: str) -> sql.Composed:
+        return self.__alter_table(sql.SQL("VALIDATE CONSTRAINT {}").format(sql.Identifier(constraint)))
+
+    def drop_constraint(self, constraint: str) -> sql.Composed:
+        return self.__alter_table(sql.SQL("DROP CONSTRAINT IF EXISTS {}").format(sql.Identifier(constraint)))
+
+    def add_column(self, column: str, sql_type: str) -> sql.Composed:
+        return self.__alter_table(sql.SQL("ADD COLUMN {} {}").format(sql.Identifier(column), sql.SQL(sql_type)))
+
+    def drop_column(self, column: str) -> sql.Composed:
+        return self.__alter_table(sql.SQL("DROP COLUMN IF EXISTS {}").format(sql.Identifier(column)))
+
+    def rename_column(self, column: str, new_name: str) -> sql.Composed:
+        return self.__alter_table(sql.SQL("RENAME COLUMN {} TO {}").format(sql.Identifier(column),
+                                                                           sql.Identifier(new_name)))
+
+    def create_sync_trigger(self, name: str, column: str, shadow: str, sql_type: str) -> list:
+        # keeps the shadow column of rows written during the backfill up to date
+        function = sql.SQL("CREATE OR REPLACE FUNCTION {}.{}() RETURNS trigger LANGUAGE plpgsql AS $$ "
+                           "BEGIN NEW.{} := CAST(NEW.{} AS {}); RETURN NEW; END $$").format(
+            sql.Identifier(self.__schema), sql.Identifier(name), sql.Identifier(shadow), sql.Identifier(column),
+            sql.SQL(sql_type))
+        trigger = sql.SQL("CREATE TRIGGER {} BEFORE INSERT OR UPDATE ON {}.{} FOR EACH ROW "
+                          "EXECUTE FUNCTION {}.{}()").format(
+            sql.Identifier(name), sql.Identifier(self.__schema), sql.Identifier(self.__table_name),
+            sql.Identifier(self.__schema), sql.Identifier(name))
+        return [function, trigger]
+
+    def drop_sync_trigger(self, name: str) -> list:
+        return [
+            sql.SQL("DROP TRIGGER IF EXISTS {} ON {}.{}").format(sql.Identifier(name), sql.Identifier(self.__schema),
+                                                                 sql.Identifier(self.__table_name)),
+            sql.SQL("DROP FUNCTION IF EXISTS {}.{}()").format(sql.Identifier(self.__schema), sql.Identifier(name)),
+        ]
+
+    def __alter_table(self, action: sql.Composable) -> sql.Composed:
+        return sql.SQL("ALTER TABLE {}.{} {}").format(sql.Identifier(self.__schema),
+                                                      sql.Identifier(self.__table_name), action)
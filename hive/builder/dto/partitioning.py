@@ -0,0 +1,52 @@
+import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class Partitioning(BaseModel):
+    type: str
+    field: Optional[str] = None
+    interval: str = 'month'
+    premake: int = 3
+    partitions: int = 8
+
+    def get_period_start(self, day: datetime.date) -> datetime.date:
+        if self.interval == 'year':
+            return day.replace(month=1, day=1)
+        if self.interval == 'month':
+            return day.replace(day=1)
+        if self.interval == 'week':
+            return day - datetime.timedelta(days=day.weekday())
+        return day
+
+    def get_next_period(self, start: datetime.date) -> datetime.date:
+        if self.interval == 'year':
+            return start.replace(year=start.year + 1)
+        if self.interval == 'month':
+            return start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+        if self.interval == 'week':
+            return start + datetime.timedelta(weeks=1)
+        return start + datetime.timedelta(days=1)
+
+    def get_upcoming_periods(self, today: datetime.date) -> list:
+        """The current period and the `premake` ones after it, as (start, end) pairs."""
+        periods = []
+        start = self.get_period_start(today)
+        for _ in range(self.premake + 1):
+            end = self.get_next_period(start)
+            periods.append((start, end))
+            start = end
+        return periods
+
+    @staticmethod
+    def get_range_partition_name(table_name: str, start: datetime.date) -> str:
+        return f"{table_name}_p{start:%Y%m%d}"
+
+    @staticmethod
+    def get_hash_partition_name(table_name: str, remainder: int) -> str:
+        return f"{table_name}_h{remainder}"
+
+    @staticmethod
+    def get_default_partition_name(table_name: str) -> str:
+        return f"{table_name}_default"
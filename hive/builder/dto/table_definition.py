@@ -0,0 +1,22 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from hive.builder.dto.field import Field
+from hive.builder.dto.partitioning import Partitioning
+
+
+class TableDefinition(BaseModel):
+    name: str
+    identity: List[str]
+    primary_keys: List[str]
+    fields: List[Field]
+    partitioning: Optional[Partitioning] = None
+
+    @classmethod
+    def from_entity(cls, entity) -> 'TableDefinition':
+        return cls(name=entity.name, identity=entity.identity, primary_keys=entity.primary_keys,
+                   fields=[Field(name=field.get('name'), type=field.get('type'), config=field.get('config'),
+                                 nullable=field.get('nullable'), default=field.get('default'))
+                           for field in entity.fields],
+                   partitioning=Partitioning(**entity.partitioning) if entity.partitioning else None)
@@ -0,0 +1,133 @@
+from psycopg import sql
+from rest_framework import serializers
+
+from hive.builder.dto.field import Field
+from hive.builder.dto.partitioning import Partitioning
+from hive.builder.dto.table_definition import TableDefinition
+from hive.repository.entity_repository import EntityRepository
+from hive.validator.physical_table_storage_validator import PhysicalTableStorageValidator
+
+
+class TableCompiler:
+    """Compiles table definitions into DDL. It keeps no state between calls, so one instance serves every request."""
+
+    def __init__(self,
+                 physical_table_storage_validator: PhysicalTableStorageValidator,
+                 schema: str,
+                 entity_repository: EntityRepository
+                 ):
+        self.__physical_table_storage_validator = physical_table_storage_validator
+        self.__entity_repository = entity_repository
+        self.__schema = schema
+
+    def create_table(self, definition: TableDefinition) -> sql.Composed:
+        self.__physical_table_storage_validator.validate_name(definition.name)
+        columns = sql.SQL(", ").join([self.__create_column(field) for field in definition.fields])
+        query = sql.SQL("CREATE TABLE {}.{} ({} ,PRIMARY KEY ({}), UNIQUE ({})){}").format(
+            sql.Identifier(self.__schema), sql.Identifier(definition.name), columns,
+            self.__column_list(definition.primary_keys), self.__column_list(definition.identity),
+            self.__partition_by(definition))
+        if definition.partitioning:
+            query += self.__create_partitions(definition)
+        return query + sql.SQL(";")
+
+    def alter_table(self, name: str, add_fields: list, remove_fields: list, existing_columns: list) -> sql.Composed:
+        self.__physical_table_storage_validator.validate_name(name)
+        actions = [sql.SQL("ADD COLUMN {}").format(self.__create_column(field))
+                   for field in add_fields if field.name not in existing_columns]
+        actions += [sql.SQL("DROP COLUMN {}").format(sql.Identifier(field.name))
+                    for field in remove_fields if field.name in existing_columns]
+        if not actions:
+            raise serializers.ValidationError("No changes to apply.")
+        return sql.SQL("ALTER TABLE {}.{} {};").format(sql.Identifier(self.__schema), sql.Identifier(name),
+                                                       sql.SQL(", ").join(actions))
+
+    def drop_table(self, name: str) -> sql.Composed:
+        self.__physical_table_storage_validator.validate_name(name)
+        return sql.SQL("DROP TABLE IF EXISTS {}.{};").format(sql.Identifier(self.__schema), sql.Identifier(name))
+
+    def trash_table(self, name: str, partitions: list, indexes: list, trash_schema: str, trash_name: str) -> list:
+        """Statements moving a table and its partitions into the trash schema, none of them touches the data."""
+        self.__physical_table_storage_validator.validate_name(name)
+        queries = [sql.SQL("CREATE SCHEMA IF NOT EXISTS {};").format(sql.Identifier(trash_schema))]
+        # indexes move with their table and keep their names, a second trashed table of the same name would clash
+        # with them. Renaming the index of a primary key or unique constraint renames the constraint as well.
+        for number, index in enumerate(indexes):
+            queries.append(sql.SQL("ALTER INDEX {}.{} RENAME TO {};").format(
+                sql.Identifier(self.__schema), sql.Identifier(index), sql.Identifier(f"{trash_name[:53]}_i{number}")))
+        # partitions keep their schema when the parent moves, they would block a new table of the same name
+        moves = [(partition, f"{trash_name[:53]}_{number}") for number, partition in enumerate(partitions)]
+        for table, new_name in moves + [(name, trash_name)]:
+            queries.append(sql.SQL("ALTER TABLE {}.{} RENAME TO {};").format(
+                sql.Identifier(self.__schema), sql.Identifier(table), sql.Identifier(new_name)))
+            queries.append(sql.SQL("ALTER TABLE {}.{} SET SCHEMA {};").format(
+                sql.Identifier(self.__schema), sql.Identifier(new_name), sql.Identifier(trash_schema)))
+        return queries
+
+    @staticmethod
+    def drop_trashed_table(trash_schema: str, trash_name: str) -> sql.Composed:
+        return sql.SQL("DROP TABLE IF EXISTS {}.{};").format(sql.Identifier(trash_schema), sql.Identifier(trash_name))
+
+    @classmethod
+    def get_column_type(cls, field: Field) -> str:
+        if field.type == 'str':
+            length = field.config['length']
+            return f"varchar({length})" if length < 4096 else "text"
+        if field.type == 'money':
+            return 'int'
+        return field.type
+
+    @staticmethod
+    def __column_list(columns: list) -> sql.Composed:
+        return sql.SQL(", ").join([sql.Identifier(column) for column in columns])
+
+    def __partition_by(self, definition: TableDefinition) -> sql.Composable:
+        if not definition.partitioning:
+            return sql.SQL("")
+        if definition.partitioning.type == 'range':
+            return sql.SQL(" PARTITION BY RANGE ({})").format(sql.Identifier(definition.partitioning.field))
+        return sql.SQL(" PARTITION BY HASH ({})").format(self.__column_list(definition.primary_keys))
+
+    def __create_partitions(self, definition: TableDefinition) -> sql.Composed:
+        table = sql.SQL("{}.{}").format(sql.Identifier(self.__schema), sql.Identifier(definition.name))
+        # upcoming range partitions are created by the partition service, rows outside of them land in default
+        if definition.partitioning.type == 'range':
+            return sql.SQL("; CREATE TABLE {}.{} PARTITION OF {} DEFAULT").format(
+                sql.Identifier(self.__schema), sql.Identifier(Partitioning.get_default_partition_name(definition.name)),
+                table)
+        modulus = definition.partitioning.partitions
+        return sql.Composed([
+            sql.SQL("; CREATE TABLE {}.{} PARTITION OF {} FOR VALUES WITH (MODULUS {}, REMAINDER {})").format(
+                sql.Identifier(self.__schema),
+                sql.Identifier(Partitioning.get_hash_partition_name(definition.name, remainder)),
+                table, sql.Literal(modulus), sql.Literal(remainder))
+            for remainder in range(modulus)
+        ])
+
+    def __create_column(self, field: Field) -> sql.Composed:
+        not_null = sql.SQL("NOT NULL") if not field.nullable else sql.SQL(" ")
+        default = self.__create_default_expression(field.type, field.default) if field.default else sql.SQL(" ")
+        column_type = self.__prepare_reference_field(field) if field.type == 'ref' else self.get_column_type(field)
+        return sql.Identifier(field.name) + sql.SQL(" ") + sql.SQL(column_type) \
+            + sql.SQL(" ") + not_null + sql.SQL(" ") + default
+
+    def __prepare_reference_field(self, field: Field) -> str:
+        storage = field.config['storage']
+        reference_field = field.config['field']
+        entity = self.__entity_repository.get_by_name(storage)
+        sql_type = self.__get_reference_type(entity, reference_field)
+        return "{sql} REFERENCES {schema}.{storage}({reference_field})".format(sql=sql_type, schema=self.__schema,
+                                                                               storage=storage,
+                                                                               reference_field=reference_field)
+
+    @staticmethod
+    def __get_reference_type(entity, reference_field):
+        for field in entity.fields:
+            if field['name'] == reference_field:
+                return field['type']
+
+    @staticmethod
+    def __create_default_expression(field_type: str, default_value: str) -> sql.SQL:
+        if field_type == "str":
+            default_value = f"'{default_value}'"
+        return sql.SQL(f"DEFAULT {default_value}")
@@ -11,6 +11,15 @@ class Configuration:
         self.__hive_user = os.getenv("HIVE_USER")
         self.__hive_pass = os.getenv("HIVE_PASS")
         self.__schema = os.getenv("STORAGE_SCHEMA")
+        self.__reference_cache_size = int(os.getenv("REFERENCE_CACHE_SIZE", 10000))
+        self.__reference_cache_ttl = float(os.getenv("REFERENCE_CACHE_TTL", 0))
+        self.__schema_lock_timeout = int(os.getenv("SCHEMA_LOCK_TIMEOUT", 2000))
+        self.__schema_lock_retries = int(os.getenv("SCHEMA_LOCK_RETRIES", 5))
+        self.__backfill_batch_size = int(os.getenv("BACKFILL_BATCH_SIZE", 5000))
+        self.__trash_schema = os.getenv("TRASH_SCHEMA", "hive_trash")
+        self.__purge_pause = float(os.getenv("PURGE_PAUSE", 1))
+        self.__statement_cache_size = int(os.getenv("STATEMENT_CACHE_SIZE", 1000))
+        self.__statement_prepare_threshold = int(os.getenv("STATEMENT_PREPARE_THRESHOLD", 5))
 
     def get_hive_user(self):
         return self.__hive_user
@@ -20,3 +29,30 @@ class Configuration:
 
     def get_schema(self):
         return self.__schema
+
+    def get_reference_cache_size(self):
+        return self.__reference_cache_size
+
+    def get_reference_cache_ttl(self):
+        return self.__reference_cache_ttl
+
+    def get_schema_lock_timeout(self):
+        return self.__schema_lock_timeout
+
+    def get_schema_lock_retries(self):
+        return self.__schema_lock_retries
+
+    def get_backfill_batch_size(self):
+        return self.__backfill_batch_size
+
+    def get_trash_schema(self):
+        return self.__trash_schema
+
+    def get_purge_pause(self):
+        return self.__purge_pause
+
+    def get_statement_cache_size(self):
+        return self.__statement_cache_size
+
+    def get_statement_prepare_threshold(self):
+        return self.__statement_prepare_threshold
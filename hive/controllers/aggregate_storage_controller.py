@@ -0,0 +1,18 @@
+from dependency_injector.wiring import Provide
+from django.http import JsonResponse
+from rest_framework.views import APIView
+
+from hive.di.base_container import BaseContainer
+from hive.service.read_service import ReadService
+
+
+class AggregateStorageController(APIView):
+    def __init__(self,
+                 read_service: ReadService = Provide[BaseContainer.read_service]
+                 ):
+        super().__init__()
+        self.__read_service = read_service
+
+    def post(self, request, entity_name: str) -> JsonResponse:
+        result = self.__read_service.aggregate(entity_name, request.data)
+        return JsonResponse(result, status=200)
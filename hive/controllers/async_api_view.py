@@ -0,0 +1,47 @@
+import json
+
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from hive.db.async_database import AsyncDatabase
+
+
+class AsyncAPIView(View):
+    """Base of the async controllers, with the token authentication and error responses of the DRF controllers.
+
+    The user of the token is loaded like in the DRF controllers, so a deactivated user loses access at once.
+    """
+    authentication = JWTAuthentication()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # clients authenticate with tokens, not with session cookies
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        try:
+            await self.__authenticate(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except exceptions.APIException as e:
+            data = e.detail if isinstance(e.detail, (list, dict)) else {'detail': e.detail}
+            response = JsonResponse(data, status=e.status_code, safe=False)
+            if isinstance(e, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                response['WWW-Authenticate'] = self.authentication.authenticate_header(request)
+            return response
+
+    @staticmethod
+    def parse(request: HttpRequest):
+        try:
+            return json.loads(request.body)
+        except ValueError as e:
+            raise exceptions.ParseError(f"JSON parse error - {str(e)}")
+
+    async def __authenticate(self, request: HttpRequest) -> None:
+        authenticated = await AsyncDatabase.run_sync(self.authentication.authenticate, request)
+        if authenticated is None:
+            raise exceptions.NotAuthenticated()
+        request.user, request.auth = authenticated
@@ -0,0 +1,21 @@
+from dependency_injector.wiring import Provide
+from django.http import JsonResponse
+
+from hive.controllers.async_api_view import AsyncAPIView
+from hive.di.base_container import BaseContainer
+from hive.service.read_service import ReadService
+
+
+class AsyncReadStorageController(AsyncAPIView):
+    def __init__(self,
+                 read_service: ReadService = Provide[BaseContainer.read_service],
+                 **kwargs
+                 ):
+        super().__init__(**kwargs)
+        self.__read_service = read_service
+
+    async def get(self, request, entity_name: str, keys: str) -> JsonResponse:
+        fields = request.GET.get('fields')
+        record = await self.__read_service.aget(entity_name, keys.strip('/').split('/'),
+                                                fields.split(',') if fields else None)
+        return JsonResponse(record, status=200)
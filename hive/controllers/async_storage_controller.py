@@ -0,0 +1,19 @@
+from dependency_injector.wiring import Provide
+from django.http import JsonResponse
+
+from hive.controllers.async_api_view import AsyncAPIView
+from hive.di.base_container import BaseContainer
+from hive.service.storage_service import StorageService
+
+
+class AsyncStorageController(AsyncAPIView):
+    def __init__(self,
+                 storage_service: StorageService = Provide[BaseContainer.storage_service],
+                 **kwargs
+                 ):
+        super().__init__(**kwargs)
+        self.__storage_service = storage_service
+
+    async def post(self, request, entity_name: str) -> JsonResponse:
+        new_record = await self.__storage_service.aupdate_entity_type(self.parse(request), entity_name)
+        return JsonResponse(new_record, status=201)
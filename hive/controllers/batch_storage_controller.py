@@ -0,0 +1,19 @@
+from dependency_injector.wiring import Provide
+from django.http import JsonResponse
+from rest_framework.views import APIView
+
+from hive.di.base_container import BaseContainer
+from hive.service.storage_service import StorageService
+
+
+class BatchStorageController(APIView):
+    def __init__(self,
+                 storage_service: StorageService = Provide[BaseContainer.storage_service]
+                 ):
+        super().__init__()
+        self.__storage_service = storage_service
+
+    def post(self, request, entity_name: str) -> JsonResponse:
+        records = self.__storage_service.update_entity_type_batch(request, entity_name)
+        has_errors = any('error' in record for record in records)
+        return JsonResponse({'records': records}, status=207 if has_errors else 201)
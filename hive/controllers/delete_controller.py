@@ -1,12 +1,13 @@
 from dependency_injector.wiring import Provide
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from hive.controllers.trash_controller import TrashController
 from hive.di.base_container import BaseContainer
-from hive.di.repository_container import RepositoryContainer
 from hive.repository.entity_repository import EntityRepository
+from hive.service.alter_service import AlterService
 from hive.service.delete_service import DeleteService
 
 
@@ -14,15 +15,39 @@ class DeleteController(APIView):
     permission_classes = (IsAuthenticated,)
 
     def __init__(self,
-                 entity_repository: EntityRepository = Provide[RepositoryContainer.entity_repository],
-                 delete_service: DeleteService = Provide[BaseContainer.delete_service]
+                 entity_repository: EntityRepository = Provide[BaseContainer.repository.entity_repository],
+                 delete_service: DeleteService = Provide[BaseContainer.delete_service],
+                 alter_service: AlterService = Provide[BaseContainer.alter_service]
                  ):
         super().__init__()
         self.__entity_repository = entity_repository
         self.__delete_service = delete_service
+        self.__alter_service = alter_service
+
+    def patch(self, request, name: str) -> Response:
+        entity = self.__alter_service.alter_entity(name, request.data)
+        return Response({
+            'id': entity.id,
+            'name': entity.name,
+            'fields': entity.fields,
+            'identity': entity.identity,
+            'primary_keys': entity.primary_keys,
+            'type': entity.type.name
+        }, status=status.HTTP_200_OK)
 
     def delete(self, request, name: str) -> Response:
         entity = self.__entity_repository.get_by_name(name)
+        mode = request.query_params.get('mode', 'drop')
+        if mode == 'trash':
+            entity_id = entity.id
+            trashed_table = self.__delete_service.trash_entity(entity)
+            return Response({
+                'id': entity_id,
+                'name': entity.name,
+                'trash': TrashController.serialize(trashed_table)
+            }, status=status.HTTP_202_ACCEPTED)
+        if mode != 'drop':
+            raise serializers.ValidationError(f'Invalid delete mode: {mode}')
         self.__delete_service.delete_entity(entity)
 
         return Response({
@@ -0,0 +1,42 @@
+from typing import AsyncIterator, Iterator
+
+from asgiref.sync import sync_to_async
+from dependency_injector.wiring import Provide
+from django.http import StreamingHttpResponse
+from rest_framework.views import APIView
+
+from hive.di.base_container import BaseContainer
+from hive.service.export_service import ExportService
+
+
+class ExportStorageController(APIView):
+    def __init__(self,
+                 export_service: ExportService = Provide[BaseContainer.export_service]
+                 ):
+        super().__init__()
+        self.__export_service = export_service
+
+    def get(self, request, entity_name: str) -> StreamingHttpResponse:
+        file_format = request.query_params.get('output', 'ndjson')
+        fields = request.query_params.get('fields')
+        compress = request.query_params.get('compress') == 'gzip'
+        chunks = self.__export_service.export(entity_name, file_format, fields.split(',') if fields else None,
+                                              compress, postgres_json=request.query_params.get('render') == 'postgres')
+        # Django buffers a whole sync iterator under ASGI, an async one is streamed. Only an ASGI request has a scope.
+        if getattr(request, 'scope', None) is not None:
+            chunks = self.__iterate_async(chunks)
+        filename = f"{entity_name}.{file_format}" + ('.gz' if compress else '')
+        response = StreamingHttpResponse(chunks, content_type='application/gzip' if compress
+                                         else ExportService.CONTENT_TYPES[file_format])
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @staticmethod
+    async def __iterate_async(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+        # every chunk is read on the thread of the request, where the export transaction and its cursor live
+        read = sync_to_async(next, thread_sensitive=True)
+        try:
+            while (chunk := await read(chunks, None)) is not None:
+                yield chunk
+        finally:
+            await sync_to_async(chunks.close, thread_sensitive=True)()
@@ -0,0 +1,29 @@
+from dependency_injector.wiring import Provide
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from hive.di.base_container import BaseContainer
+from hive.service.index_service import IndexService
+
+
+class IndexController(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    def __init__(self,
+                 index_service: IndexService = Provide[BaseContainer.index_service]
+                 ):
+        super().__init__()
+        self.__index_service = index_service
+
+    def get(self, request, name: str, index_name: str = None) -> Response:
+        return Response({'indexes': self.__index_service.get_indexes(name)}, status=status.HTTP_200_OK)
+
+    def post(self, request, name: str, index_name: str = None) -> Response:
+        index = self.__index_service.add_index(name, request.data)
+        return Response(index, status=status.HTTP_201_CREATED)
+
+    def delete(self, request, name: str, index_name: str = None) -> Response:
+        index = self.__index_service.drop_index(name, index_name)
+        return Response(index, status=status.HTTP_200_OK)
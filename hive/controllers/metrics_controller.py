@@ -0,0 +1,32 @@
+from dependency_injector.wiring import Provide
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from hive.di.base_container import BaseContainer
+from hive.repository.connection_pool_repository import ConnectionPoolRepository
+from hive.repository.storage_repository import StorageRepository
+from hive.service.advisory_lock_manager import AdvisoryLockManager
+
+
+class MetricsController(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    def __init__(self,
+                 lock_manager: AdvisoryLockManager = Provide[BaseContainer.lock_manager],
+                 connection_pool_repository: ConnectionPoolRepository =
+                 Provide[BaseContainer.repository.connection_pool_repository],
+                 storage_repository: StorageRepository = Provide[BaseContainer.repository.storage_repository]
+                 ):
+        super().__init__()
+        self.__lock_manager = lock_manager
+        self.__connection_pool_repository = connection_pool_repository
+        self.__storage_repository = storage_repository
+
+    def get(self, request) -> Response:
+        return Response({
+            'locks': self.__lock_manager.get_metrics(),
+            'pool': self.__connection_pool_repository.get_metrics(),
+            'statements': self.__storage_repository.get_statement_metrics()
+        }, status=status.HTTP_200_OK)
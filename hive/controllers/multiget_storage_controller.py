@@ -0,0 +1,21 @@
+from dependency_injector.wiring import Provide
+from django.http import JsonResponse
+from rest_framework import serializers
+from rest_framework.views import APIView
+
+from hive.di.base_container import BaseContainer
+from hive.service.read_service import ReadService
+
+
+class MultigetStorageController(APIView):
+    def __init__(self,
+                 read_service: ReadService = Provide[BaseContainer.read_service]
+                 ):
+        super().__init__()
+        self.__read_service = read_service
+
+    def post(self, request, entity_name: str) -> JsonResponse:
+        if not isinstance(request.data, dict):
+            raise serializers.ValidationError("Request data must be an object with keys.")
+        records = self.__read_service.get_many(entity_name, request.data.get('keys'), request.data.get('fields'))
+        return JsonResponse({'records': records}, status=200)
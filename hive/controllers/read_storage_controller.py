@@ -0,0 +1,24 @@
+from dependency_injector.wiring import Provide
+from django.http import HttpResponse, JsonResponse
+from rest_framework.views import APIView
+
+from hive.di.base_container import BaseContainer
+from hive.service.read_service import ReadService
+
+
+class ReadStorageController(APIView):
+    def __init__(self,
+                 read_service: ReadService = Provide[BaseContainer.read_service]
+                 ):
+        super().__init__()
+        self.__read_service = read_service
+
+    def get(self, request, entity_name: str, keys: str) -> HttpResponse:
+        fields = request.query_params.get('fields')
+        if request.query_params.get('render') == 'postgres':
+            record = self.__read_service.get_json(entity_name, keys.strip('/').split('/'),
+                                                  fields.split(',') if fields else None)
+            return HttpResponse(record, content_type='application/json', status=200)
+        record = self.__read_service.get(entity_name, keys.strip('/').split('/'),
+                                         fields.split(',') if fields else None)
+        return JsonResponse(record, status=200)
@@ -1,17 +1,27 @@
 from dependency_injector.wiring import Provide
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from rest_framework.views import APIView
 
 from hive.di.base_container import BaseContainer
+from hive.service.read_service import ReadService
 from hive.service.storage_service import StorageService
 
 
 class StorageController(APIView):
     def __init__(self,
-                 storage_service: StorageService = Provide[BaseContainer.storage_service]
+                 storage_service: StorageService = Provide[BaseContainer.storage_service],
+                 read_service: ReadService = Provide[BaseContainer.read_service]
                  ):
         super().__init__()
         self.__storage_service = storage_service
+        self.__read_service = read_service
+
+    def get(self, request, entity_name: str) -> HttpResponse:
+        if request.query_params.get('render') == 'postgres':
+            page = self.__read_service.find_json(entity_name, request.query_params.dict())
+            return HttpResponse(page, content_type='application/json', status=200)
+        page = self.__read_service.find(entity_name, request.query_params.dict())
+        return JsonResponse(page, status=200)
 
     def post(self, request, entity_name: str) -> JsonResponse:
         new_record = self.__storage_service.update_entity_type(request, entity_name)
@@ -0,0 +1,37 @@
+from dependency_injector.wiring import Provide
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from hive.di.base_container import BaseContainer
+from hive.entity.trashed_table_model import TrashedTable
+from hive.service.purge_service import PurgeService
+
+
+class TrashController(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    def __init__(self,
+                 purge_service: PurgeService = Provide[BaseContainer.purge_service]
+                 ):
+        super().__init__()
+        self.__purge_service = purge_service
+
+    def get(self, request, trash_id: int = None) -> Response:
+        if trash_id is not None:
+            return Response(self.serialize(self.__purge_service.get(trash_id)), status=status.HTTP_200_OK)
+        return Response({'tables': [self.serialize(trashed_table) for trashed_table in self.__purge_service.get_all()]},
+                        status=status.HTTP_200_OK)
+
+    @staticmethod
+    def serialize(trashed_table: TrashedTable) -> dict:
+        return {
+            'id': trashed_table.id,
+            'entity_name': trashed_table.entity_name,
+            'table_name': trashed_table.table_name,
+            'status': trashed_table.status,
+            'error': trashed_table.error,
+            'created_at': trashed_table.created_at,
+            'purged_at': trashed_table.purged_at
+        }
@@ -0,0 +1,78 @@
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable
+
+from asgiref.sync import sync_to_async
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
+from psycopg import AsyncClientCursor, AsyncConnection
+from psycopg_pool import AsyncConnectionPool
+
+from hive.db.postgresql.base import DatabaseWrapper
+
+
+class AsyncDatabase:
+    """psycopg AsyncConnectionPool configured from a Django database, one pool per event loop."""
+
+    def __init__(self, alias: str = DEFAULT_DB_ALIAS):
+        self.__alias = alias
+        self.__pools = weakref.WeakKeyDictionary()
+
+    async def get_pool(self) -> AsyncConnectionPool:
+        loop = asyncio.get_running_loop()
+        pool = self.__pools.get(loop)
+        if pool is None:
+            pool = self.__pools[loop] = self.__create_pool()
+            await pool.open()
+        return pool
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[AsyncConnection]:
+        pool = await self.get_pool()
+        async with pool.connection() as connection:
+            yield connection
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[AsyncConnection]:
+        async with self.connection() as connection:
+            async with connection.transaction():
+                yield connection
+
+    async def close(self) -> None:
+        pool = self.__pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool.close()
+
+    @staticmethod
+    async def run_sync(function: Callable, *args):
+        def call():
+            try:
+                return function(*args)
+            finally:
+                # the worker thread gives its Django connection back instead of keeping it
+                close_old_connections()
+
+        # the ORM and the reference lookups are synchronous, they run on the executor of the event loop
+        return await sync_to_async(call, thread_sensitive=False)()
+
+    def __create_pool(self) -> AsyncConnectionPool:
+        database = connections[self.__alias]
+        conn_params = database.get_connection_params()
+        # Django's cursor factory is synchronous, queries are bound the same way as in Django's cursors
+        conn_params.pop('cursor_factory', None)
+        if not database.settings_dict['OPTIONS'].get('server_side_binding'):
+            conn_params['cursor_factory'] = AsyncClientCursor
+        pool_options = database.settings_dict['OPTIONS'].get('pool')
+        return AsyncConnectionPool(
+            kwargs={**conn_params, 'autocommit': True},
+            configure=self.__configure,
+            check=AsyncConnectionPool.check_connection,
+            name=f'{self.__alias}-async',
+            open=False,
+            **{**DatabaseWrapper.POOL_DEFAULTS, **(pool_options if isinstance(pool_options, dict) else {})}
+        )
+
+    async def __configure(self, connection: AsyncConnection) -> None:
+        timezone_name = connections[self.__alias].timezone_name
+        if timezone_name and connection.info.parameter_status('TimeZone') != timezone_name:
+            await connection.execute("SELECT set_config('TimeZone', %s, false)", (timezone_name,))
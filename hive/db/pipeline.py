@@ -0,0 +1,17 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.db import connection
+
+
+@contextmanager
+def pipeline() -> Iterator[None]:
+    """Runs the Django connection in psycopg pipeline mode.
+
+    Statements executed in the block are sent without waiting for the results of the previous ones, a fetch or the
+    end of the block waits for all of them at once. A statement can hold only one command, COPY and CONCURRENTLY
+    index builds are not allowed.
+    """
+    connection.ensure_connection()
+    with connection.wrap_database_errors, connection.connection.pipeline():
+        yield
@@ -0,0 +1,124 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base
+from psycopg import IsolationLevel
+from psycopg_pool import ConnectionPool
+
+from hive.db.postgresql.creation import DatabaseCreation
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend that borrows its connections from a psycopg_pool pool shared by the threads of a process.
+
+    OPTIONS['pool'] holds the pool settings, OPTIONS['pgbouncer'] turns off everything that needs a session
+    of its own, so the backend can run behind a transaction pooler. OPTIONS['direct'] holds the host and port
+    that reach PostgreSQL past the pooler, for the few connections that need a session.
+    """
+    creation_class = DatabaseCreation
+
+    POOL_DEFAULTS = {'min_size': 2, 'max_size': 10, 'max_lifetime': 1800.0, 'max_idle': 600.0, 'timeout': 30.0}
+
+    _pools: Dict[Tuple[str, Optional[str]], ConnectionPool] = {}
+    _pools_lock = threading.Lock()
+
+    @property
+    def pool_options(self) -> Optional[dict]:
+        options = self.settings_dict['OPTIONS'].get('pool')
+        # connections to the maintenance database are short-lived, pooling them only keeps it busy
+        if not options or self.alias == NO_DB_ALIAS:
+            return None
+        return {**self.POOL_DEFAULTS, **(options if isinstance(options, dict) else {})}
+
+    @property
+    def pgbouncer(self) -> bool:
+        return bool(self.settings_dict['OPTIONS'].get('pgbouncer'))
+
+    @property
+    def pool(self) -> Optional[ConnectionPool]:
+        options = self.pool_options
+        if options is None:
+            return None
+        key = (self.alias, self.settings_dict['NAME'])
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(
+                    kwargs=self.get_connection_params(),
+                    check=ConnectionPool.check_connection,
+                    name=self.alias,
+                    open=False,
+                    **options
+                )
+                pool.open(wait=True, timeout=options['timeout'])
+                self._pools[key] = pool
+        return pool
+
+    @classmethod
+    def close_pools(cls, name: Optional[str] = None) -> None:
+        with cls._pools_lock:
+            for key in [key for key in cls._pools if name is None or key[1] == name]:
+                cls._pools.pop(key).close()
+
+    def get_pool_metrics(self) -> dict:
+        pool = self.pool
+        if pool is None:
+            return {}
+        stats = pool.get_stats()
+        used = stats['pool_size'] - stats['pool_available']
+        return {
+            **stats,
+            'pool_used': used,
+            'saturation': round(used / stats['pool_max'], 3),
+            'pgbouncer': self.pgbouncer
+        }
+
+    def get_connection_params(self) -> dict:
+        conn_params = super().get_connection_params()
+        conn_params.pop('pool', None)
+        conn_params.pop('pgbouncer', None)
+        conn_params.pop('direct', None)
+        if self.pgbouncer:
+            if self.settings_dict['OPTIONS'].get('assume_role'):
+                raise ImproperlyConfigured("OPTIONS['assume_role'] sets session state and cannot be used with "
+                                           "OPTIONS['pgbouncer'].")
+            # a transaction pooler hands every transaction a different server, named statements would not be there
+            conn_params['prepare_threshold'] = None
+        return conn_params
+
+    def get_direct_connection_params(self) -> dict:
+        """Parameters of a connection that keeps its session, past pgbouncer in pgbouncer mode."""
+        conn_params = self.get_connection_params()
+        if not self.pgbouncer:
+            return conn_params
+        direct = self.settings_dict['OPTIONS'].get('direct')
+        if not direct:
+            # without LISTEN the entity caches of every worker would never hear of a schema change
+            raise ImproperlyConfigured("OPTIONS['pgbouncer'] needs OPTIONS['direct'] for the entity change listener.")
+        return {**conn_params, **direct}
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        isolation_level = self.settings_dict['OPTIONS'].get('isolation_level')
+        try:
+            self.isolation_level = IsolationLevel(isolation_level or IsolationLevel.READ_COMMITTED)
+        except ValueError:
+            raise ImproperlyConfigured(f"Invalid transaction isolation level {isolation_level} specified. "
+                                       f"Use one of the psycopg.IsolationLevel values.")
+        connection = pool.getconn()
+        if isolation_level is not None:
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        if self.connection is None or self.pool_options is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            # the pool rolls back what the connection left open and recycles it once max_lifetime is over
+            self.connection._pool.putconn(self.connection)
+            self.connection = None
+
@@ -0,0 +1,26 @@
+from typing import Optional
+
+import psycopg
+from django.db import connection
+from django.db.backends.utils import CursorDebugWrapper
+from psycopg import sql
+from psycopg.types.numeric import Int8Dumper
+
+
+def fetch_one(query: sql.Composable, values: tuple, prepare: bool) -> Optional[tuple]:
+    """Executes the query with server-side binding on the Django connection and returns its first row.
+
+    Django's cursors bind the values on the client, such statements can never be prepared. A statement is prepared
+    only when OPTIONS['prepare_threshold'] of the database is set, the pgbouncer mode always turns it off.
+    """
+    connection.ensure_connection()
+    with connection.wrap_database_errors, psycopg.Cursor(connection.connection) as cursor:
+        # every int is sent as bigint: one prepared statement whatever the value, and the assignment casts to
+        # integer and money columns a literal would get
+        cursor.adapters.register_dumper(int, Int8Dumper)
+        if connection.queries_logged:
+            with CursorDebugWrapper(cursor, connection).debug_sql(query, values):
+                cursor.execute(query, values, prepare=prepare)
+        else:
+            cursor.execute(query, values, prepare=prepare)
+        return cursor.fetchone()
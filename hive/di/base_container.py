@@ -1,6 +1,6 @@
 from dependency_injector import containers, providers
 
-from hive.builder.physical_table_storage_builder import PhysicalTableStorageBuilder
+from hive.builder.table_compiler import TableCompiler
 from hive.di.entity_field_type_provider import EntityFieldTypeProvider
 from hive.di.repository_container import RepositoryContainer
 from hive.di.storage_provider import StorageProvider
@@ -10,11 +10,23 @@ from hive.entity_field_type.int_entity_field_type import IntEntityFieldType
 from hive.entity_field_type.money_field_type import MoneyFieldType
 from hive.entity_field_type.ref_field_type import RefFieldType
 from hive.entity_field_type.string_entity_field_type import StringEntityFieldType
+from hive.service.advisory_lock_manager import AdvisoryLockManager
+from hive.service.alter_service import AlterService
+from hive.service.arrow_writer import ArrowWriter
+from hive.service.bulk_load_service import BulkLoadService
 from hive.service.create_service import CreateService
 from hive.service.delete_service import DeleteService
+from hive.service.entity_change_service import EntityChangeService
+from hive.service.export_service import ExportService
+from hive.service.index_service import IndexService
+from hive.service.partition_service import PartitionService
+from hive.service.purge_service import PurgeService
+from hive.service.read_service import ReadService
 from hive.service.storage_service import StorageService
+from hive.storage.ingest_plan_cache import IngestPlanCache
 from hive.storage.update_storage import UpdateStorage
 from hive.validator.entity_validator import EntityValidator
+from hive.validator.index_validator import IndexValidator
 from hive.validator.physical_table_storage_validator import PhysicalTableStorageValidator
 from hive.validator.storage_validator import StorageValidator
 
@@ -29,12 +41,18 @@ class BaseContainer(containers.DeclarativeContainer):
     string_entity_field_type = providers.Singleton(StringEntityFieldType)
     datetime_entity_field_type = providers.Singleton(DateTimeEntityFieldType)
     float_entity_field_type = providers.Singleton(FloatEntityFieldType)
+    money_field_type = providers.Singleton(MoneyFieldType)
     ref_field_type = providers.Singleton(RefFieldType,
                                          storage_repository=repository.storage_repository,
                                          entity_repository=repository.entity_repository,
-                                         schema=config().get_schema()
+                                         schema=config().get_schema(),
+                                         reference_cache=repository.reference_cache,
+                                         field_types=providers.Dict(int=int_entity_field_type,
+                                                                    str=string_entity_field_type,
+                                                                    date=datetime_entity_field_type,
+                                                                    float=float_entity_field_type,
+                                                                    money=money_field_type)
                                          )
-    money_field_type = providers.Singleton(MoneyFieldType)
     entity_field_type_provider = providers.Singleton(EntityFieldTypeProvider,
                                                      int_entity_field_type=int_entity_field_type
                                                      , string_entity_field_type=string_entity_field_type
@@ -49,11 +67,26 @@ class BaseContainer(containers.DeclarativeContainer):
         entity_field_type_provider=entity_field_type_provider
     )
 
+    lock_manager = providers.Singleton(AdvisoryLockManager,
+                                       advisory_lock_repository=repository.advisory_lock_repository)
+
+    ingest_plan_cache = providers.Singleton(IngestPlanCache)
+
+    entity_change_service = providers.Singleton(EntityChangeService,
+                                                entity_version_repository=repository.entity_version_repository,
+                                                entity_cache=repository.entity_cache,
+                                                reference_cache=repository.reference_cache,
+                                                ingest_plan_cache=ingest_plan_cache,
+                                                schema_snapshot=repository.schema_snapshot,
+                                                statement_cache=repository.statement_cache)
+
     update_storage = providers.Factory(UpdateStorage,
                                        storage_validator=storage_validator,
                                        storage_repository=repository.storage_repository,
                                        entity_field_type_provider=entity_field_type_provider,
-
+                                       lock_manager=lock_manager,
+                                       ingest_plan_cache=ingest_plan_cache,
+                                       async_database=repository.async_database,
                                        )
 
     storage_provider = providers.Singleton(StorageProvider,
@@ -69,22 +102,59 @@ class BaseContainer(containers.DeclarativeContainer):
         PhysicalTableStorageValidator
     )
 
-    physical_table_storage_builder = providers.Singleton(
-        PhysicalTableStorageBuilder,
-        physical_table_storage_repository=repository.physical_table_storage_repository,
+    table_compiler = providers.Singleton(
+        TableCompiler,
         physical_table_storage_validator=physical_table_storage_validator,
         schema=config().get_schema(),
         entity_repository=repository.entity_repository,
     )
 
+    index_validator = providers.Factory(
+        IndexValidator,
+        entity_field_type_provider=entity_field_type_provider
+    )
+
+    index_service = providers.Factory(
+        IndexService,
+        entity_repository=repository.entity_repository,
+        physical_table_storage_repository=repository.physical_table_storage_repository,
+        index_validator=index_validator,
+        schema=config().get_schema()
+    )
+
+    partition_service = providers.Factory(
+        PartitionService,
+        entity_repository=repository.entity_repository,
+        physical_table_storage_repository=repository.physical_table_storage_repository,
+        schema=config().get_schema()
+    )
+
     create_service = providers.Singleton(
         CreateService,
         entity_repository=repository.entity_repository,
         entity_type_repository=repository.entity_type_repository,
         entity_validator=entity_validator,
-        physical_storage_builder=physical_table_storage_builder,
+        table_compiler=table_compiler,
         physical_storage_repository=repository.physical_table_storage_repository,
-        entity_field_type_provider=entity_field_type_provider
+        entity_field_type_provider=entity_field_type_provider,
+        index_service=index_service,
+        partition_service=partition_service,
+        advisory_lock_repository=repository.advisory_lock_repository
+    )
+
+    alter_service = providers.Factory(
+        AlterService,
+        entity_repository=repository.entity_repository,
+        entity_validator=entity_validator,
+        create_service=create_service,
+        index_service=index_service,
+        table_compiler=table_compiler,
+        physical_table_storage_repository=repository.physical_table_storage_repository,
+        advisory_lock_repository=repository.advisory_lock_repository,
+        schema=config().get_schema(),
+        lock_timeout=config().get_schema_lock_timeout(),
+        lock_retries=config().get_schema_lock_retries(),
+        batch_size=config().get_backfill_batch_size()
     )
 
     storage_service = providers.Singleton(
@@ -95,12 +165,56 @@ class BaseContainer(containers.DeclarativeContainer):
         storage_validator=storage_validator,
         schema=config().get_schema(),
         entity_field_type_provider=entity_field_type_provider,
-        storage_provider=storage_provider
+        storage_provider=storage_provider,
+        async_database=repository.async_database
+    )
+
+    read_service = providers.Singleton(
+        ReadService,
+        entity_repository=repository.entity_repository,
+        storage_repository=repository.storage_repository,
+        entity_field_type_provider=entity_field_type_provider,
+        schema=config().get_schema(),
+        async_database=repository.async_database
+    )
+
+    arrow_writer = providers.Factory(ArrowWriter)
+
+    export_service = providers.Singleton(
+        ExportService,
+        entity_repository=repository.entity_repository,
+        storage_repository=repository.storage_repository,
+        read_service=read_service,
+        arrow_writer=arrow_writer,
+        schema=config().get_schema()
+    )
+
+    bulk_load_service = providers.Factory(
+        BulkLoadService,
+        entity_repository=repository.entity_repository,
+        storage_repository=repository.storage_repository,
+        storage_provider=storage_provider,
+        lock_manager=lock_manager,
+        schema=config().get_schema()
     )
 
     delete_service = providers.Factory(
         DeleteService,
         entity_repository=repository.entity_repository,
+        table_compiler=table_compiler,
+        physical_table_storage_repository=repository.physical_table_storage_repository,
+        advisory_lock_repository=repository.advisory_lock_repository,
+        trash_repository=repository.trash_repository,
+        schema=config().get_schema(),
+        trash_schema=config().get_trash_schema(),
+        lock_timeout=config().get_schema_lock_timeout()
+    )
+
+    purge_service = providers.Factory(
+        PurgeService,
+        trash_repository=repository.trash_repository,
+        table_compiler=table_compiler,
         physical_table_storage_repository=repository.physical_table_storage_repository,
-        physical_table_storage_builder=physical_table_storage_builder
+        trash_schema=config().get_trash_schema(),
+        pause=config().get_purge_pause()
     )
@@ -1,9 +1,18 @@
 from dependency_injector import containers, providers
 
 from hive.configuration.configuration import Configuration
-from hive.repository.entity_repository import EntityRepository
+from hive.db.async_database import AsyncDatabase
+from hive.repository.advisory_lock_repository import AdvisoryLockRepository
+from hive.repository.cached_entity_repository import CachedEntityRepository
+from hive.repository.cached_physical_table_storage_repository import CachedPhysicalTableStorageRepository
+from hive.repository.connection_pool_repository import ConnectionPoolRepository
+from hive.repository.entity_cache import EntityCache
 from hive.repository.entity_type_repository import EntityTypeRepository
-from hive.repository.physical_table_storage_repository import PhysicalTableStorageRepository
+from hive.repository.entity_version_repository import EntityVersionRepository
+from hive.repository.reference_cache import ReferenceCache
+from hive.repository.schema_snapshot import SchemaSnapshot
+from hive.repository.statement_cache import StatementCache
+from hive.repository.trash_repository import TrashRepository
 from hive.repository.storage_repository import StorageRepository
 
 
@@ -11,8 +20,37 @@ class RepositoryContainer(containers.DeclarativeContainer):
     config = providers.Singleton(
         Configuration,
     )
+    entity_cache = providers.Singleton(
+        EntityCache
+    )
+
+    reference_cache = providers.Singleton(
+        ReferenceCache,
+        size=config().get_reference_cache_size(),
+        ttl=config().get_reference_cache_ttl()
+    )
+
+    schema_snapshot = providers.Singleton(
+        SchemaSnapshot
+    )
+
+    statement_cache = providers.Singleton(
+        StatementCache,
+        size=config().get_statement_cache_size(),
+        prepare_threshold=config().get_statement_prepare_threshold()
+    )
+
+    async_database = providers.Singleton(
+        AsyncDatabase
+    )
+
     entity_repository = providers.Factory(
-        EntityRepository
+        CachedEntityRepository,
+        entity_cache=entity_cache
+    )
+
+    entity_version_repository = providers.Factory(
+        EntityVersionRepository
     )
 
     entity_type_repository = providers.Factory(
@@ -20,9 +58,24 @@ class RepositoryContainer(containers.DeclarativeContainer):
     )
 
     storage_repository = providers.Factory(
-        StorageRepository
+        StorageRepository,
+        statement_cache=statement_cache
     )
 
     physical_table_storage_repository = providers.Factory(
-        PhysicalTableStorageRepository
+        CachedPhysicalTableStorageRepository,
+        schema_snapshot=schema_snapshot,
+        schema=config().get_schema()
+    )
+
+    advisory_lock_repository = providers.Factory(
+        AdvisoryLockRepository
+    )
+
+    trash_repository = providers.Factory(
+        TrashRepository
+    )
+
+    connection_pool_repository = providers.Factory(
+        ConnectionPoolRepository
     )
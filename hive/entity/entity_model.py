@@ -10,4 +10,6 @@ class Entity(models.Model):
     identity = models.JSONField(default=list)
     created_at = models.DateTimeField(auto_now_add=True)
     primary_keys = models.JSONField(max_length=50, default=list, unique=True)
+    indexes = models.JSONField(default=list)
+    partitioning = models.JSONField(default=dict)
     type = models.ForeignKey(EntityType, on_delete=models.CASCADE, to_field='id')
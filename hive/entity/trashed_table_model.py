@@ -0,0 +1,15 @@
+from django.db import models
+
+
+class TrashedTable(models.Model):
+    PENDING = 'pending'
+    PURGED = 'purged'
+    FAILED = 'failed'
+
+    id = models.AutoField(primary_key=True, auto_created=True)
+    entity_name = models.CharField(max_length=50)
+    table_name = models.CharField(max_length=63, unique=True)
+    status = models.CharField(max_length=10, default=PENDING)
+    error = models.TextField(default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    purged_at = models.DateTimeField(null=True)
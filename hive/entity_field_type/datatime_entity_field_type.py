@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 
 from rest_framework import serializers
 
@@ -9,6 +9,7 @@ from hive.entity_field_type.entity_field_type_interface import EntityFieldTypeIn
 class DateTimeEntityFieldType(EntityFieldTypeInterface):
     # Format "Y-m-d H:i:s" in python is equal to "YYYY-MM-DD HH:MM:SS" in SQL
     FORMAT = "%Y-%m-%d %H:%M:%S"
+    SQL_FORMAT = "YYYY-MM-DD HH24:MI:SS"
     SQL_NOW = "CURRENT_TIMESTAMP"
 
     def configure(self, config: ConfigBuilder):
@@ -26,7 +27,8 @@ class DateTimeEntityFieldType(EntityFieldTypeInterface):
             return value.strftime(self.FORMAT)
 
     def decode(self, value, config: dict):
-        if isinstance(value, datetime):
+        # columns of date fields are created as SQL date, their values come back without the time
+        if isinstance(value, date):
             return value.strftime(self.FORMAT)
         if isinstance(value, str):
             return datetime.strptime(value, self.FORMAT)
@@ -23,3 +23,13 @@ class EntityFieldTypeInterface(metaclass=ABCMeta):
     @abstractmethod
     def validate_value(self, value, config: dict):
         pass
+
+    def encode_many(self, values: list, config: dict) -> list:
+        return [self.encode(value, config) for value in values]
+
+    def decode_many(self, values: list, config: dict) -> list:
+        return [self.decode(value, config) for value in values]
+
+    def validate_many(self, values: list, config: dict) -> None:
+        for value in values:
+            self.validate_value(value, config)
@@ -19,3 +19,10 @@ class FloatEntityFieldType(EntityFieldTypeInterface):
     def validate_value(self, value, config: dict):
         if not isinstance(value, float):
             raise ValueError("Value: {} is not a float.".format(value))
+
+    def encode_many(self, values: list, config: dict) -> list:
+        return list(map(float, values))
+
+    def validate_many(self, values: list, config: dict) -> None:
+        if not all(isinstance(value, float) for value in values):
+            super().validate_many(values, config)
@@ -26,3 +26,16 @@ class IntEntityFieldType(EntityFieldTypeInterface):
         max_value = config.get("max", 2147483648)
         if value < min_value or value > max_value:
             raise serializers.ValidationError("Value is out of range.")
+
+    def encode_many(self, values: list, config: dict) -> list:
+        return list(map(int, values))
+
+    def validate_many(self, values: list, config: dict) -> None:
+        if not values:
+            return
+        min_value = config.get("min", -2147483648)
+        max_value = config.get("max", 2147483648)
+        if all(isinstance(value, int) for value in values) and min_value <= min(values) and max(values) <= max_value:
+            return
+        # report the first invalid value the same way a single value is reported
+        super().validate_many(values, config)
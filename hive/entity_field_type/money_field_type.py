@@ -6,6 +6,8 @@ from hive.service.money_parser import MoneyParser
 
 
 class MoneyFieldType(EntityFieldTypeInterface):
+    def __init__(self):
+        self.__money_parser = MoneyParser()
 
     def configure(self, config: ConfigBuilder):
         config.add("min", "int", -2147483648, False)
@@ -15,8 +17,10 @@ class MoneyFieldType(EntityFieldTypeInterface):
         pass
 
     def encode(self, value, config: dict):
-        money_parser = MoneyParser()
-        return money_parser.convert(value, append_penny=True)
+        return self.__money_parser.convert(value, append_penny=True)
+
+    def encode_many(self, values: list, config: dict) -> list:
+        return self.__money_parser.convert_many(values, append_penny=True)
 
     def decode(self, value, config: dict):
         return value
@@ -28,3 +32,12 @@ class MoneyFieldType(EntityFieldTypeInterface):
         max_value = config.get("max", 2147483648)
         if value < min_value or value > max_value:
             raise serializers.ValidationError("Value is out of range.")
+
+    def validate_many(self, values: list, config: dict) -> None:
+        if not values:
+            return
+        min_value = config.get("min", -2147483648)
+        max_value = config.get("max", 2147483648)
+        if all(isinstance(value, int) for value in values) and min_value <= min(values) and max(values) <= max_value:
+            return
+        super().validate_many(values, config)
@@ -1,12 +1,16 @@
 from hive.entity_field_type.configuration.configuration_builder import ConfigBuilder
 from hive.entity_field_type.entity_field_type_interface import EntityFieldTypeInterface
+from hive.repository.reference_cache import ReferenceCache
 
 
 class RefFieldType(EntityFieldTypeInterface):
-    def __init__(self, storage_repository, entity_repository, schema):
+    def __init__(self, storage_repository, entity_repository, schema, reference_cache: ReferenceCache,
+                 field_types: dict):
         self.__storage_repository = storage_repository
         self.__entity_repository = entity_repository
         self.__schema = schema
+        self.__reference_cache = reference_cache
+        self.__field_types = field_types
 
     def configure(self, config: ConfigBuilder):
         config.add("storage", "str", None, False)
@@ -16,23 +20,71 @@ class RefFieldType(EntityFieldTypeInterface):
         pass
 
     def encode(self, value, config: dict):
-        response = self.__storage_repository.find_by_keys(schema=self.__schema, table_name=config['storage'],
-                                                          columns=[config['field']], keys=value)
-        return response[config['field']]
+        return self.encode_many([value], config)[0]
+
+    def encode_many(self, values: list, config: dict) -> list:
+        storage = config['storage']
+        field = config['field']
+        fields = self.__get_fields(storage)
+        keys = [self.__get_keys(value, field, fields) for value in values]
+        resolved = self.__resolve(storage, keys, [field])
+        encoded = []
+        for value, key in zip(values, keys):
+            record = resolved.get(key)
+            if record is None:
+                raise ValueError(f"Referenced record {value} does not exist in {storage}.")
+            encoded.append(record[field])
+        return encoded
 
     def decode(self, value, config: dict):
-        columns = self.__get_columns(config['storage'])
-        response = self.__storage_repository.find_by_keys(schema=self.__schema, table_name=config['storage'],
-                                                          columns=columns, keys=value)
-        return response
+        return self.decode_many([value], config)[0]
+
+    def decode_many(self, values: list, config: dict) -> list:
+        storage = config['storage']
+        field = config['field']
+        fields = self.__get_fields(storage)
+        keys = [self.__get_keys(value, field, fields) for value in values]
+        resolved = self.__resolve(storage, keys, list(fields))
+        return [resolved.get(key, {}) for key in keys]
 
     def validate_value(self, value, config: dict):
         if not self.__entity_repository.is_exist(name=config['storage']):
             raise ValueError("Storage not exist")
 
-    def __get_columns(self, storage: str) -> list:
+    def __resolve(self, storage: str, keys: list, columns: list) -> dict:
+        # every distinct reference of the batch is looked up once, missing ones in one pipeline
+        resolved = {}
+        missing = {}
+        for key in keys:
+            if key in resolved:
+                continue
+            cached = self.__reference_cache.get(storage, key)
+            if cached is not ReferenceCache.MISSING and all(column in cached for column in columns):
+                resolved[key] = cached
+                continue
+            missing.setdefault(tuple(name for name, _ in key), set()).add(tuple(value for _, value in key))
+        if not missing:
+            return resolved
+        found = self.__storage_repository.find_many_by_key_sets(
+            schema=self.__schema, table_name=storage, columns=columns,
+            key_sets={key_columns: list(key_values) for key_columns, key_values in missing.items()})
+        for key_columns, records in found.items():
+            for record in records:
+                key = tuple((name, record[name]) for name in key_columns)
+                resolved[key] = record
+                self.__reference_cache.put(storage, key, record)
+        return resolved
+
+    def __get_keys(self, value, field: str, fields: dict) -> tuple:
+        # key values are encoded the way the referenced fields store them, so "1" finds the record keyed by 1
+        items = value.items() if isinstance(value, dict) else [(field, value)]
+        return tuple(sorted((name, self.__encode_key(fields.get(name), key_value)) for name, key_value in items))
+
+    def __encode_key(self, field: dict, value):
+        if field is None or value is None or field['type'] not in self.__field_types:
+            return value
+        return self.__field_types[field['type']].encode(value, field.get('config', {}))
+
+    def __get_fields(self, storage: str) -> dict:
         entity = self.__entity_repository.get_by_name(storage)
-        columns = []
-        for field in entity.fields:
-            columns.append(field['name'])
-        return columns
+        return {field['name']: field for field in entity.fields}
@@ -22,3 +22,13 @@ class StringEntityFieldType(EntityFieldTypeInterface):
         max_length = config.get("max_length", None)
         if max_length and len(value) > max_length:
             raise ValueError("Value is too long.")
+
+    def encode_many(self, values: list, config: dict) -> list:
+        return list(values)
+
+    def validate_many(self, values: list, config: dict) -> None:
+        max_length = config.get("max_length", None)
+        if all(isinstance(value, str) for value in values) and \
+                not (max_length and values and max(map(len, values)) > max_length):
+            return
+        super().validate_many(values, config)
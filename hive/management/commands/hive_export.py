@@ -0,0 +1,42 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import exceptions, serializers
+
+from hive.di.base_container import BaseContainer
+from hive.service.export_service import ExportService
+
+
+class Command(BaseCommand):
+    help = 'Export all records of an entity storage as NDJSON, CSV, Arrow IPC or Parquet.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('entity', type=str)
+        parser.add_argument('--output', type=str, default=None,
+                            help='File to write, standard output when omitted.')
+        parser.add_argument('--format', choices=ExportService.FORMATS, default='ndjson')
+        parser.add_argument('--fields', type=str, default=None,
+                            help='Comma separated fields to export, all fields when omitted.')
+        parser.add_argument('--gzip', action='store_true', help='Compress the output with gzip.')
+        parser.add_argument('--batch-size', type=int, default=10000,
+                            help='Number of records fetched from the server-side cursor at once.')
+
+    def handle(self, *args, **options):
+        export_service = BaseContainer().export_service()
+        fields = options['fields'].split(',') if options['fields'] else None
+        try:
+            chunks = export_service.export(options['entity'], options['format'], fields, options['gzip'],
+                                           options['batch_size'])
+        except serializers.ValidationError as e:
+            raise CommandError(e.detail[0] if isinstance(e.detail, list) else e.detail)
+        except exceptions.NotFound:
+            raise CommandError(f"Entity {options['entity']} does not exist.")
+        output = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        try:
+            for chunk in chunks:
+                output.write(chunk)
+        finally:
+            if options['output']:
+                output.close()
+            else:
+                output.flush()
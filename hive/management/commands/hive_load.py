@@ -0,0 +1,75 @@
+import csv
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+
+from hive.di.base_container import BaseContainer
+
+
+class Command(BaseCommand):
+    help = 'Bulk load records from a NDJSON or CSV file into an entity storage.'
+
+    FORMATS = ('ndjson', 'csv')
+
+    def add_arguments(self, parser):
+        parser.add_argument('entity', type=str)
+        parser.add_argument('file', type=str)
+        parser.add_argument('--format', choices=self.FORMATS, default=None,
+                            help='File format, guessed from the file extension when omitted.')
+        parser.add_argument('--batch-size', type=int, default=10000,
+                            help='Number of records copied and merged in one transaction.')
+        parser.add_argument('--rejects', type=str, default=None,
+                            help='Write rejected records with their errors to this NDJSON file.')
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or self.__guess_format(options['file'])
+        if options['batch_size'] < 1:
+            raise CommandError('Batch size must be a positive number.')
+        bulk_load_service = BaseContainer().bulk_load_service()
+        rejects = open(options['rejects'], 'w', encoding='utf-8') if options['rejects'] else None
+
+        def on_reject(number, record, error):
+            if rejects:
+                detail = error.detail if isinstance(error, serializers.ValidationError) else str(error).strip()
+                rejects.write(json.dumps({'number': number, 'record': record, 'error': detail}, default=str) + '\n')
+
+        started = time.monotonic()
+        try:
+            with open(options['file'], newline='', encoding='utf-8') as source:
+                records = self.__read_csv(source) if file_format == 'csv' else self.__read_ndjson(source)
+                summary = bulk_load_service.load(options['entity'], records, batch_size=options['batch_size'],
+                                                 on_reject=on_reject)
+        finally:
+            if rejects:
+                rejects.close()
+        elapsed = max(time.monotonic() - started, 1e-9)
+        total = summary['loaded'] + summary['rejected']
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {summary['loaded']} records, rejected {summary['rejected']} "
+            f"in {elapsed:.2f}s ({total / elapsed:.0f} rows/sec)."))
+
+    def __guess_format(self, file: str) -> str:
+        extension = file.rsplit('.', 1)[-1].lower()
+        if extension in ('ndjson', 'jsonl', 'json'):
+            return 'ndjson'
+        if extension in self.FORMATS:
+            return extension
+        raise CommandError(f'Cannot guess format of {file}, use --format.')
+
+    @staticmethod
+    def __read_ndjson(source):
+        for line in source:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # malformed lines are passed on as they are and rejected by the loader
+                yield line
+
+    @staticmethod
+    def __read_csv(source):
+        yield from csv.DictReader(source)
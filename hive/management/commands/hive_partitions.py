@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from hive.di.base_container import BaseContainer
+
+
+class Command(BaseCommand):
+    help = 'Create the upcoming partitions of all range partitioned entity storages.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=int, default=None,
+                            help='Keep running and repeat every given number of seconds, run once when omitted.')
+
+    def handle(self, *args, **options):
+        partition_service = BaseContainer().partition_service()
+        while True:
+            for name, partitions in partition_service.create_all_partitions().items():
+                if partitions is None:
+                    self.stderr.write(f'Cannot create partitions of {name}')
+                else:
+                    self.stdout.write(f'{name}: {", ".join(partitions)}')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from hive.di.base_container import BaseContainer
+
+
+class Command(BaseCommand):
+    help = 'Drop the tables of deleted entities waiting in the trash schema.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None,
+                            help='Drop at most this many tables per run, all pending tables when omitted.')
+        parser.add_argument('--interval', type=int, default=None,
+                            help='Keep running and repeat every given number of seconds, run once when omitted.')
+
+    def handle(self, *args, **options):
+        purge_service = BaseContainer().purge_service()
+        while True:
+            for trashed_table in purge_service.purge(options['limit']):
+                if trashed_table.status == trashed_table.FAILED:
+                    self.stderr.write(f'{trashed_table.table_name}: {trashed_table.error}')
+                else:
+                    self.stdout.write(f'{trashed_table.table_name}: {trashed_table.status}')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,14 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('hive', '00011_'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE SEQUENCE IF NOT EXISTS hive_entity_version;",
+            reverse_sql="DROP SEQUENCE IF EXISTS hive_entity_version;"
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('hive', '00012_'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entity',
+            name='indexes',
+            field=models.JSONField(default=list),
+        ),
+    ]
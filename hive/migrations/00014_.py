@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('hive', '00013_'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entity',
+            name='partitioning',
+            field=models.JSONField(default=dict),
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('hive', '00014_'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrashedTable',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('entity_name', models.CharField(max_length=50)),
+                ('table_name', models.CharField(max_length=63, unique=True)),
+                ('status', models.CharField(default='pending', max_length=10)),
+                ('error', models.TextField(default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('purged_at', models.DateTimeField(null=True)),
+            ],
+        ),
+    ]
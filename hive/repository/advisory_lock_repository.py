@@ -0,0 +1,46 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+import psycopg
+from django.db import connection
+from psycopg import AsyncConnection
+
+
+class AdvisoryLockRepository:
+    # keys are locked one by one in ascending order, so concurrent writers can not deadlock each other.
+    # A key is only waited for when it could not be taken immediately, which is counted as contended.
+    LOCK_QUERY = "SELECT count(*) FILTER (WHERE contended) FROM (" \
+                 "SELECT CASE WHEN pg_try_advisory_xact_lock(key) THEN false " \
+                 "ELSE pg_advisory_xact_lock(key)::text = '' END AS contended " \
+                 "FROM (SELECT DISTINCT key FROM unnest(%s::bigint[]) AS key ORDER BY key) AS keys) AS locks;"
+
+    @classmethod
+    def lock(cls, keys: list) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute(cls.LOCK_QUERY, (keys,))
+            return cursor.fetchone()[0]
+
+    @classmethod
+    async def alock(cls, async_connection: AsyncConnection, keys: list) -> int:
+        cursor = await async_connection.execute(cls.LOCK_QUERY, (keys,))
+        return (await cursor.fetchone())[0]
+
+    @classmethod
+    @contextmanager
+    def try_migration_lock(cls, key: int) -> Iterator[bool]:
+        """Holds the lock of a migration made of many transactions, yields whether it was taken."""
+        if getattr(connection, 'pgbouncer', False):
+            # a transaction pooler runs the statements of a session on any server, a session lock could stay on
+            # another one. An open transaction keeps its server, so a connection of its own holds the lock in one.
+            with psycopg.connect(**connection.get_connection_params()) as lock_connection:
+                yield lock_connection.execute("SELECT pg_try_advisory_xact_lock(%s);", (key,)).fetchone()[0]
+            return
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s);", (key,))
+            locked = cursor.fetchone()[0]
+        try:
+            yield locked
+        finally:
+            if locked:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_unlock(%s);", (key,))
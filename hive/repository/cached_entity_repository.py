@@ -0,0 +1,16 @@
+from hive.entity.entity_model import Entity
+from hive.repository.entity_cache import EntityCache
+from hive.repository.entity_repository import EntityRepository
+
+
+class CachedEntityRepository(EntityRepository):
+    """Entity repository that reads entity definitions through the in-process entity cache."""
+
+    def __init__(self, entity_cache: EntityCache):
+        self.__entity_cache = entity_cache
+
+    def is_exist(self, name: str):
+        return self.__entity_cache.contains(name) or super().is_exist(name)
+
+    def get_by_name(self, name: str) -> Entity:
+        return self.__entity_cache.get(name, super().get_by_name)
@@ -0,0 +1,57 @@
+from typing import Dict, Optional
+
+from django.db import connection, transaction
+
+from hive.repository.physical_table_storage_repository import PhysicalTableStorageRepository
+from hive.repository.schema_snapshot import SchemaSnapshot
+
+
+class CachedPhysicalTableStorageRepository(PhysicalTableStorageRepository):
+    """Physical table storage repository that probes the storage tables through the schema snapshot."""
+
+    def __init__(self, schema_snapshot: SchemaSnapshot, schema: str):
+        self.__schema_snapshot = schema_snapshot
+        self.__schema = schema
+
+    def execute(self, query: str):
+        try:
+            super().execute(query)
+        finally:
+            self.__refresh()
+
+    def execute_with_lock_timeout(self, queries: list, lock_timeout: int):
+        try:
+            super().execute_with_lock_timeout(queries, lock_timeout)
+        finally:
+            self.__refresh()
+
+    def create_range_partition(self, schema: str, table_name: str, partition_name: str, start, end):
+        try:
+            super().create_range_partition(schema, table_name, partition_name, start, end)
+        finally:
+            self.__refresh()
+
+    def get_existing_columns(self, schema, table_name: str) -> list:
+        return list(self.describe_table(schema, table_name) or {})
+
+    def table_exists(self, schema, table_name: str) -> bool:
+        return self.describe_table(schema, table_name) is not None
+
+    def describe_table(self, schema: str, table_name: str) -> Optional[Dict[str, str]]:
+        # a transaction may see its own uncommitted DDL, which must never end up in the snapshot
+        if schema != self.__schema or connection.in_atomic_block:
+            return super().describe_table(schema, table_name)
+        generation = self.__schema_snapshot.get_generation()
+        if not self.__schema_snapshot.is_loaded():
+            self.__schema_snapshot.load(super().describe_schema(schema), generation)
+        found, columns = self.__schema_snapshot.lookup(table_name)
+        if found:
+            return columns
+        columns = super().describe_table(schema, table_name)
+        self.__schema_snapshot.put(table_name, columns, generation)
+        return columns
+
+    def __refresh(self) -> None:
+        # other connections may load the old tables until the DDL commits, so the snapshot is dropped once more then
+        self.__schema_snapshot.clear()
+        transaction.on_commit(self.__schema_snapshot.clear)
@@ -0,0 +1,10 @@
+from django.db import connection
+
+
+class ConnectionPoolRepository:
+
+    @staticmethod
+    def get_metrics() -> dict:
+        # only the hive.db.postgresql engine pools its connections
+        get_pool_metrics = getattr(connection, 'get_pool_metrics', None)
+        return get_pool_metrics() if get_pool_metrics else {}
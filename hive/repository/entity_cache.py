@@ -0,0 +1,37 @@
+import threading
+
+from hive.entity.entity_model import Entity
+
+
+class EntityCache:
+    """In-process cache of entity definitions, invalidated whenever an entity changes."""
+
+    def __init__(self):
+        self.__entities = {}
+        self.__generation = 0
+        self.__lock = threading.Lock()
+
+    def get(self, name: str, load) -> Entity:
+        entity = self.__entities.get(name)
+        if entity is not None:
+            return entity
+        generation = self.__generation
+        entity = load(name)
+        with self.__lock:
+            # do not keep a definition loaded while the cache was being invalidated
+            if generation == self.__generation:
+                self.__entities[name] = entity
+        return entity
+
+    def contains(self, name: str) -> bool:
+        return name in self.__entities
+
+    def invalidate(self, name: str) -> None:
+        with self.__lock:
+            self.__generation += 1
+            self.__entities.pop(name, None)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__generation += 1
+            self.__entities.clear()
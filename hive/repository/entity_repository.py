@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework.exceptions import NotFound
 
 from hive.entity.entity_model import Entity
@@ -25,10 +26,41 @@ class EntityRepository:
             fields=request_data.fields,
             identity=request_data.identity,
             primary_keys=request_data.primary_keys,
+            indexes=request_data.indexes,
+            partitioning=request_data.partitioning,
             type=entity_type_obj
         )
         return entity
 
+    @staticmethod
+    def get_partitioned(partitioning_type: str) -> list:
+        return list(Entity.objects.filter(partitioning__type=partitioning_type))
+
+    @staticmethod
+    def update_fields(name: str, fields: list, indexes: list) -> Entity:
+        with transaction.atomic():
+            entity = Entity.objects.select_for_update().get(name=name)
+            entity.fields = fields
+            entity.indexes = indexes
+            entity.save(update_fields=['fields', 'indexes'])
+        return entity
+
+    @staticmethod
+    def add_index(name: str, index: dict) -> Entity:
+        with transaction.atomic():
+            entity = Entity.objects.select_for_update().get(name=name)
+            entity.indexes = [item for item in entity.indexes if item['name'] != index['name']] + [index]
+            entity.save(update_fields=['indexes'])
+        return entity
+
+    @staticmethod
+    def remove_index(name: str, index_name: str) -> Entity:
+        with transaction.atomic():
+            entity = Entity.objects.select_for_update().get(name=name)
+            entity.indexes = [item for item in entity.indexes if item['name'] != index_name]
+            entity.save(update_fields=['indexes'])
+        return entity
+
     @staticmethod
     def delete(entity: Entity):
         entity.delete()
@@ -0,0 +1,13 @@
+from django.db import connection
+
+
+class EntityVersionRepository:
+
+    @staticmethod
+    def publish(channel: str, name: str) -> int:
+        # the notification is delivered to listeners only when the surrounding transaction commits
+        query = "SELECT version, pg_notify(%s, version || ':' || %s) " \
+                "FROM (SELECT nextval('hive_entity_version') AS version) AS versions;"
+        with connection.cursor() as cursor:
+            cursor.execute(query, (channel, name))
+            return cursor.fetchone()[0]
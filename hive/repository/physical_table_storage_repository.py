@@ -1,10 +1,20 @@
-from django.db import connection
+from typing import Dict, Optional
+
+from django.db import DatabaseError, connection, transaction
 from psycopg import sql
 
+from hive.db.pipeline import pipeline
 from hive.repository.physical_table_storage_repository_interface import PhysicalTableStorageRepositoryInterface
 
 
 class PhysicalTableStorageRepository(PhysicalTableStorageRepositoryInterface):
+    OPERATORS = {'eq': '=', 'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<='}
+    TRIGRAM_EXTENSION = "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+    INDEX_VALIDITY = "SELECT i.indisvalid FROM pg_catalog.pg_index i " \
+                     "JOIN pg_catalog.pg_class c ON c.oid = i.indexrelid " \
+                     "JOIN pg_catalog.pg_class t ON t.oid = i.indrelid " \
+                     "JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace " \
+                     "WHERE n.nspname = %s AND t.relname = %s AND c.relname = %s"
 
     @staticmethod
     def execute(query: str):
@@ -12,28 +22,207 @@ class PhysicalTableStorageRepository(PhysicalTableStorageRepositoryInterface):
             cursor.execute(query)
 
     @staticmethod
-    def get_existing_columns(schema, table_name: str) -> list:
-        query = sql.SQL(
-            "SELECT column_name FROM information_schema.columns WHERE table_schema = '{}' AND table_name = '{}'").format(
-            sql.SQL(schema), sql.SQL(table_name))
+    def execute_with_lock_timeout(queries: list, lock_timeout: int):
+        # a statement waiting for a lock queues every later reader and writer of the table behind it,
+        # so it gives up quickly instead and the caller retries
+        with transaction.atomic(), pipeline(), connection.cursor() as cursor:
+            cursor.execute(sql.SQL("SET LOCAL lock_timeout = {}").format(sql.Literal(f"{lock_timeout}ms")))
+            for query in queries:
+                cursor.execute(query)
+
+    @staticmethod
+    def backfill(schema: str, table_name: str, column: str, expression: sql.Composable, condition: sql.Composable,
+                 key_columns: list, after: Optional[list], limit: int) -> Optional[list]:
+        keys = sql.SQL(", ").join(map(sql.Identifier, key_columns))
+        conditions = [condition]
+        values = []
+        if after:
+            conditions.append(sql.SQL("({}) > ({})").format(keys, sql.SQL(", ").join(sql.Placeholder() * len(after))))
+            values.extend(after)
+        query = sql.SQL("WITH batch AS (SELECT {} FROM {}.{} WHERE {} ORDER BY {} LIMIT %s), "
+                        "updated AS (UPDATE {}.{} SET {} = {} WHERE ({}) IN (SELECT {} FROM batch)) "
+                        "SELECT {} FROM batch ORDER BY {} DESC LIMIT 1").format(
+            keys, sql.Identifier(schema), sql.Identifier(table_name), sql.SQL(" AND ").join(conditions), keys,
+            sql.Identifier(schema), sql.Identifier(table_name), sql.Identifier(column), expression, keys, keys,
+            keys, sql.SQL(" DESC, ").join(map(sql.Identifier, key_columns))
+        )
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(query, tuple(values) + (limit,))
+            row = cursor.fetchone()
+        return list(row) if row else None
 
+    @classmethod
+    def get_existing_columns(cls, schema, table_name: str) -> list:
+        return list(cls.describe_table(schema, table_name) or {})
+
+    @classmethod
+    def table_exists(cls, schema, table_name: str) -> bool:
+        query = "SELECT EXISTS (SELECT 1 FROM pg_catalog.pg_class c " \
+                "JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace " \
+                "WHERE n.nspname = %s AND c.relname = %s AND c.relkind IN ('r', 'p'));"
         with connection.cursor() as cursor:
-            cursor.execute(query)
-            columns = cursor.fetchall()
-        return [col[0] for col in columns]
+            cursor.execute(query, (schema, table_name))
+            return cursor.fetchone()[0]
 
     @staticmethod
-    def table_exists(schema, table_name: str) -> bool:
-        query = sql.SQL("SELECT EXISTS (SELECT 1 FROM information_schema.tables WHERE table_schema = '{}' AND table_name = '{}');").format(
-            sql.SQL(schema), sql.SQL(table_name))
+    def get_existing_relations(schema: str, names: list) -> list:
+        # tables, indexes and sequences share one namespace in a schema
+        query = "SELECT c.relname FROM pg_catalog.pg_class c " \
+                "JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace " \
+                "WHERE n.nspname = %s AND c.relname = ANY(%s) ORDER BY c.relname"
         with connection.cursor() as cursor:
-            cursor.execute(query)
-            is_found = cursor.fetchone()[0]
-            return is_found
+            cursor.execute(query, (schema, list(names)))
+            return [row[0] for row in cursor.fetchall()]
+
+    @classmethod
+    def describe_table(cls, schema: str, table_name: str) -> Optional[Dict[str, str]]:
+        """Columns and their SQL types of a table, None when the table does not exist."""
+        return cls.__describe(schema, table_name).get(table_name)
+
+    @classmethod
+    def describe_schema(cls, schema: str) -> Dict[str, Dict[str, str]]:
+        """Columns and their SQL types of every table of the schema, read with one catalog query."""
+        return cls.__describe(schema)
+
+    @staticmethod
+    def get_partitions(schema: str, table_name: str) -> list:
+        query = "SELECT child.relname FROM pg_catalog.pg_inherits i " \
+                "JOIN pg_catalog.pg_class child ON child.oid = i.inhrelid " \
+                "JOIN pg_catalog.pg_class parent ON parent.oid = i.inhparent " \
+                "JOIN pg_catalog.pg_namespace n ON n.oid = parent.relnamespace " \
+                "WHERE n.nspname = %s AND parent.relname = %s ORDER BY child.relname;"
+        with connection.cursor() as cursor:
+            cursor.execute(query, (schema, table_name))
+            return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def get_indexes(schema: str, table_names: list) -> list:
+        query = "SELECT c.relname FROM pg_catalog.pg_index i " \
+                "JOIN pg_catalog.pg_class c ON c.oid = i.indexrelid " \
+                "JOIN pg_catalog.pg_class t ON t.oid = i.indrelid " \
+                "JOIN pg_catalog.pg_namespace n ON n.oid = t.relnamespace " \
+                "WHERE n.nspname = %s AND t.relname = ANY(%s) ORDER BY c.relname;"
+        with connection.cursor() as cursor:
+            cursor.execute(query, (schema, list(table_names)))
+            return [row[0] for row in cursor.fetchall()]
 
     @staticmethod
     def get_sql_type(entity_field_type: str):
-        query = sql.SQL("SELECT sql_type FROM hive_entityfieldtype WHERE name = '{}';").format(sql.SQL(entity_field_type))
         with connection.cursor() as cursor:
-            cursor.execute(query)
+            cursor.execute("SELECT sql_type FROM hive_entityfieldtype WHERE name = %s;", (entity_field_type,))
             return cursor.fetchone()[0]
+
+    @staticmethod
+    def __describe(schema: str, table_name: str = None) -> Dict[str, Dict[str, str]]:
+        # pg_catalog is read directly, the information_schema views get slow with thousands of tables
+        query = "SELECT c.relname, a.attname, format_type(a.atttypid, a.atttypmod) FROM pg_catalog.pg_class c " \
+                "JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace " \
+                "LEFT JOIN pg_catalog.pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped " \
+                "WHERE n.nspname = %s AND c.relkind IN ('r', 'p')"
+        parameters = (schema,)
+        if table_name is not None:
+            query += " AND c.relname = %s"
+            parameters += (table_name,)
+        tables = {}
+        with connection.cursor() as cursor:
+            cursor.execute(query + " ORDER BY c.relname, a.attnum;", parameters)
+            for name, column, column_type in cursor.fetchall():
+                columns = tables.setdefault(name, {})
+                if column is not None:
+                    columns[column] = column_type
+        return tables
+
+    @classmethod
+    def create_index(cls, schema: str, table_name: str, index: dict, concurrently: bool = True):
+        # CONCURRENTLY cannot run inside a transaction block nor on a partitioned table,
+        # there the index is built with a plain CREATE INDEX
+        concurrently = concurrently and not connection.in_atomic_block
+        with connection.cursor() as cursor:
+            if index['method'] == 'gin':
+                cursor.execute(cls.TRIGRAM_EXTENSION)
+            try:
+                cursor.execute(cls.__index_query(schema, table_name, index, concurrently))
+            except DatabaseError:
+                # a failed concurrent build leaves an invalid index of this table behind
+                if concurrently and cls.__get_index_validity(schema, table_name, index['name']) is False:
+                    cls.__drop_index(schema, index['name'], concurrently)
+                raise
+
+    @classmethod
+    def create_indexes(cls, schema: str, table_name: str, indexes: list, concurrently: bool = True):
+        if concurrently and not connection.in_atomic_block:
+            # a concurrent build cannot run in a pipeline, the indexes are built one after another
+            for index in indexes:
+                cls.create_index(schema, table_name, index)
+            return
+        with pipeline(), connection.cursor() as cursor:
+            if any(index['method'] == 'gin' for index in indexes):
+                cursor.execute(cls.TRIGRAM_EXTENSION)
+            for index in indexes:
+                cursor.execute(cls.__index_query(schema, table_name, index, False))
+
+    @staticmethod
+    def create_range_partition(schema: str, table_name: str, partition_name: str, start, end):
+        query = sql.SQL("CREATE TABLE IF NOT EXISTS {}.{} PARTITION OF {}.{} FOR VALUES FROM ({}) TO ({})").format(
+            sql.Identifier(schema),
+            sql.Identifier(partition_name),
+            sql.Identifier(schema),
+            sql.Identifier(table_name),
+            sql.Literal(start),
+            sql.Literal(end)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(query)
+
+    @classmethod
+    def drop_index(cls, schema: str, table_name: str, index_name: str, concurrently: bool = True):
+        # an index of the same name on another table is left alone
+        if cls.__get_index_validity(schema, table_name, index_name) is not None:
+            cls.__drop_index(schema, index_name, concurrently and not connection.in_atomic_block)
+
+    @classmethod
+    def __get_index_validity(cls, schema: str, table_name: str, index_name: str) -> Optional[bool]:
+        with connection.cursor() as cursor:
+            cursor.execute(cls.INDEX_VALIDITY, (schema, table_name, index_name))
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def __drop_index(schema: str, index_name: str, concurrently: bool):
+        query = sql.SQL("DROP INDEX {}IF EXISTS {}.{}").format(
+            sql.SQL("CONCURRENTLY ") if concurrently else sql.SQL(""),
+            sql.Identifier(schema),
+            sql.Identifier(index_name)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(query)
+
+    @classmethod
+    def __index_query(cls, schema: str, table_name: str, index: dict, concurrently: bool) -> sql.Composed:
+        operator_class = sql.SQL(" gin_trgm_ops") if index['method'] == 'gin' else sql.SQL("")
+        return sql.SQL("CREATE {}INDEX {}{} ON {}.{} USING {} ({}){}").format(
+            sql.SQL("UNIQUE ") if index['unique'] else sql.SQL(""),
+            sql.SQL("CONCURRENTLY ") if concurrently else sql.SQL(""),
+            sql.Identifier(index['name']),
+            sql.Identifier(schema),
+            sql.Identifier(table_name),
+            sql.SQL(index['method']),
+            sql.SQL(", ").join([sql.Identifier(column) + operator_class for column in index['fields']]),
+            cls.__where(index['where'])
+        )
+
+    @classmethod
+    def __where(cls, conditions: list) -> sql.Composable:
+        if not conditions:
+            return sql.SQL("")
+        predicates = []
+        for column, operator, value in conditions:
+            if operator == 'in':
+                predicates.append(sql.SQL("{} IN ({})").format(sql.Identifier(column),
+                                                               sql.SQL(", ").join(map(sql.Literal, value))))
+            elif value is None:
+                predicates.append(sql.SQL("{} IS NULL").format(sql.Identifier(column)))
+            else:
+                predicates.append(sql.SQL("{} {} {}").format(sql.Identifier(column), sql.SQL(cls.OPERATORS[operator]),
+                                                             sql.Literal(value)))
+        return sql.SQL(" WHERE ") + sql.SQL(" AND ").join(predicates)
@@ -7,6 +7,17 @@ class PhysicalTableStorageRepositoryInterface(metaclass=ABCMeta):
     def execute(query: str):
         pass
 
+    @staticmethod
+    @abstractmethod
+    def execute_with_lock_timeout(queries: list, lock_timeout: int):
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def backfill(schema: str, table_name: str, column: str, expression, condition, key_columns: list, after,
+                 limit: int):
+        pass
+
     @staticmethod
     @abstractmethod
     def get_existing_columns(schema, table_name: str) -> list:
@@ -16,7 +27,52 @@ class PhysicalTableStorageRepositoryInterface(metaclass=ABCMeta):
     def table_exists(schema, table_name: str) -> bool:
         pass
 
+    @staticmethod
+    @abstractmethod
+    def get_partitions(schema: str, table_name: str) -> list:
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def get_indexes(schema: str, table_names: list) -> list:
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def describe_table(schema: str, table_name: str):
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def describe_schema(schema: str):
+        pass
+
     @staticmethod
     @abstractmethod
     def get_sql_type(entity_field_type: str):
         pass
+
+    @staticmethod
+    @abstractmethod
+    def get_existing_relations(schema: str, names: list):
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def create_index(schema: str, table_name: str, index: dict, concurrently: bool = True):
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def create_indexes(schema: str, table_name: str, indexes: list, concurrently: bool = True):
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def create_range_partition(schema: str, table_name: str, partition_name: str, start, end):
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def drop_index(schema: str, table_name: str, index_name: str, concurrently: bool = True):
+        pass
@@ -0,0 +1,50 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ReferenceCache:
+    """Bounded, time limited cache of resolved references, keyed by referenced entity and keys."""
+
+    MISSING = object()
+
+    def __init__(self, size: int, ttl: float):
+        self.__size = size
+        self.__ttl = ttl
+        self.__items = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def is_enabled(self) -> bool:
+        return self.__size > 0 and self.__ttl > 0
+
+    def get(self, storage: str, keys: tuple):
+        if not self.is_enabled():
+            return self.MISSING
+        with self.__lock:
+            item = self.__items.get((storage, keys))
+            if item is None:
+                return self.MISSING
+            expires, value = item
+            if expires < time.monotonic():
+                del self.__items[(storage, keys)]
+                return self.MISSING
+            self.__items.move_to_end((storage, keys))
+            return value
+
+    def put(self, storage: str, keys: tuple, value) -> None:
+        if not self.is_enabled():
+            return
+        with self.__lock:
+            self.__items[(storage, keys)] = (time.monotonic() + self.__ttl, value)
+            self.__items.move_to_end((storage, keys))
+            while len(self.__items) > self.__size:
+                self.__items.popitem(last=False)
+
+    def invalidate(self, name: str) -> None:
+        with self.__lock:
+            for key in [key for key in self.__items if key[0] == name]:
+                del self.__items[key]
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__items.clear()
@@ -0,0 +1,52 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+
+class SchemaSnapshot:
+    """In-process copy of the columns of every storage table, dropped whenever a table changes."""
+
+    def __init__(self):
+        self.__tables = None
+        self.__stale = set()
+        self.__generation = 0
+        self.__lock = threading.Lock()
+
+    def is_loaded(self) -> bool:
+        return self.__tables is not None
+
+    def load(self, tables: Dict[str, Dict[str, str]], generation: int) -> None:
+        with self.__lock:
+            # do not keep a snapshot read while the tables were being changed
+            if generation == self.__generation:
+                self.__tables = tables
+                self.__stale = set()
+
+    def lookup(self, table_name: str) -> Tuple[bool, Optional[Dict[str, str]]]:
+        tables = self.__tables
+        if tables is None or table_name in self.__stale:
+            return False, None
+        return True, tables.get(table_name)
+
+    def put(self, table_name: str, columns: Optional[Dict[str, str]], generation: int) -> None:
+        with self.__lock:
+            if generation != self.__generation or self.__tables is None:
+                return
+            if columns is None:
+                self.__tables.pop(table_name, None)
+            else:
+                self.__tables[table_name] = columns
+            self.__stale.discard(table_name)
+
+    def get_generation(self) -> int:
+        return self.__generation
+
+    def invalidate(self, name: str) -> None:
+        with self.__lock:
+            self.__generation += 1
+            self.__stale.add(name)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__generation += 1
+            self.__tables = None
+            self.__stale = set()
@@ -0,0 +1,61 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+from psycopg import sql
+
+
+class StatementCache:
+    """Bounded cache of composed storage statements, keyed by (schema, table, columns, operation).
+
+    A statement executed more than prepare_threshold times is prepared on the server, a negative threshold never
+    prepares it.
+    """
+
+    def __init__(self, size: int, prepare_threshold: int):
+        self.__size = size
+        self.__prepare_threshold = prepare_threshold
+        self.__items = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = threading.Lock()
+
+    def is_enabled(self) -> bool:
+        return self.__size > 0
+
+    def get(self, key: tuple, build: Callable[[], sql.Composable]) -> Tuple[sql.Composable, bool]:
+        """The statement of the key, built on a miss, and whether it should be prepared."""
+        if not self.is_enabled():
+            return build(), False
+        with self.__lock:
+            item = self.__items.get(key)
+            if item is None:
+                self.__misses += 1
+                item = self.__items[key] = [build(), 0]
+                while len(self.__items) > self.__size:
+                    self.__items.popitem(last=False)
+            else:
+                self.__hits += 1
+                self.__items.move_to_end(key)
+            item[1] += 1
+            return item[0], 0 <= self.__prepare_threshold < item[1]
+
+    def get_metrics(self) -> dict:
+        with self.__lock:
+            lookups = self.__hits + self.__misses
+            return {
+                'size': len(self.__items),
+                'hits': self.__hits,
+                'misses': self.__misses,
+                'hit_ratio': round(self.__hits / lookups, 3) if lookups else 0.0,
+                'prepare_threshold': self.__prepare_threshold
+            }
+
+    def invalidate(self, name: str) -> None:
+        with self.__lock:
+            for key in [key for key in self.__items if key[1] == name]:
+                del self.__items[key]
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__items.clear()
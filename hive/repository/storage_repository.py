@@ -1,52 +1,366 @@
-from typing import Dict
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from django.db import connection
-from psycopg import sql
+from django.db import DatabaseError, connection
+from psycopg import AsyncConnection, sql
+
+from hive.db.pipeline import pipeline
+from hive.db.prepared import fetch_one
+from hive.repository.statement_cache import StatementCache
 
 
 class StorageRepository:
+    # PostgreSQL accepts at most 65535 bind parameters per statement
+    MAX_PARAMETERS = 65535
+    OPERATORS = {'eq': '=', 'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<=', 'prefix': 'LIKE'}
 
-    @staticmethod
-    def find_by_keys(columns: list, keys: dict, table_name: str, schema: str) -> Dict[str, str]:
-        query = sql.SQL("SELECT * FROM {}.{} WHERE {}").format(
+    def __init__(self, statement_cache: StatementCache = None):
+        self.__statement_cache = statement_cache or StatementCache(size=0, prepare_threshold=-1)
+
+    def find_by_keys(self, columns: list, keys: dict, table_name: str, schema: str) -> Dict[str, str]:
+        query, prepare = self.__statement_cache.get(
+            (schema, table_name, (tuple(keys), tuple(columns)), 'select'),
+            lambda: sql.SQL("SELECT {} FROM {}.{} WHERE {}").format(
+                self.__column_list(columns),
+                sql.Identifier(schema),
+                sql.Identifier(table_name),
+                self.__key_condition(keys)
+            )
+        )
+        row = fetch_one(query, tuple(keys.values()), prepare)
+
+        if not row:
+            return {}
+        return dict(zip(columns, row))
+
+    def find_many_by_keys(self, schema: str, table_name: str, key_columns: list, keys: list,
+                          columns: list) -> List[Dict[str, str]]:
+        select = key_columns + [column for column in columns if column not in key_columns]
+        queries = list(self.__many_by_keys_queries(schema, table_name, key_columns, keys, select))
+        return [dict(zip(select, row)) for rows in self.__fetch_all(queries) for row in rows]
+
+    def find_many_by_key_sets(self, schema: str, table_name: str, key_sets: dict,
+                              columns: list) -> Dict[tuple, List[Dict[str, str]]]:
+        """Records found by several sets of key columns, {key columns: keys}, with all the queries in one pipeline."""
+        queries = []
+        selects = {}
+        for key_columns, keys in key_sets.items():
+            select = list(key_columns) + [column for column in columns if column not in key_columns]
+            chunks = list(self.__many_by_keys_queries(schema, table_name, list(key_columns), keys, select))
+            selects[key_columns] = (select, len(chunks))
+            queries.extend(chunks)
+        results = iter(self.__fetch_all(queries))
+        found = {}
+        for key_columns, (select, chunks) in selects.items():
+            found[key_columns] = [dict(zip(select, row)) for _ in range(chunks) for row in next(results)]
+        return found
+
+    async def afind_many_by_keys(self, async_connection: AsyncConnection, schema: str, table_name: str,
+                                 key_columns: list, keys: list, columns: list) -> List[Dict[str, str]]:
+        select = key_columns + [column for column in columns if column not in key_columns]
+        result = []
+        for query, values in self.__many_by_keys_queries(schema, table_name, key_columns, keys, select):
+            cursor = await async_connection.execute(query, values)
+            result.extend(dict(zip(select, row)) for row in await cursor.fetchall())
+        return result
+
+    def __many_by_keys_queries(self, schema: str, table_name: str, key_columns: list, keys: list,
+                               select: list) -> Iterator[Tuple[sql.Composed, tuple]]:
+        chunk_size = max(1, self.MAX_PARAMETERS // len(key_columns))
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start:start + chunk_size]
+            if len(key_columns) == 1:
+                condition = sql.SQL("{} = ANY(%s)").format(sql.Identifier(key_columns[0]))
+                values = ([key[0] for key in chunk],)
+            else:
+                row = sql.SQL("({})").format(sql.SQL(", ").join(sql.Placeholder() * len(key_columns)))
+                condition = sql.SQL("({}) IN (VALUES {})").format(
+                    sql.SQL(", ").join(map(sql.Identifier, key_columns)),
+                    sql.SQL(", ").join([row] * len(chunk))
+                )
+                values = tuple(value for key in chunk for value in key)
+            yield sql.SQL("SELECT {} FROM {}.{} WHERE {}").format(
+                sql.SQL(", ").join(map(sql.Identifier, select)),
+                sql.Identifier(schema),
+                sql.Identifier(table_name),
+                condition
+            ), values
+
+    def find_page(self, schema: str, table_name: str, columns: list, filters: list, key_columns: list,
+                  after: list, limit: int) -> List[Dict[str, str]]:
+        select = key_columns + [column for column in columns if column not in key_columns]
+        query, values = self.__page_query(schema, table_name, sql.SQL(", ").join(map(sql.Identifier, select)),
+                                          filters, key_columns, after, limit)
+        with connection.cursor() as cursor:
+            cursor.execute(query, values)
+            return [dict(zip(select, row)) for row in cursor.fetchall()]
+
+    def find_page_json(self, schema: str, table_name: str, columns: list, filters: list, key_columns: list,
+                       after: list, limit: int, formats: dict) -> List[Tuple[str, tuple]]:
+        """The page as (JSON text of the record, primary key) rows, the JSON is generated by PostgreSQL."""
+        select = sql.SQL(", ").join([self.__json_record(columns, formats)] + list(map(sql.Identifier, key_columns)))
+        query, values = self.__page_query(schema, table_name, select, filters, key_columns, after, limit)
+        with connection.cursor() as cursor:
+            cursor.execute(query, values)
+            return [(row[0], row[1:]) for row in cursor.fetchall()]
+
+    def find_json_by_keys(self, schema: str, table_name: str, keys: dict, columns: list,
+                          formats: dict) -> Optional[str]:
+        query = sql.SQL("SELECT {} FROM {}.{} t WHERE {}").format(
+            self.__json_record(columns, formats),
             sql.Identifier(schema),
             sql.Identifier(table_name),
-            sql.SQL(" AND ".join([f"{key} = %s" for key in keys]))
+            self.__key_condition(keys)
         )
         with connection.cursor() as cursor:
             cursor.execute(query, tuple(keys.values()))
             row = cursor.fetchone()
+        return row[0] if row else None
 
-        if not row:
-            return {}
-        return dict(zip(columns, row))
+    def __page_query(self, schema: str, table_name: str, select: sql.Composable, filters: list, key_columns: list,
+                     after: list, limit: int) -> Tuple[sql.Composed, tuple]:
+        conditions = []
+        values = []
+        for column, operator, value in filters:
+            conditions.append(self.__filter_condition(column, operator))
+            values.append(value)
+        if after:
+            # row comparison walks the primary key index, so every page costs the same
+            conditions.append(sql.SQL("({}) > ({})").format(
+                sql.SQL(", ").join(map(sql.Identifier, key_columns)),
+                sql.SQL(", ").join(sql.Placeholder() * len(key_columns))
+            ))
+            values.extend(after)
+        query = sql.SQL("SELECT {} FROM {}.{} t {} ORDER BY {} LIMIT %s").format(
+            select,
+            sql.Identifier(schema),
+            sql.Identifier(table_name),
+            sql.SQL("WHERE {}").format(sql.SQL(" AND ").join(conditions)) if conditions else sql.SQL(""),
+            sql.SQL(", ").join(map(sql.Identifier, key_columns))
+        )
+        return query, tuple(values) + (limit,)
 
-    def create(self, schema, table_name: str, columns: list, data: dict) -> Dict[str, str]:
-        keys = data.keys()
-        placeholders = ', '.join(['%s'] * len(data))
-        query_columns = ', '.join(keys)
-        values = tuple(data.values())
-        query = sql.SQL("INSERT INTO {}.{} ({}) VALUES ({}) RETURNING *;").format(
+    def aggregate(self, schema: str, table_name: str, group_by: list, aggregates: list,
+                  filters: list) -> List[Dict[str, str]]:
+        expressions = [sql.Identifier(column) for column in group_by]
+        for function, column, alias, cast in aggregates:
+            expression = sql.SQL("{}({})").format(sql.SQL(function),
+                                                  sql.Identifier(column) if column else sql.SQL("*"))
+            if cast:
+                expression = sql.SQL("CAST({} AS {})").format(expression, sql.SQL(cast))
+            expressions.append(sql.SQL("{} AS {}").format(expression, sql.Identifier(alias)))
+        conditions = [self.__filter_condition(column, operator) for column, operator, _ in filters]
+        query = sql.SQL("SELECT {} FROM {}.{} {}").format(
+            sql.SQL(", ").join(expressions),
             sql.Identifier(schema),
             sql.Identifier(table_name),
-            sql.SQL(query_columns),
-            sql.SQL(placeholders)
+            sql.SQL("WHERE {}").format(sql.SQL(" AND ").join(conditions)) if conditions else sql.SQL("")
         )
+        if group_by:
+            columns = sql.SQL(", ").join(map(sql.Identifier, group_by))
+            query += sql.SQL(" GROUP BY {} ORDER BY {}").format(columns, columns)
+        names = group_by + [alias for _, _, alias, _ in aggregates]
         with connection.cursor() as cursor:
-            cursor.execute(query, values)
-            row = cursor.fetchone()
-        return dict(zip(columns, row))
+            cursor.execute(query, tuple(value for _, _, value in filters))
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    @staticmethod
+    def __filter_condition(column: str, operator: str) -> sql.Composed:
+        if operator == 'in':
+            return sql.SQL("{} = ANY(%s)").format(sql.Identifier(column))
+        return sql.SQL("{} {} %s").format(sql.Identifier(column), sql.SQL(StorageRepository.OPERATORS[operator]))
+
+    @staticmethod
+    def stream(schema: str, table_name: str, columns: list, batch_size: int,
+               casts: dict = None) -> Iterator[List[Dict[str, str]]]:
+        casts = casts or {}
+        select = [sql.SQL("CAST({} AS {}) AS {}").format(sql.Identifier(column), sql.SQL(casts[column]),
+                                                          sql.Identifier(column))
+                  if column in casts else sql.Identifier(column) for column in columns]
+        query = sql.SQL("SELECT {} FROM {}.{}").format(
+            sql.SQL(", ").join(select),
+            sql.Identifier(schema),
+            sql.Identifier(table_name)
+        )
+        # a named cursor keeps the result on the server, only one batch at a time is held here
+        with connection.chunked_cursor() as cursor:
+            cursor.execute(query)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [dict(zip(columns, row)) for row in rows]
+
+    @classmethod
+    def stream_json(cls, schema: str, table_name: str, columns: list, batch_size: int,
+                    formats: dict) -> Iterator[List[str]]:
+        query = sql.SQL("SELECT {} FROM {}.{} t").format(
+            cls.__json_record(columns, formats),
+            sql.Identifier(schema),
+            sql.Identifier(table_name)
+        )
+        with connection.chunked_cursor() as cursor:
+            cursor.execute(query)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [row[0] for row in rows]
+
+    def create(self, schema, table_name: str, columns: list, data: dict) -> Dict[str, str]:
+        query, prepare = self.__statement_cache.get(
+            (schema, table_name, (tuple(data), tuple(columns)), 'insert'),
+            lambda: sql.SQL("INSERT INTO {}.{} ({}) VALUES ({}) RETURNING {};").format(
+                sql.Identifier(schema),
+                sql.Identifier(table_name),
+                self.__column_list(data),
+                sql.SQL(", ").join(sql.Placeholder() * len(data)),
+                self.__column_list(columns)
+            )
+        )
+        return dict(zip(columns, fetch_one(query, tuple(data.values()), prepare)))
 
     def update(self, schema: str, table_name: str, columns: list, data: dict, identities: dict) -> Dict[str, str]:
-        set_values = ", ".join([f"{key} = %s" for key in data.keys()])
-        values = tuple(data.values()) + tuple(identities.values())
-        query = sql.SQL("UPDATE {}.{} SET {} WHERE {} RETURNING *;").format(
+        query, prepare = self.__statement_cache.get(
+            (schema, table_name, (tuple(data), tuple(identities), tuple(columns)), 'update'),
+            lambda: sql.SQL("UPDATE {}.{} SET {} WHERE {} RETURNING {};").format(
+                sql.Identifier(schema),
+                sql.Identifier(table_name),
+                sql.SQL(", ").join([sql.SQL("{} = %s").format(sql.Identifier(key)) for key in data]),
+                self.__key_condition(identities),
+                self.__column_list(columns)
+            )
+        )
+        row = fetch_one(query, tuple(data.values()) + tuple(identities.values()), prepare)
+        return dict(zip(columns, row))
+
+    def upsert(self, schema: str, table_name: str, columns: list, data: dict,
+               primary_keys: list) -> Dict[str, str]:
+        record = self.execute_upsert(schema, table_name, list(data), tuple(data.values()), primary_keys)
+        return {column: record.get(column) for column in columns}
+
+    def execute_upsert(self, schema: str, table_name: str, columns: list, values: tuple,
+                       primary_keys: list) -> Dict[str, str]:
+        query, prepare = self.__statement_cache.get(
+            (schema, table_name, (tuple(columns), tuple(primary_keys)), 'upsert'),
+            lambda: self.build_upsert_query(schema, table_name, columns, 1, primary_keys)
+        )
+        return dict(zip(columns, fetch_one(query, values, prepare)))
+
+    def get_statement_metrics(self) -> dict:
+        return self.__statement_cache.get_metrics()
+
+    @staticmethod
+    async def aexecute_upsert(async_connection: AsyncConnection, query: sql.Composed, columns: list,
+                              values: tuple) -> Dict[str, str]:
+        cursor = await async_connection.execute(query, values)
+        row = await cursor.fetchone()
+        return dict(zip(columns, row))
+
+    def upsert_many(self, schema: str, table_name: str, columns: list, rows: list,
+                    primary_keys: list) -> List[Dict[str, str]]:
+        chunk_size = max(1, self.MAX_PARAMETERS // len(columns))
+        queries = []
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            queries.append((self.build_upsert_query(schema, table_name, columns, len(chunk), primary_keys),
+                            tuple(row[column] for row in chunk for column in columns)))
+        return [dict(zip(columns, row)) for rows in self.__fetch_all(queries) for row in rows]
+
+    @staticmethod
+    def upsert_each(query: sql.Composed, columns: list, rows: list) -> list:
+        """Upserts the rows one by one, each in a savepoint of the current transaction.
+
+        A rejected row gets its DatabaseError in place of the record. The statements go through a pipeline, so a row
+        costs one round trip instead of three.
+        """
+        result = []
+        with pipeline(), connection.cursor() as cursor:
+            for values in rows:
+                try:
+                    with connection.wrap_database_errors, connection.connection.transaction():
+                        cursor.execute(query, values)
+                    result.append(dict(zip(columns, cursor.fetchone())))
+                except DatabaseError as e:
+                    result.append(e)
+        return result
+
+    @staticmethod
+    def __fetch_all(queries: list) -> List[list]:
+        # independent queries share one round trip, a fetch waits for the results of all of them
+        if not queries:
+            return []
+        if len(queries) == 1:
+            with connection.cursor() as cursor:
+                cursor.execute(*queries[0])
+                return [cursor.fetchall()]
+        with pipeline():
+            cursors = [connection.cursor() for _ in queries]
+            try:
+                for cursor, (query, values) in zip(cursors, queries):
+                    cursor.execute(query, values)
+                return [cursor.fetchall() for cursor in cursors]
+            finally:
+                for cursor in cursors:
+                    cursor.close()
+
+    def copy_upsert(self, schema: str, table_name: str, columns: list, rows: list, primary_keys: list) -> int:
+        staging = sql.Identifier(f"staging_{table_name}")
+        column_list = sql.SQL(", ").join([sql.Identifier(column) for column in columns])
+        pk_list = sql.SQL(", ").join([sql.Identifier(pk) for pk in primary_keys])
+        create_staging = sql.SQL("CREATE TEMP TABLE {} (LIKE {}.{} INCLUDING DEFAULTS) ON COMMIT DROP;").format(
+            staging, sql.Identifier(schema), sql.Identifier(table_name))
+        copy = sql.SQL("COPY {} ({}) FROM STDIN").format(staging, column_list)
+        # the last copied row wins when the same primary keys appear more than once
+        merge = sql.SQL("INSERT INTO {}.{} ({}) SELECT DISTINCT ON ({}) {} FROM {} ORDER BY {}, ctid DESC "
+                        "ON CONFLICT ({}) DO UPDATE SET {};").format(
+            sql.Identifier(schema), sql.Identifier(table_name), column_list, pk_list, column_list, staging, pk_list,
+            pk_list, self.__conflict_update(columns, primary_keys))
+        with connection.cursor() as cursor:
+            cursor.execute(create_staging)
+            # COPY goes straight to psycopg, so translate its errors the way Django cursors do
+            with connection.wrap_database_errors, cursor.copy(copy) as copy_stream:
+                for row in rows:
+                    copy_stream.write_row(tuple(row[column] for column in columns))
+            cursor.execute(merge)
+            merged = cursor.rowcount
+            cursor.execute(sql.SQL("DROP TABLE {};").format(staging))
+        return merged
+
+    @classmethod
+    def build_upsert_query(cls, schema: str, table_name: str, columns: list, rows_count: int,
+                           primary_keys: list) -> sql.Composed:
+        row_placeholders = sql.SQL("({})").format(sql.SQL(", ").join([sql.Placeholder()] * len(columns)))
+        return sql.SQL("INSERT INTO {}.{} ({}) VALUES {} ON CONFLICT ({}) DO UPDATE SET {} RETURNING {};").format(
             sql.Identifier(schema),
             sql.Identifier(table_name),
-            sql.SQL(set_values),
-            sql.SQL(" AND ".join([f"{identity} = %s" for identity in identities]))
+            sql.SQL(", ").join([sql.Identifier(column) for column in columns]),
+            sql.SQL(", ").join([row_placeholders] * rows_count),
+            sql.SQL(", ").join([sql.Identifier(pk) for pk in primary_keys]),
+            cls.__conflict_update(columns, primary_keys),
+            cls.__column_list(columns)
         )
-        with connection.cursor() as cursor:
-            cursor.execute(query, values)
-            row = cursor.fetchone()
-            return dict(zip(columns, row))
+
+    @staticmethod
+    def __json_record(columns: list, formats: dict) -> sql.Composed:
+        # cast to text, the JSON is passed on as it is and never parsed here
+        return sql.SQL("(SELECT row_to_json(r) FROM (SELECT {}) r)::text").format(sql.SQL(", ").join([
+            sql.SQL("to_char({}, {}) AS {}").format(sql.Identifier('t', column), sql.Literal(formats[column]),
+                                                    sql.Identifier(column))
+            if column in formats else sql.SQL("{} AS {}").format(sql.Identifier('t', column), sql.Identifier(column))
+            for column in columns
+        ]))
+
+    @staticmethod
+    def __column_list(columns) -> sql.Composed:
+        # named columns instead of *, a prepared statement fails once the row type of the table changes
+        return sql.SQL(", ").join(map(sql.Identifier, columns))
+
+    @staticmethod
+    def __key_condition(keys: dict) -> sql.Composed:
+        return sql.SQL(" AND ").join([sql.SQL("{} = %s").format(sql.Identifier(key)) for key in keys])
+
+    @staticmethod
+    def __conflict_update(columns: list, primary_keys: list) -> sql.Composed:
+        update_columns = [column for column in columns if column not in primary_keys] or primary_keys
+        return sql.SQL(", ").join([sql.SQL("{} = EXCLUDED.{}").format(sql.Identifier(column), sql.Identifier(column))
+                                   for column in update_columns])
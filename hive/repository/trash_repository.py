@@ -0,0 +1,38 @@
+from typing import Optional
+
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+
+from hive.entity.trashed_table_model import TrashedTable
+
+
+class TrashRepository:
+
+    @staticmethod
+    def create(entity_name: str, table_name: str) -> TrashedTable:
+        return TrashedTable.objects.create(entity_name=entity_name, table_name=table_name)
+
+    @staticmethod
+    def get(trash_id: int) -> TrashedTable:
+        try:
+            return TrashedTable.objects.get(id=trash_id)
+        except TrashedTable.DoesNotExist:
+            raise NotFound("Trashed table not exist")
+
+    @staticmethod
+    def get_all() -> list:
+        return list(TrashedTable.objects.order_by('-id'))
+
+    @staticmethod
+    def lock_next_pending() -> Optional[TrashedTable]:
+        # workers running side by side skip the table another one is purging
+        return TrashedTable.objects.select_for_update(skip_locked=True).filter(
+            status=TrashedTable.PENDING).order_by('id').first()
+
+    @staticmethod
+    def mark(trashed_table: TrashedTable, status: str, error: str = '') -> TrashedTable:
+        trashed_table.status = status
+        trashed_table.error = error
+        trashed_table.purged_at = timezone.now() if status == TrashedTable.PURGED else None
+        trashed_table.save(update_fields=['status', 'error', 'purged_at'])
+        return trashed_table
@@ -0,0 +1,69 @@
+import hashlib
+import json
+import threading
+import time
+
+from django.db import connection
+from psycopg import AsyncConnection
+from psycopg.pq import TransactionStatus
+
+from hive.repository.advisory_lock_repository import AdvisoryLockRepository
+
+
+class AdvisoryLockManager:
+    """Serializes writes of the same records across processes with PostgreSQL advisory locks."""
+
+    def __init__(self, advisory_lock_repository: AdvisoryLockRepository):
+        self.__advisory_lock_repository = advisory_lock_repository
+        self.__metrics_lock = threading.Lock()
+        self.__metrics = {
+            'acquisitions': 0,
+            'keys': 0,
+            'contended_acquisitions': 0,
+            'contended_keys': 0,
+            'wait_seconds': 0.0,
+        }
+
+    def lock(self, entity_name: str, primary_keys: list) -> None:
+        if not primary_keys:
+            return
+        if not connection.in_atomic_block:
+            raise RuntimeError("Advisory locks can be taken only inside a transaction.")
+        keys = sorted({self.key(entity_name, values) for values in primary_keys})
+        started = time.monotonic()
+        contended = self.__advisory_lock_repository.lock(keys)
+        self.__count(keys, contended, time.monotonic() - started)
+
+    async def alock(self, async_connection: AsyncConnection, entity_name: str, primary_keys: list) -> None:
+        if not primary_keys:
+            return
+        if async_connection.info.transaction_status != TransactionStatus.INTRANS:
+            raise RuntimeError("Advisory locks can be taken only inside a transaction.")
+        keys = sorted({self.key(entity_name, values) for values in primary_keys})
+        started = time.monotonic()
+        contended = await self.__advisory_lock_repository.alock(async_connection, keys)
+        self.__count(keys, contended, time.monotonic() - started)
+
+    def __count(self, keys: list, contended: int, waited: float) -> None:
+        with self.__metrics_lock:
+            self.__metrics['acquisitions'] += 1
+            self.__metrics['keys'] += len(keys)
+            if contended:
+                self.__metrics['contended_acquisitions'] += 1
+                self.__metrics['contended_keys'] += contended
+                self.__metrics['wait_seconds'] += waited
+
+    def get_metrics(self) -> dict:
+        with self.__metrics_lock:
+            return dict(self.__metrics)
+
+    @classmethod
+    def ddl_key(cls, entity_name: str) -> int:
+        # every record has primary key values, so schema changes never share a key with record writes
+        return cls.key(entity_name, ())
+
+    @staticmethod
+    def key(entity_name: str, values: tuple) -> int:
+        payload = json.dumps([entity_name, *values], default=str, separators=(',', ':'))
+        digest = hashlib.blake2b(payload.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big', signed=True)
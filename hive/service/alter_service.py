@@ -0,0 +1,260 @@
+import copy
+import time
+from typing import Optional
+
+from django.db import DatabaseError, OperationalError
+from psycopg import sql
+from rest_framework import serializers
+
+from hive.builder.column_migration_builder import ColumnMigrationBuilder
+from hive.builder.dto.field import Field
+from hive.builder.table_compiler import TableCompiler
+from hive.entity.entity_model import Entity
+from hive.repository.advisory_lock_repository import AdvisoryLockRepository
+from hive.repository.entity_repository import EntityRepository
+from hive.repository.physical_table_storage_repository import PhysicalTableStorageRepository
+from hive.service.advisory_lock_manager import AdvisoryLockManager
+from hive.service.create_service import CreateService
+from hive.service.dto.request_data import RequestData
+from hive.service.index_service import IndexService
+from hive.validator.entity_validator import EntityValidator
+
+
+class AlterService:
+    """Applies a changed entity definition to its table without blocking the writers of the table."""
+
+    SHADOW_PREFIX = '_shadow_'
+    LOCK_NOT_AVAILABLE = '55P03'
+    MAX_BACKOFF = 5
+
+    def __init__(self, entity_repository: EntityRepository,
+                 entity_validator: EntityValidator,
+                 create_service: CreateService,
+                 index_service: IndexService,
+                 table_compiler: TableCompiler,
+                 physical_table_storage_repository: PhysicalTableStorageRepository,
+                 advisory_lock_repository: AdvisoryLockRepository,
+                 schema: str,
+                 lock_timeout: int,
+                 lock_retries: int,
+                 batch_size: int
+                 ):
+        self.__entity_repository = entity_repository
+        self.__entity_validator = entity_validator
+        self.__create_service = create_service
+        self.__index_service = index_service
+        self.__table_compiler = table_compiler
+        self.__physical_table_storage_repository = physical_table_storage_repository
+        self.__advisory_lock_repository = advisory_lock_repository
+        self.__schema = schema
+        self.__lock_timeout = lock_timeout
+        self.__lock_retries = lock_retries
+        self.__batch_size = batch_size
+
+    def alter_entity(self, name: str, data) -> Entity:
+        entity = self.__entity_repository.get_by_name(name)
+        fields = self.__prepare_fields(entity, data)
+        added, removed, changed = self.__diff(entity, fields)
+        if not added and not removed and not changed:
+            raise serializers.ValidationError('No changes to apply.')
+
+        # one migration of an entity at a time, the steps run in many short transactions
+        key = AdvisoryLockManager.ddl_key(entity.name)
+        with self.__advisory_lock_repository.try_migration_lock(key) as locked:
+            if not locked:
+                raise serializers.ValidationError('Entity is already being changed')
+            applied = {field['name']: field for field in entity.fields}
+            rewritten = []
+            try:
+                # column changes may fail on existing values, so they go before the columns are added or removed
+                for old, new in changed:
+                    if self.__alter_column(entity, old, new):
+                        rewritten.append(new['name'])
+                    applied[new['name']] = new
+                if added or removed:
+                    self.__add_and_remove_columns(entity, added, removed)
+            except Exception:
+                # the steps done so far stay applied, the stored definition has to describe them
+                if list(applied.values()) != entity.fields:
+                    self.__save(entity, list(applied.values()), rewritten)
+                raise
+        return self.__save(entity, fields, rewritten)
+
+    def __save(self, entity: Entity, fields: list, rewritten: list) -> Entity:
+        names = {field['name'] for field in fields}
+        indexes = [index for index in entity.indexes if set(index['fields']) <= names]
+        entity = self.__entity_repository.update_fields(entity.name, fields, indexes)
+        if rewritten:
+            # indexes of a swapped column were dropped together with the old column
+            self.__index_service.create_indexes(entity, rewritten)
+        return entity
+
+    def __prepare_fields(self, entity: Entity, data) -> list:
+        if not isinstance(data, dict) or not isinstance(data.get('fields'), list) or not data['fields']:
+            raise serializers.ValidationError('Invalid type of data in the "fields" field')
+        for key in ('identity', 'primary_keys'):
+            if key in data and data[key] != getattr(entity, key):
+                raise serializers.ValidationError(f'The "{key}" field cannot be changed')
+        request_data = RequestData({'name': entity.name, 'fields': copy.deepcopy(data['fields']),
+                                    'identity': list(entity.identity), 'primary_keys': list(entity.primary_keys)})
+        self.__entity_validator.validate_fields(request_data.fields)
+        self.__create_service.prepare_fields(request_data)
+        self.__entity_validator.validate_fields(request_data.fields)
+        return request_data.fields
+
+    def __diff(self, entity: Entity, fields: list) -> tuple:
+        stored = {field['name']: field for field in entity.fields}
+        new = {field['name']: field for field in fields}
+        fixed = set(entity.primary_keys) | set(entity.identity) | {entity.partitioning.get('field')}
+        added = [field for name, field in new.items() if name not in stored]
+        removed = [field for name, field in stored.items() if name not in new]
+        changed = [(stored[name], field) for name, field in new.items()
+                   if name in stored and self.__definition(stored[name]) != self.__definition(field)]
+        for field in removed + [new for _, new in changed]:
+            if field['name'] in fixed:
+                raise serializers.ValidationError(f'Field {field["name"]} is a key and cannot be changed')
+        for old, new in changed:
+            if 'ref' in (old['type'], new['type']) and (old['type'], old['config']) != (new['type'], new['config']):
+                raise serializers.ValidationError(f'Reference field {new["name"]} cannot be changed')
+            # money is stored as int cents, a cast to or from another type would change the scale of the values
+            if 'money' in (old['type'], new['type']) and old['type'] != new['type']:
+                raise serializers.ValidationError(f'Field {new["name"]} cannot be changed from or to money')
+        for field in added:
+            if field['name'].startswith(self.SHADOW_PREFIX):
+                raise serializers.ValidationError(f'Field names cannot start with {self.SHADOW_PREFIX}')
+            if not field['nullable'] and field.get('default') is None:
+                raise serializers.ValidationError(f'New field {field["name"]} must be nullable or have a default')
+        return added, removed, changed
+
+    @staticmethod
+    def __definition(field: dict) -> tuple:
+        return field['type'], field['config'], bool(field['nullable']), field.get('default')
+
+    def __add_and_remove_columns(self, entity: Entity, added: list, removed: list) -> None:
+        # a new NOT NULL column with a constant default is a catalog only change since PostgreSQL 11
+        existing_columns = self.__physical_table_storage_repository.get_existing_columns(self.__schema, entity.name)
+        query = self.__table_compiler.alter_table(entity.name, [self.__field(field) for field in added],
+                                                  [self.__field(field) for field in removed], existing_columns)
+        self.__execute([query])
+
+    def __alter_column(self, entity: Entity, old: dict, new: dict) -> bool:
+        builder = ColumnMigrationBuilder(self.__schema, entity.name)
+        name = new['name']
+        old_type = TableCompiler.get_column_type(self.__field(old))
+        new_type = TableCompiler.get_column_type(self.__field(new))
+        if old_type != new_type and not self.__is_binary_coercible(old_type, new_type):
+            self.__rewrite_column(entity, builder, new, new_type)
+            return True
+        queries = []
+        if old_type != new_type:
+            queries.append(builder.alter_type(name, new_type))
+        if old.get('default') != new.get('default'):
+            queries.append(builder.set_default(name, new.get('default')))
+        if not old['nullable'] and new['nullable']:
+            queries.append(builder.drop_not_null(name))
+        if queries:
+            self.__execute(queries)
+        if old['nullable'] and not new['nullable']:
+            self.__set_not_null(entity, builder, name, new.get('default'))
+        return False
+
+    @staticmethod
+    def __is_binary_coercible(old_type: str, new_type: str) -> bool:
+        # widening a varchar or turning it into text changes the catalog only, the rows are not rewritten
+        if not old_type.startswith('varchar'):
+            return False
+        if new_type == 'text':
+            return True
+        return new_type.startswith('varchar') and int(new_type[8:-1]) >= int(old_type[8:-1])
+
+    @staticmethod
+    def __varchar_length(sql_type: str) -> Optional[int]:
+        return int(sql_type[8:-1]) if sql_type.startswith('varchar') else None
+
+    def __set_not_null(self, entity: Entity, builder: ColumnMigrationBuilder, column: str, default) -> None:
+        if default is not None:
+            self.__backfill(entity, column, sql.Literal(default), sql.SQL("{} IS NULL").format(sql.Identifier(column)))
+        constraint = self.__constraint_name(entity.name, column)
+        self.__execute([builder.add_not_null_check(column, constraint)])
+        try:
+            self.__validate(builder.validate_constraint(constraint), f'Field {column} contains empty values')
+            # SET NOT NULL trusts the validated constraint instead of scanning the table again
+            self.__execute([builder.set_not_null(column), builder.drop_constraint(constraint)])
+        except serializers.ValidationError:
+            self.__execute([builder.drop_constraint(constraint)])
+            raise
+
+    def __rewrite_column(self, entity: Entity, builder: ColumnMigrationBuilder, field: dict, sql_type: str) -> None:
+        name = field['name']
+        shadow = self.SHADOW_PREFIX + name
+        trigger = self.__constraint_name(entity.name, name, 'sync')
+        constraint = self.__constraint_name(entity.name, shadow)
+        length_constraint = self.__constraint_name(entity.name, name, 'length')
+        length = self.__varchar_length(sql_type)
+        cleanup = builder.drop_sync_trigger(trigger) + [builder.drop_column(shadow),
+                                                        builder.drop_constraint(length_constraint)]
+        try:
+            if length is not None:
+                # a cast to varchar(n) silently truncates longer values, the check refuses them before the copy
+                # and keeps them out until the swap drops it together with the old column
+                self.__execute([builder.add_length_check(name, length, length_constraint)])
+                self.__validate(builder.validate_constraint(length_constraint),
+                                f'Values of field {name} are longer than {length} characters')
+            self.__execute([builder.add_column(shadow, sql_type)] + builder.create_sync_trigger(trigger, name, shadow,
+                                                                                               sql_type))
+            self.__validate_backfill(entity, shadow, sql.SQL("CAST({} AS {})").format(sql.Identifier(name),
+                                                                                      sql.SQL(sql_type)), name)
+            swap = builder.drop_sync_trigger(trigger) + [builder.drop_column(name), builder.rename_column(shadow, name),
+                                                         builder.set_default(name, field.get('default'))]
+            if not field['nullable']:
+                self.__execute([builder.add_not_null_check(shadow, constraint)])
+                self.__validate(builder.validate_constraint(constraint), f'Field {name} contains empty values')
+                swap += [builder.set_not_null(name), builder.drop_constraint(constraint)]
+            self.__execute(swap)
+        except serializers.ValidationError:
+            self.__execute(cleanup)
+            raise
+
+    def __validate_backfill(self, entity: Entity, column: str, expression: sql.Composable, source: str) -> None:
+        try:
+            self.__backfill(entity, column, expression, sql.SQL("{} IS NOT NULL").format(sql.Identifier(source)))
+        except DatabaseError:
+            raise serializers.ValidationError(f'Values of field {source} cannot be converted')
+
+    def __backfill(self, entity: Entity, column: str, expression: sql.Composable, condition: sql.Composable) -> None:
+        # every batch commits on its own, so row locks are held only for one batch at a time
+        after = None
+        while True:
+            after = self.__physical_table_storage_repository.backfill(self.__schema, entity.name, column, expression,
+                                                                      condition, entity.primary_keys, after,
+                                                                      self.__batch_size)
+            if after is None:
+                return
+
+    def __validate(self, query: sql.Composed, message: str) -> None:
+        try:
+            self.__execute([query])
+        except serializers.ValidationError:
+            raise
+        except DatabaseError:
+            raise serializers.ValidationError(message)
+
+    def __execute(self, queries: list) -> None:
+        for attempt in range(self.__lock_retries + 1):
+            try:
+                self.__physical_table_storage_repository.execute_with_lock_timeout(queries, self.__lock_timeout)
+                return
+            except OperationalError as e:
+                if getattr(e.__cause__, 'sqlstate', None) != self.LOCK_NOT_AVAILABLE:
+                    raise
+            time.sleep(min(0.1 * 2 ** attempt, self.MAX_BACKOFF))
+        raise serializers.ValidationError('Entity storage is busy, try again later')
+
+    @staticmethod
+    def __constraint_name(table_name: str, column: str, suffix: str = 'not_null') -> str:
+        return f"{table_name}_{column}"[:62 - len(suffix)] + '_' + suffix
+
+    @staticmethod
+    def __field(field: dict) -> Field:
+        return Field(name=field.get('name'), type=field.get('type'), config=field.get('config'),
+                     nullable=field.get('nullable'), default=field.get('default'))
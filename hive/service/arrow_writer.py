@@ -0,0 +1,76 @@
+from typing import Iterator
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+class ArrowWriter:
+    """Writes record batches as an Arrow IPC stream or a Parquet file, yielding the bytes batch by batch."""
+
+    # Arrow type and the column cast that produces it, per entity field type
+    TYPES = {
+        'int': (pa.int32(), 'int4'),
+        'money': (pa.int64(), 'int8'),
+        'float': (pa.float64(), 'float8'),
+        'date': (pa.timestamp('us'), 'timestamp'),
+        'str': (pa.utf8(), 'text'),
+    }
+
+    @classmethod
+    def get_schema(cls, field_types: dict) -> pa.Schema:
+        return pa.schema([pa.field(name, cls.TYPES[field_type][0]) for name, field_type in field_types.items()])
+
+    @classmethod
+    def get_casts(cls, field_types: dict) -> dict:
+        return {name: cls.TYPES[field_type][1] for name, field_type in field_types.items()}
+
+    def write_ipc(self, schema: pa.Schema, batches: Iterator[list]) -> Iterator[bytes]:
+        sink = _ChunkSink()
+        with pa.ipc.new_stream(sink, schema) as writer:
+            for records in batches:
+                writer.write_batch(self.__record_batch(schema, records))
+                yield sink.drain()
+        yield sink.drain()
+
+    def write_parquet(self, schema: pa.Schema, batches: Iterator[list]) -> Iterator[bytes]:
+        sink = _ChunkSink()
+        # every batch becomes a row group, so the file never has to be assembled in memory
+        with pq.ParquetWriter(sink, schema) as writer:
+            for records in batches:
+                writer.write_batch(self.__record_batch(schema, records))
+                yield sink.drain()
+        yield sink.drain()
+
+    @staticmethod
+    def __record_batch(schema: pa.Schema, records: list) -> pa.RecordBatch:
+        return pa.RecordBatch.from_pydict({name: [record[name] for record in records] for name in schema.names},
+                                          schema=schema)
+
+
+class _ChunkSink:
+    """Write-only file object which hands out whatever was written since the last drain."""
+
+    def __init__(self):
+        self.__chunks = []
+        self.__position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.__chunks.append(data)
+        self.__position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.__position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self.__chunks)
+        self.__chunks = []
+        return data
@@ -0,0 +1,78 @@
+from django.db import DatabaseError, transaction
+
+from hive.di.storage_provider import StorageProvider
+from hive.repository.entity_repository import EntityRepository
+from hive.repository.storage_repository import StorageRepository
+from hive.service.advisory_lock_manager import AdvisoryLockManager
+from hive.storage.ingest_plan import IngestPlan
+
+
+class BulkLoadService:
+    """Loads large streams of records into an entity storage through COPY."""
+
+    def __init__(self,
+                 entity_repository: EntityRepository,
+                 storage_repository: StorageRepository,
+                 storage_provider: StorageProvider,
+                 lock_manager: AdvisoryLockManager,
+                 schema: str,
+                 ):
+        self.__entity_repository = entity_repository
+        self.__storage_repository = storage_repository
+        self.__storage_provider = storage_provider
+        self.__lock_manager = lock_manager
+        self.__schema = schema
+
+    def load(self, entity_name: str, records, batch_size: int = 10000, on_reject=None) -> dict:
+        entity = self.__entity_repository.get_by_name(entity_name)
+        storage_object = self.__storage_provider.get(entity.type.class_name)
+        config = storage_object.configure(entity)
+        summary = {'loaded': 0, 'rejected': 0}
+        batch = []
+        for number, record in enumerate(records, start=1):
+            batch.append((number, record))
+            if len(batch) >= batch_size:
+                self.__flush(entity_name, storage_object, batch, config, summary, on_reject)
+                batch = []
+        if batch:
+            self.__flush(entity_name, storage_object, batch, config, summary, on_reject)
+        return summary
+
+    def __flush(self, entity_name: str, storage_object, batch: list, config: IngestPlan, summary: dict,
+                on_reject) -> None:
+        errors = storage_object.prepare_many([record for _, record in batch], config)
+        for position, error in sorted(errors.items()):
+            number, record = batch[position]
+            self.__reject(summary, on_reject, number, record, error)
+        batch = [item for position, item in enumerate(batch) if position not in errors]
+        if not batch:
+            return
+        rows = [record for _, record in batch]
+        try:
+            with transaction.atomic():
+                self.__lock_manager.lock(entity_name, [config.get_primary_keys(record) for record in rows])
+                self.__storage_repository.copy_upsert(schema=self.__schema, table_name=entity_name,
+                                                      columns=config.columns, rows=rows,
+                                                      primary_keys=config.primary_keys)
+            summary['loaded'] += len(rows)
+        except DatabaseError:
+            # the database rejected the batch, find the offending records one by one
+            for number, record in batch:
+                self.__load_one(entity_name, number, record, config, summary, on_reject)
+
+    def __load_one(self, entity_name: str, number: int, record: dict, config: IngestPlan, summary: dict,
+                   on_reject) -> None:
+        try:
+            with transaction.atomic():
+                self.__lock_manager.lock(entity_name, [config.get_primary_keys(record)])
+                self.__storage_repository.execute_upsert(self.__schema, entity_name, config.columns,
+                                                         config.get_values(record), config.primary_keys)
+            summary['loaded'] += 1
+        except DatabaseError as e:
+            self.__reject(summary, on_reject, number, record, e)
+
+    @staticmethod
+    def __reject(summary: dict, on_reject, number: int, record, error: Exception) -> None:
+        summary['rejected'] += 1
+        if on_reject:
+            on_reject(number, record, error)
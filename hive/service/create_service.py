@@ -1,73 +1,68 @@
 import re
-import threading
 
+from django.db import transaction
 from rest_framework import serializers
 from unidecode import unidecode
 
-from hive.builder.dto.field import Field
+from hive.builder.dto.table_definition import TableDefinition
+from hive.builder.table_compiler import TableCompiler
 from hive.di.entity_field_type_provider import EntityFieldTypeProvider
-from hive.entity.entity_model import Entity
 from hive.entity_field_type.configuration.configuration_builder import ConfigBuilder
+from hive.repository.advisory_lock_repository import AdvisoryLockRepository
+from hive.service.advisory_lock_manager import AdvisoryLockManager
 from hive.service.dto.request_data import RequestData
+from hive.service.index_service import IndexService
+from hive.service.partition_service import PartitionService
 
 
 class CreateService:
-    def __init__(self, entity_validator, entity_type_repository, entity_repository, physical_storage_builder,
+    def __init__(self, entity_validator, entity_type_repository, entity_repository, table_compiler: TableCompiler,
                  physical_storage_repository,
-                 entity_field_type_provider: EntityFieldTypeProvider
-
+                 entity_field_type_provider: EntityFieldTypeProvider,
+                 index_service: IndexService,
+                 partition_service: PartitionService,
+                 advisory_lock_repository: AdvisoryLockRepository
                  ):
         self.__entity_validator = entity_validator
         self.__entity_type_repository = entity_type_repository
         self.__entity_repository = entity_repository
-        self.__physical_storage_builder = physical_storage_builder
+        self.__table_compiler = table_compiler
         self.__physical_storage_repository = physical_storage_repository
         self.__entity_field_type_provider = entity_field_type_provider
-        self.__lock = threading.RLock()
+        self.__index_service = index_service
+        self.__partition_service = partition_service
+        self.__advisory_lock_repository = advisory_lock_repository
 
     def create_entity(self, data):
         request_data = RequestData(data)
         self.__entity_validator.validate_all_keys_exist(request_data)
         self.__entity_validator.validate_data_type(data)
-        self.__transform_fields(request_data)
-        self.__update_field_config(request_data)
+        self.prepare_fields(request_data)
 
-        with self.__lock:
+        # creates of the same name wait for each other, the entity row and its table commit together
+        with transaction.atomic():
+            self.__advisory_lock_repository.lock([AdvisoryLockManager.ddl_key(request_data.name)])
             self.__entity_validator.validate_request_data(request_data)
+            request_data.indexes = self.__index_service.prepare_indexes(request_data.name, request_data.indexes,
+                                                                        request_data.fields)
+            request_data.partitioning = self.__partition_service.prepare_partitioning(
+                request_data.partitioning, request_data.fields, request_data.primary_keys, request_data.identity)
             entity_type_obj = self.__entity_type_repository.get(request_data.entity_type)
             entity = self.__entity_repository.create(request_data, entity_type_obj)
-            self.__set_physical_storage_builder_fields(entity)
-            query = self.__physical_storage_builder.build()
+            query = self.__table_compiler.create_table(TableDefinition.from_entity(entity))
             self.__physical_storage_repository.execute(query)
-            self.__physical_storage_builder.clear_object()
+            self.__partition_service.create_partitions(entity)
+            self.__index_service.create_indexes(entity)
             return entity
 
+    def prepare_fields(self, request_data: RequestData):
+        self.__transform_fields(request_data)
+        self.__update_field_config(request_data)
+
     def __update_field_config(self, request_data: RequestData):
         for field in request_data.fields:
             field["config"] = self.__prepare_config(field)
 
-    def __set_physical_storage_builder_fields(self, entity: Entity):
-        self.__set_table_name(entity.name)
-        self.__set_config(entity.identity)
-        self.__set_primary_keys(entity.primary_keys)
-        for field in entity.fields:
-            self.__add_field(field)
-
-    def __set_table_name(self, name: str):
-        self.__physical_storage_builder.set_name(name)
-
-    def __set_primary_keys(self, primary_keys: list):
-        self.__physical_storage_builder.set_primary_keys(primary_keys)
-
-    def __set_config(self, identity: list):
-        self.__physical_storage_builder.set_identity(identity)
-
-    def __add_field(self, field: dict):
-        field_obj = Field(name=field.get('name'), type=field.get('type'), config=field.get('config'),
-                          nullable=field.get('nullable'),
-                          default=field.get('default'))
-        self.__physical_storage_builder.add_field(field_obj)
-
     def __transform_fields(self, request_data: RequestData):
         # Replace Polish letters to english and change to lower case. Remove spaces.
         self.__unidecode_data(request_data)
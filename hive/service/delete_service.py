@@ -1,21 +1,61 @@
+import uuid
+
+from django.db import OperationalError, transaction
+from rest_framework import serializers
+
+from hive.builder.table_compiler import TableCompiler
+from hive.entity.trashed_table_model import TrashedTable
+from hive.repository.advisory_lock_repository import AdvisoryLockRepository
 from hive.repository.entity_repository import EntityRepository
 from hive.repository.physical_table_storage_repository import PhysicalTableStorageRepository
+from hive.repository.trash_repository import TrashRepository
+from hive.service.advisory_lock_manager import AdvisoryLockManager
 
 
 class DeleteService:
+    LOCK_NOT_AVAILABLE = '55P03'
+
     def __init__(self,
                  entity_repository: EntityRepository,
-                 physical_table_storage_builder,
-                 physical_table_storage_repository: PhysicalTableStorageRepository
+                 table_compiler: TableCompiler,
+                 physical_table_storage_repository: PhysicalTableStorageRepository,
+                 advisory_lock_repository: AdvisoryLockRepository,
+                 trash_repository: TrashRepository,
+                 schema: str,
+                 trash_schema: str,
+                 lock_timeout: int
                  ):
         super().__init__()
         self.__entity_repository = entity_repository
-        self.__physical_table_storage_builder = physical_table_storage_builder
+        self.__table_compiler = table_compiler
         self.__physical_table_storage_repository = physical_table_storage_repository
+        self.__advisory_lock_repository = advisory_lock_repository
+        self.__trash_repository = trash_repository
+        self.__schema = schema
+        self.__trash_schema = trash_schema
+        self.__lock_timeout = lock_timeout
 
     def delete_entity(self, entity):
-        self.__entity_repository.delete(entity)
-        self.__physical_table_storage_builder.set_name(entity.name)
-        self.__physical_table_storage_builder.set_remove(True)
-        query = self.__physical_table_storage_builder.build()
-        self.__physical_table_storage_repository.execute(query)
+        with transaction.atomic():
+            self.__advisory_lock_repository.lock([AdvisoryLockManager.ddl_key(entity.name)])
+            self.__entity_repository.delete(entity)
+            self.__physical_table_storage_repository.execute(self.__table_compiler.drop_table(entity.name))
+
+    def trash_entity(self, entity) -> TrashedTable:
+        # renaming only changes the catalog, the purge drops the data later outside of the request
+        trash_name = f"{entity.name[:40]}_{uuid.uuid4().hex[:12]}"
+        try:
+            with transaction.atomic():
+                self.__advisory_lock_repository.lock([AdvisoryLockManager.ddl_key(entity.name)])
+                self.__entity_repository.delete(entity)
+                partitions = self.__physical_table_storage_repository.get_partitions(self.__schema, entity.name)
+                indexes = self.__physical_table_storage_repository.get_indexes(self.__schema,
+                                                                               [entity.name] + partitions)
+                queries = self.__table_compiler.trash_table(entity.name, partitions, indexes, self.__trash_schema,
+                                                            trash_name)
+                self.__physical_table_storage_repository.execute_with_lock_timeout(queries, self.__lock_timeout)
+                return self.__trash_repository.create(entity.name, trash_name)
+        except OperationalError as e:
+            if getattr(e.__cause__, 'sqlstate', None) != self.LOCK_NOT_AVAILABLE:
+                raise
+            raise serializers.ValidationError('Entity storage is busy, try again later')
@@ -5,3 +5,5 @@ class RequestData:
         self.identity = data.get('identity')
         self.primary_keys = data.get('primary_keys')
         self.entity_type = data.get('type')
+        self.indexes = data.get('indexes') or []
+        self.partitioning = data.get('partitioning') or {}
@@ -0,0 +1,96 @@
+import logging
+import os
+import threading
+import time
+
+import psycopg
+from django.db import connection
+from psycopg import sql
+
+from hive.repository.entity_cache import EntityCache
+from hive.repository.entity_version_repository import EntityVersionRepository
+from hive.repository.reference_cache import ReferenceCache
+from hive.repository.schema_snapshot import SchemaSnapshot
+from hive.repository.statement_cache import StatementCache
+from hive.storage.ingest_plan_cache import IngestPlanCache
+
+logger = logging.getLogger(__name__)
+
+
+class EntityChangeService:
+    """Keeps the entity caches of every worker in sync through PostgreSQL LISTEN/NOTIFY."""
+
+    CHANNEL = 'hive_entity_changed'
+    RECONNECT_DELAY = 5
+
+    def __init__(self,
+                 entity_version_repository: EntityVersionRepository,
+                 entity_cache: EntityCache,
+                 reference_cache: ReferenceCache,
+                 ingest_plan_cache: IngestPlanCache,
+                 schema_snapshot: SchemaSnapshot,
+                 statement_cache: StatementCache,
+                 ):
+        self.__entity_version_repository = entity_version_repository
+        self.__caches = [entity_cache, reference_cache, ingest_plan_cache, schema_snapshot, statement_cache]
+        self.__version = None
+        self.__listener_pid = None
+        self.__lock = threading.Lock()
+
+    def on_entity_changed(self, sender, instance, **kwargs) -> None:
+        self.publish(instance.name)
+
+    def publish(self, name: str) -> int:
+        self.__invalidate(name)
+        return self.__entity_version_repository.publish(self.CHANNEL, name)
+
+    def on_request_started(self, sender, **kwargs) -> None:
+        self.listen()
+
+    def listen(self) -> None:
+        # a worker forked from a preloaded master does not inherit the listener thread, it starts its own
+        if self.__listener_pid == os.getpid():
+            return
+        with self.__lock:
+            if self.__listener_pid != os.getpid():
+                threading.Thread(target=self.__listen_forever, args=(self.__get_listen_params(),),
+                                 name='hive-entity-listener', daemon=True).start()
+                self.__listener_pid = os.getpid()
+
+    def handle(self, payload: str) -> None:
+        version, name = payload.split(':', 1)
+        version = int(version)
+        if self.__version is not None and version > self.__version + 1:
+            # some notifications were missed, nothing cached can be trusted anymore
+            self.__clear()
+        else:
+            self.__invalidate(name)
+        self.__version = version if self.__version is None else max(self.__version, version)
+
+    @staticmethod
+    def __get_listen_params() -> dict:
+        # a transaction pooler hands the session to other clients, notifications would go to them
+        get_params = getattr(connection, 'get_direct_connection_params', connection.get_connection_params)
+        return get_params()
+
+    def __listen_forever(self, params: dict) -> None:
+        while True:
+            try:
+                with psycopg.connect(**params, autocommit=True) as listen_connection:
+                    listen_connection.execute(sql.SQL("LISTEN {};").format(sql.Identifier(self.CHANNEL)))
+                    # changes made while the listener was not connected were never delivered
+                    self.__clear()
+                    for notify in listen_connection.notifies():
+                        self.handle(notify.payload)
+            except psycopg.Error:
+                logger.exception("Entity change listener lost its connection, reconnecting.")
+            time.sleep(self.RECONNECT_DELAY)
+
+    def __invalidate(self, name: str) -> None:
+        for cache in self.__caches:
+            cache.invalidate(name)
+
+    def __clear(self) -> None:
+        self.__version = None
+        for cache in self.__caches:
+            cache.clear()
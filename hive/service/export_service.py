@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+import zlib
+from typing import Iterator
+
+from django.db import transaction
+from rest_framework import serializers
+
+from hive.entity.entity_model import Entity
+from hive.repository.entity_repository import EntityRepository
+from hive.repository.storage_repository import StorageRepository
+from hive.service.arrow_writer import ArrowWriter
+from hive.service.read_service import ReadService
+
+
+class ExportService:
+    """Streams whole entities without holding more than one batch in memory."""
+
+    FORMATS = ('ndjson', 'csv', 'arrow', 'parquet')
+    COLUMNAR_FORMATS = ('arrow', 'parquet')
+    CONTENT_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv',
+                     'arrow': 'application/vnd.apache.arrow.stream', 'parquet': 'application/vnd.apache.parquet'}
+
+    def __init__(self, entity_repository: EntityRepository,
+                 storage_repository: StorageRepository,
+                 read_service: ReadService,
+                 arrow_writer: ArrowWriter,
+                 schema: str,
+                 ):
+        self.__entity_repository = entity_repository
+        self.__storage_repository = storage_repository
+        self.__read_service = read_service
+        self.__arrow_writer = arrow_writer
+        self.__schema = schema
+
+    def export(self, entity_name: str, file_format: str = 'ndjson', fields: list = None, compress: bool = False,
+               batch_size: int = 10000, postgres_json: bool = False) -> Iterator[bytes]:
+        if file_format not in self.FORMATS:
+            raise serializers.ValidationError(f"Unknown export format: {file_format}")
+        if batch_size < 1:
+            raise serializers.ValidationError("Batch size must be a positive number.")
+        # everything that can fail is checked before the first chunk is sent
+        entity = self.__entity_repository.get_by_name(entity_name)
+        columns = self.__read_service.get_columns(entity, fields)
+        if file_format in self.COLUMNAR_FORMATS:
+            chunks = self.__write_columnar(entity, columns, file_format, batch_size)
+        elif file_format == 'csv':
+            chunks = self.__write_csv(columns, self.__read(entity, columns, batch_size))
+        elif postgres_json and self.__read_service.get_sql_formats(entity, columns) is not None:
+            chunks = self.__read_json(entity, columns, batch_size)
+        else:
+            chunks = self.__write_ndjson(self.__read(entity, columns, batch_size))
+        return self.__gzip(chunks) if compress else chunks
+
+    def __read(self, entity: Entity, columns: list, batch_size: int) -> Iterator[list]:
+        with transaction.atomic():
+            for records in self.__storage_repository.stream(self.__schema, entity.name, columns, batch_size):
+                yield self.__read_service.decode(entity, columns, records)
+
+    def __read_json(self, entity: Entity, columns: list, batch_size: int) -> Iterator[bytes]:
+        formats = self.__read_service.get_sql_formats(entity, columns)
+        with transaction.atomic():
+            for records in self.__storage_repository.stream_json(self.__schema, entity.name, columns, batch_size,
+                                                                 formats):
+                yield ('\n'.join(records) + '\n').encode()
+
+    def __write_columnar(self, entity: Entity, columns: list, file_format: str, batch_size: int) -> Iterator[bytes]:
+        # columnar formats carry typed values, the database casts them and field decoding is skipped
+        field_types = self.__get_field_types(entity, columns)
+        schema = self.__arrow_writer.get_schema(field_types)
+        casts = self.__arrow_writer.get_casts(field_types)
+        batches = self.__read_raw(entity, columns, batch_size, casts)
+        if file_format == 'parquet':
+            return self.__arrow_writer.write_parquet(schema, batches)
+        return self.__arrow_writer.write_ipc(schema, batches)
+
+    def __read_raw(self, entity: Entity, columns: list, batch_size: int, casts: dict) -> Iterator[list]:
+        with transaction.atomic():
+            yield from self.__storage_repository.stream(self.__schema, entity.name, columns, batch_size, casts)
+
+    def __get_field_types(self, entity: Entity, columns: list) -> dict:
+        fields = {field['name']: field for field in entity.fields}
+        field_types = {}
+        for name in columns:
+            field = fields[name]
+            while field['type'] == 'ref':
+                referenced = self.__entity_repository.get_by_name(field['config']['storage'])
+                field = next(item for item in referenced.fields if item['name'] == field['config']['field'])
+            field_types[name] = field['type']
+        return field_types
+
+    @staticmethod
+    def __write_ndjson(batches: Iterator[list]) -> Iterator[bytes]:
+        for records in batches:
+            yield ''.join(json.dumps(record, default=str) + '\n' for record in records).encode()
+
+    @staticmethod
+    def __write_csv(columns: list, batches: Iterator[list]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns)
+        writer.writeheader()
+        for records in batches:
+            writer.writerows(records)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    @staticmethod
+    def __gzip(chunks: Iterator[bytes]) -> Iterator[bytes]:
+        compressor = zlib.compressobj(wbits=31)
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
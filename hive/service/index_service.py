@@ -0,0 +1,79 @@
+from django.db import DatabaseError
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+
+from hive.entity.entity_model import Entity
+from hive.repository.entity_repository import EntityRepository
+from hive.repository.physical_table_storage_repository import PhysicalTableStorageRepository
+from hive.validator.index_validator import IndexValidator
+
+
+class IndexService:
+    """Manages the secondary indexes declared on entities and built on their physical tables."""
+
+    def __init__(self, entity_repository: EntityRepository,
+                 physical_table_storage_repository: PhysicalTableStorageRepository,
+                 index_validator: IndexValidator,
+                 schema: str,
+                 ):
+        self.__entity_repository = entity_repository
+        self.__physical_table_storage_repository = physical_table_storage_repository
+        self.__index_validator = index_validator
+        self.__schema = schema
+
+    def prepare_indexes(self, table_name: str, indexes, fields: list) -> list:
+        if not isinstance(indexes, list):
+            raise serializers.ValidationError('Invalid type of data in the "indexes" field')
+        prepared = []
+        for index in indexes:
+            prepared.append(self.__index_validator.validate(table_name, index, fields, prepared))
+        return prepared
+
+    def create_indexes(self, entity: Entity, columns: list = None) -> None:
+        indexes = [index for index in entity.indexes if columns is None or set(index['fields']) & set(columns)]
+        self.__check_names(indexes)
+        if len(indexes) == 1:
+            self.__create_index(entity, indexes[0])
+        elif indexes:
+            try:
+                self.__physical_table_storage_repository.create_indexes(self.__schema, entity.name, indexes,
+                                                                        concurrently=not entity.partitioning)
+            except DatabaseError as e:
+                names = ', '.join(index['name'] for index in indexes)
+                raise serializers.ValidationError(f"Error while creating indexes {names}: {str(e).strip()}")
+
+    def get_indexes(self, entity_name: str) -> list:
+        return self.__entity_repository.get_by_name(entity_name).indexes
+
+    def add_index(self, entity_name: str, data) -> dict:
+        entity = self.__entity_repository.get_by_name(entity_name)
+        index = self.__index_validator.validate(entity.name, data, entity.fields, entity.indexes)
+        # the index is built before it is recorded, a failed build leaves the entity untouched
+        self.__check_names([index])
+        self.__create_index(entity, index)
+        self.__entity_repository.add_index(entity.name, index)
+        return index
+
+    def drop_index(self, entity_name: str, index_name: str) -> dict:
+        entity = self.__entity_repository.get_by_name(entity_name)
+        index = next((index for index in entity.indexes if index['name'] == index_name), None)
+        if index is None:
+            raise NotFound("Index not exist")
+        self.__physical_table_storage_repository.drop_index(self.__schema, entity.name, index_name,
+                                                            concurrently=not entity.partitioning)
+        self.__entity_repository.remove_index(entity.name, index_name)
+        return index
+
+    def __check_names(self, indexes: list) -> None:
+        # index names are unique in the whole schema, an index of another entity must never be replaced or dropped
+        existing = self.__physical_table_storage_repository.get_existing_relations(
+            self.__schema, [index['name'] for index in indexes])
+        if existing:
+            raise serializers.ValidationError(f'Index {existing[0]} already exists')
+
+    def __create_index(self, entity: Entity, index: dict) -> None:
+        try:
+            self.__physical_table_storage_repository.create_index(self.__schema, entity.name, index,
+                                                                  concurrently=not entity.partitioning)
+        except DatabaseError as e:
+            raise serializers.ValidationError(f"Error while creating index {index['name']}: {str(e).strip()}")
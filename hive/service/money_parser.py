@@ -1,100 +1,64 @@
 import re
+from functools import lru_cache
 
 from exception.format_not_supported import FormatNotSupportedException
 
 
 class MoneyParser:
+    CACHE_SIZE = 4096
+
+    # US "1,234.56", German "1.234,56" and penny "12,34" / "12.34" formats
+    __PENNY_FORMAT = r'(?:\d+(?:,\d{3})+)\.\d{2}|\d{1,3}(?: \d{3})*\.\d{3},\d{2}|\d+[.,]\d{2}'
+    # "123 456.789" - the last three digits are the decimal part
+    __OTHER_FORMAT = r'\d{1,3}(?: \d{3})*\.\d{3}'
+    __KNOWN_FORMAT = re.compile(r'^(?:(?P<penny>' + __PENNY_FORMAT + r')|(?P<other>' + __OTHER_FORMAT + r'))$')
+    __THOUSANDS_SEPARATOR = re.compile(r'[^\d.,]+|[.,](?=\d+\.\d+|$)')
+    __DECIMAL_DIGITS = re.compile(r'[.,]\d{3}(?![\d.,])')
+    __SEPARATORS = re.compile(r'[.,]')
+    __SINGLE_DECIMAL_DIGIT = re.compile(r'^\d*[.,]\d$')
+    __DIGITS_ONLY = str.maketrans('', '', '., ')
 
     def convert(self, data, append_penny=True):
         if data is None:
             raise FormatNotSupportedException(data)
+        return self.__convert(data, append_penny)
+
+    def convert_many(self, values: list, append_penny=True) -> list:
+        convert = self.__convert
+        result = []
+        for data in values:
+            if data is None:
+                raise FormatNotSupportedException(data)
+            result.append(convert(data, append_penny))
+        return result
 
-        if self.__match_us_german_penny_format(data):
-            result = self.__convert_to_int(data)
-            return result
-        if self.__match_other_format(data):
-            return self.__convert_other_format(data, append_penny)
+    @staticmethod
+    def cache_info():
+        return MoneyParser.__convert.cache_info()
 
-        result = self.__remove_thousands_separator(data)
-        if self.__check_decimal_digits(result):
-            result = re.sub(r'[.,]', '', result)
+    @staticmethod
+    @lru_cache(maxsize=CACHE_SIZE)
+    def __convert(data, append_penny):
+        known_format = MoneyParser.__KNOWN_FORMAT.match(data)
+        if known_format:
+            if known_format.lastgroup == 'penny':
+                return int(data.translate(MoneyParser.__DIGITS_ONLY))
+            result = data[:-1] if append_penny else data[:-3]
+            return int(result.translate(MoneyParser.__DIGITS_ONLY))
+
+        result = MoneyParser.__THOUSANDS_SEPARATOR.sub('', data)
+        if MoneyParser.__DECIMAL_DIGITS.search(result):
+            result = MoneyParser.__SEPARATORS.sub('', result)
 
         if result.isdigit():
             if append_penny:
-                result = self.__add_penny(result)
-            result = self.__convert_to_int(result)
-            return result
+                result = result + '00'
+            return int(result.translate(MoneyParser.__DIGITS_ONLY))
 
-        if self.__match_single_decimal_digit(result):
-            return self.__convert_single_decimal(result)
+        if MoneyParser.__SINGLE_DECIMAL_DIGIT.match(result):
+            return int(result.translate(MoneyParser.__DIGITS_ONLY)) * 10
 
-        if self.__ends_with_decimal_separator(result):
-            return self.__convert_decimal_separator(result)
+        if result.endswith('.') or result.endswith(','):
+            return int(result.translate(MoneyParser.__DIGITS_ONLY)) * 100
 
         raise FormatNotSupportedException(data)
-
-    @staticmethod
-    def __convert_to_int(data):
-        result = re.sub(r'[., ]', '', data)
-        return int(result)
-
-    @staticmethod
-    def __remove_thousands_separator(data):
-        pattern = r'[^\d.,]+|[.,](?=\d+\.\d+|$)'
-        value = re.sub(pattern, '', data)
-
-        return value
-
-    @staticmethod
-    def __check_decimal_digits(value):
-        pattern = r'[.,]\d{3}(?![\d.,])'
-        match = re.search(pattern, value)
-        if match:
-            return True
-        else:
-            return False
-
-    @staticmethod
-    def __add_penny(data):
-        return data + '00'
-
-    @staticmethod
-    def __match_other_format(data):
-        pattern = r'^(\d{1,3}( \d{3})*)\.\d{3}$'
-        return re.match(pattern, data)
-
-    @staticmethod
-    def __match_us_german_penny_format(data):
-        us_format = r'^((?:\d+)(?:,\d{3})+)\.(\d{2})$'
-        german_format = r'^(\d{1,3}( \d{3})*)\.\d{3},\d{2}$'
-        penny_format = r'^(\d+)[.,](\d{2})$'
-        if re.match(us_format, data):
-            return True
-        if re.match(german_format, data):
-            return True
-        if re.match(penny_format, data):
-            return True
-
-    @staticmethod
-    def __match_single_decimal_digit(data):
-        return re.match(r'^\d*[.,]\d$', data)
-
-    @staticmethod
-    def __ends_with_decimal_separator(data):
-        return data.endswith('.') or data.endswith(',')
-
-    def __convert_other_format(self, data, append_penny):
-        if append_penny:
-            result = data[:-1]
-        else:
-            result = data[:-3]
-        result = self.__convert_to_int(result)
-        return result
-
-    def __convert_single_decimal(self, data):
-        result = self.__convert_to_int(data)
-        return result * 10
-
-    def __convert_decimal_separator(self, data):
-        result = self.__convert_to_int(data)
-        return result * 100
@@ -0,0 +1,90 @@
+import datetime
+import logging
+
+from django.db import DatabaseError
+from rest_framework import serializers
+
+from hive.builder.dto.partitioning import Partitioning
+from hive.entity.entity_model import Entity
+from hive.repository.entity_repository import EntityRepository
+from hive.repository.physical_table_storage_repository import PhysicalTableStorageRepository
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionService:
+    """Validates the partitioning of entities and keeps upcoming range partitions created ahead of time."""
+
+    TYPES = ('range', 'hash')
+    INTERVALS = ('day', 'week', 'month', 'year')
+    MAX_PREMAKE = 366
+    MAX_PARTITIONS = 1024
+
+    def __init__(self, entity_repository: EntityRepository,
+                 physical_table_storage_repository: PhysicalTableStorageRepository,
+                 schema: str,
+                 ):
+        self.__entity_repository = entity_repository
+        self.__physical_table_storage_repository = physical_table_storage_repository
+        self.__schema = schema
+
+    def prepare_partitioning(self, partitioning, fields: list, primary_keys: list, identity: list) -> dict:
+        if not partitioning:
+            return {}
+        if not isinstance(partitioning, dict):
+            raise serializers.ValidationError('Invalid type of data in the "partitioning" field')
+        partitioning_type = partitioning.get('type')
+        if partitioning_type not in self.TYPES:
+            raise serializers.ValidationError(f'Invalid partitioning type: {partitioning_type}')
+        if partitioning_type == 'hash':
+            return self.__prepare_hash(partitioning, primary_keys, identity)
+        return self.__prepare_range(partitioning, fields, primary_keys, identity)
+
+    def create_partitions(self, entity: Entity, today: datetime.date = None) -> list:
+        if entity.partitioning.get('type') != 'range':
+            return []
+        partitioning = Partitioning(**entity.partitioning)
+        names = []
+        for start, end in partitioning.get_upcoming_periods(today or datetime.date.today()):
+            name = partitioning.get_range_partition_name(entity.name, start)
+            self.__physical_table_storage_repository.create_range_partition(self.__schema, entity.name, name,
+                                                                            start, end)
+            names.append(name)
+        return names
+
+    def create_all_partitions(self, today: datetime.date = None) -> dict:
+        created = {}
+        for entity in self.__entity_repository.get_partitioned('range'):
+            try:
+                created[entity.name] = self.create_partitions(entity, today)
+            except DatabaseError:
+                # e.g. the default partition already holds rows of the period, the other entities still go on
+                logger.exception('Cannot create partitions of %s', entity.name)
+                created[entity.name] = None
+        return created
+
+    def __prepare_hash(self, partitioning: dict, primary_keys: list, identity: list) -> dict:
+        partitions = partitioning.get('partitions', 8)
+        if not isinstance(partitions, int) or not 2 <= partitions <= self.MAX_PARTITIONS:
+            raise serializers.ValidationError(f'Number of partitions must be between 2 and {self.MAX_PARTITIONS}')
+        # every unique constraint of a partitioned table has to contain the partition key
+        if not set(primary_keys) <= set(identity):
+            raise serializers.ValidationError('Hash partitioning requires the "identity" field to contain '
+                                              'the primary keys')
+        return {'type': 'hash', 'partitions': partitions}
+
+    def __prepare_range(self, partitioning: dict, fields: list, primary_keys: list, identity: list) -> dict:
+        name = partitioning.get('field')
+        field = next((field for field in fields if field['name'] == name), None)
+        if field is None or field['type'] != 'date':
+            raise serializers.ValidationError('Range partitioning requires a date field')
+        if name not in primary_keys or name not in identity:
+            raise serializers.ValidationError('Range partitioning field must be in the "primary_keys" and '
+                                              '"identity" fields')
+        interval = partitioning.get('interval', 'month')
+        if interval not in self.INTERVALS:
+            raise serializers.ValidationError(f'Invalid partitioning interval: {interval}')
+        premake = partitioning.get('premake', 3)
+        if not isinstance(premake, int) or not 0 <= premake <= self.MAX_PREMAKE:
+            raise serializers.ValidationError(f'Premake must be between 0 and {self.MAX_PREMAKE}')
+        return {'type': 'range', 'field': name, 'interval': interval, 'premake': premake}
@@ -0,0 +1,60 @@
+import logging
+import time
+from typing import Optional
+
+from django.db import DatabaseError, transaction
+
+from hive.builder.table_compiler import TableCompiler
+from hive.entity.trashed_table_model import TrashedTable
+from hive.repository.physical_table_storage_repository import PhysicalTableStorageRepository
+from hive.repository.trash_repository import TrashRepository
+
+logger = logging.getLogger(__name__)
+
+
+class PurgeService:
+    """Drops the tables of deleted entities from the trash schema one at a time."""
+
+    def __init__(self, trash_repository: TrashRepository,
+                 table_compiler: TableCompiler,
+                 physical_table_storage_repository: PhysicalTableStorageRepository,
+                 trash_schema: str,
+                 pause: float
+                 ):
+        self.__trash_repository = trash_repository
+        self.__table_compiler = table_compiler
+        self.__physical_table_storage_repository = physical_table_storage_repository
+        self.__trash_schema = trash_schema
+        self.__pause = pause
+
+    def get(self, trash_id: int) -> TrashedTable:
+        return self.__trash_repository.get(trash_id)
+
+    def get_all(self) -> list:
+        return self.__trash_repository.get_all()
+
+    def purge(self, limit: int = None) -> list:
+        purged = []
+        while limit is None or len(purged) < limit:
+            if purged:
+                # spreads the file removals out, so the purge does not compete with the live tables for I/O
+                time.sleep(self.__pause)
+            trashed_table = self.purge_next()
+            if trashed_table is None:
+                break
+            purged.append(trashed_table)
+        return purged
+
+    def purge_next(self) -> Optional[TrashedTable]:
+        with transaction.atomic():
+            trashed_table = self.__trash_repository.lock_next_pending()
+            if trashed_table is None:
+                return None
+            try:
+                with transaction.atomic():
+                    self.__physical_table_storage_repository.execute(
+                        self.__table_compiler.drop_trashed_table(self.__trash_schema, trashed_table.table_name))
+            except DatabaseError as e:
+                logger.exception('Cannot purge %s', trashed_table.table_name)
+                return self.__trash_repository.mark(trashed_table, TrashedTable.FAILED, str(e))
+            return self.__trash_repository.mark(trashed_table, TrashedTable.PURGED)
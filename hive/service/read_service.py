@@ -0,0 +1,284 @@
+import base64
+import binascii
+import json
+from typing import Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+
+from hive.db.async_database import AsyncDatabase
+from hive.di.entity_field_type_provider import EntityFieldTypeProvider
+from hive.entity.entity_model import Entity
+from hive.entity_field_type.datatime_entity_field_type import DateTimeEntityFieldType
+from hive.repository.entity_repository import EntityRepository
+from hive.repository.storage_repository import StorageRepository
+
+
+class ReadService:
+    DEFAULT_LIMIT = 100
+    MAX_LIMIT = 1000
+    RESERVED_PARAMETERS = ('fields', 'limit', 'after', 'render')
+    OPERATORS = ('eq', 'gt', 'gte', 'lt', 'lte', 'in', 'prefix')
+    AGGREGATE_FUNCTIONS = ('count', 'sum', 'min', 'max', 'avg')
+    NUMERIC_TYPES = ('int', 'float', 'money')
+    # PostgreSQL renders the JSON of these types like their decode, references are resolved in Python
+    SQL_FORMATS = {'date': DateTimeEntityFieldType.SQL_FORMAT}
+    DECODED_TYPES = ('ref',)
+
+    def __init__(self, entity_repository: EntityRepository,
+                 storage_repository: StorageRepository,
+                 entity_field_type_provider: EntityFieldTypeProvider,
+                 schema: str,
+                 async_database: AsyncDatabase,
+                 ):
+        self.__entity_repository = entity_repository
+        self.__storage_repository = storage_repository
+        self.__entity_field_type_provider = entity_field_type_provider
+        self.__schema = schema
+        self.__async_database = async_database
+
+    def get(self, entity_name: str, keys: list, fields: list = None) -> dict:
+        record = self.get_many(entity_name, [keys], fields)[0]
+        if record is None:
+            raise NotFound("Record not exist")
+        return record
+
+    async def aget(self, entity_name: str, keys: list, fields: list = None) -> dict:
+        entity, columns, key = await self.__async_database.run_sync(self.__prepare_get, entity_name, keys, fields)
+        async with self.__async_database.connection() as async_connection:
+            records = await self.__storage_repository.afind_many_by_keys(async_connection, schema=self.__schema,
+                                                                         table_name=entity.name,
+                                                                         key_columns=entity.primary_keys,
+                                                                         keys=[key], columns=columns)
+        if not records:
+            raise NotFound("Record not exist")
+        # reference fields are resolved with synchronous queries
+        return (await self.__async_database.run_sync(self.decode, entity, columns, records))[0]
+
+    def __prepare_get(self, entity_name: str, keys: list, fields: list = None) -> tuple:
+        entity = self.__entity_repository.get_by_name(entity_name)
+        return entity, self.get_columns(entity, fields), self.__encode_keys(entity, keys)
+
+    def get_json(self, entity_name: str, keys: list, fields: list = None) -> bytes:
+        """The record as JSON generated by PostgreSQL, records with references are decoded in Python."""
+        entity, columns, key = self.__prepare_get(entity_name, keys, fields)
+        formats = self.get_sql_formats(entity, columns)
+        if formats is None:
+            return json.dumps(self.get(entity_name, keys, fields), cls=DjangoJSONEncoder).encode()
+        record = self.__storage_repository.find_json_by_keys(schema=self.__schema, table_name=entity.name,
+                                                             keys=dict(zip(entity.primary_keys, key)),
+                                                             columns=columns, formats=formats)
+        if record is None:
+            raise NotFound("Record not exist")
+        return record.encode()
+
+    def get_many(self, entity_name: str, keys: list, fields: list = None) -> list:
+        if not isinstance(keys, list) or not keys:
+            raise serializers.ValidationError("Keys must be a non-empty list of primary keys.")
+        entity = self.__entity_repository.get_by_name(entity_name)
+        columns = self.get_columns(entity, fields)
+        keys = [self.__encode_keys(entity, key) for key in keys]
+        records = self.__storage_repository.find_many_by_keys(schema=self.__schema, table_name=entity.name,
+                                                              key_columns=entity.primary_keys,
+                                                              keys=list(dict.fromkeys(keys)), columns=columns)
+        found = {tuple(record[name] for name in entity.primary_keys): record for record in records}
+        records = self.decode(entity, columns, list(found.values()))
+        found = dict(zip(found.keys(), records))
+        return [found.get(key) for key in keys]
+
+    def find(self, entity_name: str, parameters: dict) -> dict:
+        entity = self.__entity_repository.get_by_name(entity_name)
+        fields = parameters.get('fields')
+        columns = self.get_columns(entity, fields.split(',') if fields else None)
+        filters = [self.__compile_filter(entity, name, value) for name, value in parameters.items()
+                   if name not in self.RESERVED_PARAMETERS]
+        limit = self.__get_limit(parameters.get('limit'))
+        records = self.__storage_repository.find_page(schema=self.__schema, table_name=entity.name,
+                                                      columns=columns, filters=filters,
+                                                      key_columns=entity.primary_keys,
+                                                      after=self.__decode_cursor(entity, parameters.get('after')),
+                                                      limit=limit + 1)
+        next_cursor = None
+        if len(records) > limit:
+            records = records[:limit]
+            next_cursor = self.__encode_cursor([records[-1][name] for name in entity.primary_keys])
+        return {'records': self.decode(entity, columns, records), 'next': next_cursor}
+
+    def find_json(self, entity_name: str, parameters: dict) -> bytes:
+        """The page of find as JSON, the records are generated by PostgreSQL and joined as they are."""
+        entity = self.__entity_repository.get_by_name(entity_name)
+        fields = parameters.get('fields')
+        columns = self.get_columns(entity, fields.split(',') if fields else None)
+        formats = self.get_sql_formats(entity, columns)
+        if formats is None:
+            return json.dumps(self.find(entity_name, parameters), cls=DjangoJSONEncoder).encode()
+        filters = [self.__compile_filter(entity, name, value) for name, value in parameters.items()
+                   if name not in self.RESERVED_PARAMETERS]
+        limit = self.__get_limit(parameters.get('limit'))
+        rows = self.__storage_repository.find_page_json(schema=self.__schema, table_name=entity.name,
+                                                        columns=columns, filters=filters,
+                                                        key_columns=entity.primary_keys,
+                                                        after=self.__decode_cursor(entity, parameters.get('after')),
+                                                        limit=limit + 1, formats=formats)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.__encode_cursor(list(rows[-1][1]))
+        return b''.join([b'{"records": [', ', '.join(record for record, _ in rows).encode(), b'], "next": ',
+                         json.dumps(next_cursor).encode(), b'}'])
+
+    def aggregate(self, entity_name: str, data: dict) -> dict:
+        if not isinstance(data, dict):
+            raise serializers.ValidationError("Request data must be an object.")
+        entity = self.__entity_repository.get_by_name(entity_name)
+        group_by = data.get('group_by') or []
+        if not isinstance(group_by, list):
+            raise serializers.ValidationError("Group by must be a list of fields.")
+        group_by = self.get_columns(entity, group_by) if group_by else []
+        aggregates = data.get('aggregates') or [{'function': 'count'}]
+        if not isinstance(aggregates, list):
+            raise serializers.ValidationError("Aggregates must be a list.")
+        aggregates = [self.__compile_aggregate(entity, aggregate) for aggregate in aggregates]
+        aliases = group_by + [alias for _, _, alias, _ in aggregates]
+        if len(set(aliases)) != len(aliases):
+            raise serializers.ValidationError("Aggregate names must be unique and differ from group by fields.")
+        filters = data.get('filters') or {}
+        if not isinstance(filters, dict):
+            raise serializers.ValidationError("Filters must be an object.")
+        filters = [self.__compile_filter(entity, name, value) for name, value in filters.items()]
+        groups = self.__storage_repository.aggregate(schema=self.__schema, table_name=entity.name,
+                                                     group_by=group_by, aggregates=aggregates, filters=filters)
+        if group_by:
+            keys = self.decode(entity, group_by, groups)
+            groups = [dict(group, **key) for group, key in zip(groups, keys)]
+        return {'groups': groups}
+
+    @staticmethod
+    def get_columns(entity: Entity, fields: list = None) -> list:
+        columns = [field['name'] for field in entity.fields]
+        if not fields:
+            return columns
+        for name in fields:
+            if name not in columns:
+                raise serializers.ValidationError(f"Unknown field: {name}")
+        return list(dict.fromkeys(fields))
+
+    def get_sql_formats(self, entity: Entity, columns: list) -> Optional[dict]:
+        """to_char patterns of the columns PostgreSQL formats in JSON, None when a column must be decoded here."""
+        fields = {field['name']: field for field in entity.fields}
+        types = [fields[name]['type'] for name in columns]
+        if any(field_type in self.DECODED_TYPES for field_type in types):
+            return None
+        return {name: self.SQL_FORMATS[field_type] for name, field_type in zip(columns, types)
+                if field_type in self.SQL_FORMATS}
+
+    def decode(self, entity: Entity, columns: list, records: list) -> list:
+        fields = {field['name']: field for field in entity.fields}
+        values = {}
+        for name in columns:
+            field = fields[name]
+            field_type = self.__entity_field_type_provider.get(field['type'])
+            values[name] = field_type.decode_many([record[name] for record in records],
+                                                  dict(field['config'], type=field['type']))
+        return [{name: values[name][i] for name in columns} for i in range(len(records))]
+
+    def __encode_keys(self, entity: Entity, key) -> tuple:
+        primary_keys = entity.primary_keys
+        if isinstance(key, dict):
+            key = [key.get(name) for name in primary_keys]
+        elif not isinstance(key, (list, tuple)):
+            key = [key]
+        if len(key) != len(primary_keys) or any(value is None for value in key):
+            raise serializers.ValidationError(f"Primary key must have values for: {', '.join(primary_keys)}")
+        fields = {field['name']: field for field in entity.fields}
+        encoded = []
+        for name, value in zip(primary_keys, key):
+            field = fields[name]
+            try:
+                encoded.append(self.__entity_field_type_provider.get(field['type']).encode(value, field['config']))
+            except (TypeError, ValueError):
+                raise serializers.ValidationError(f"Invalid value of primary key {name}: {value}")
+        return tuple(encoded)
+
+    def __compile_filter(self, entity: Entity, parameter: str, value: str) -> tuple:
+        name, _, operator = parameter.partition('__')
+        operator = operator or 'eq'
+        field = next((field for field in entity.fields if field['name'] == name), None)
+        if field is None:
+            raise serializers.ValidationError(f"Unknown field: {name}")
+        if operator not in self.OPERATORS:
+            raise serializers.ValidationError(f"Unknown filter operator: {operator}")
+        if operator == 'prefix':
+            if field['type'] != 'str':
+                raise serializers.ValidationError(f"Prefix filter is not supported for field: {name}")
+            self.__filter_value(field, value)
+            value = value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        elif operator == 'in':
+            values = value if isinstance(value, list) else str(value).split(',')
+            value = [self.__filter_value(field, item) for item in values]
+        else:
+            value = self.__filter_value(field, value)
+        return name, operator, value
+
+    def __filter_value(self, field: dict, value: str):
+        field_type = self.__entity_field_type_provider.get(field['type'])
+        try:
+            encoded = field_type.encode(value, field['config'])
+            encoded = value if encoded is None else encoded
+            field_type.validate_value(encoded, field['config'])
+        except (TypeError, ValueError, serializers.ValidationError):
+            raise serializers.ValidationError(f"Invalid value of {field['name']}: {value}")
+        return encoded
+
+    def __compile_aggregate(self, entity: Entity, aggregate) -> tuple:
+        if not isinstance(aggregate, dict):
+            raise serializers.ValidationError("Aggregate must be an object with a function and a field.")
+        function = aggregate.get('function')
+        name = aggregate.get('field')
+        if function not in self.AGGREGATE_FUNCTIONS:
+            raise serializers.ValidationError(f"Unknown aggregate function: {function}")
+        field = next((field for field in entity.fields if field['name'] == name), None)
+        if name is None and function != 'count':
+            raise serializers.ValidationError(f"Aggregate function {function} requires a field.")
+        if name is not None and field is None:
+            raise serializers.ValidationError(f"Unknown field: {name}")
+        if function in ('sum', 'avg') and field['type'] not in self.NUMERIC_TYPES:
+            raise serializers.ValidationError(f"Aggregate function {function} is not supported for field: {name}")
+        if function in ('min', 'max') and field['type'] == 'ref':
+            raise serializers.ValidationError(f"Aggregate function {function} is not supported for field: {name}")
+        cast = None
+        if function == 'sum' and field['type'] in ('int', 'money'):
+            # money is stored as integer cents, the sum stays an exact integer
+            cast = 'int8'
+        elif function == 'avg':
+            cast = 'float8'
+        alias = aggregate.get('as') or (f"{function}_{name}" if name else function)
+        return function, name, alias, cast
+
+    def __get_limit(self, limit) -> int:
+        if limit is None:
+            return self.DEFAULT_LIMIT
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = 0
+        if not 0 < limit <= self.MAX_LIMIT:
+            raise serializers.ValidationError(f"Limit must be between 1 and {self.MAX_LIMIT}.")
+        return limit
+
+    @staticmethod
+    def __encode_cursor(values: list) -> str:
+        return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+    @staticmethod
+    def __decode_cursor(entity: Entity, cursor: str):
+        if not cursor:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            values = None
+        if not isinstance(values, list) or len(values) != len(entity.primary_keys):
+            raise serializers.ValidationError("Invalid cursor.")
+        return values
@@ -1,7 +1,6 @@
-import threading
-
 from rest_framework import serializers
 
+from hive.db.async_database import AsyncDatabase
 from hive.di.entity_field_type_provider import EntityFieldTypeProvider
 from hive.di.storage_provider import StorageProvider
 from hive.repository.entity_repository import EntityRepository
@@ -20,6 +19,7 @@ class StorageService:
                  StorageValidator,
                  storage_provider: StorageProvider,
                  schema: str,
+                 async_database: AsyncDatabase,
                  ):
         self.__entity_repository = entity_repository
         self.__entity_type_repository = entity_type_repository
@@ -28,27 +28,43 @@ class StorageService:
         self.__entity_field_type_provider = entity_field_type_provider
         self.__storage_provider = storage_provider
         self.__schema = schema
-        self.__locks = {}
+        self.__async_database = async_database
 
     def update_entity_type(self, request, entity_name: str) -> dict:
         entity = self.__entity_repository.get_by_name(entity_name)
         storage_object = self.__storage_provider.get(entity.type.class_name)
         storage_object.is_valid(request.data, entity.fields)
         config = storage_object.configure(entity)
-        lock = self.__prepare_lock(entity_name)
         try:
-            with lock:
-                result = storage_object.consume(schema=self.__schema, name=entity_name, data=request.data,
-                                                config=config)
-            if not lock.locked():
-                self.__locks.pop(entity_name)
-            return result
+            return storage_object.consume(schema=self.__schema, name=entity_name, data=request.data, config=config)
+        except Exception as e:
+            raise serializers.ValidationError(f"Error while creating record: {str(e)}")
+
+    async def aupdate_entity_type(self, data: dict, entity_name: str) -> dict:
+        storage_object, config, data = await self.__async_database.run_sync(self.__prepare, data, entity_name)
+        try:
+            return await storage_object.aconsume(schema=self.__schema, name=entity_name, data=data, config=config)
         except Exception as e:
             raise serializers.ValidationError(f"Error while creating record: {str(e)}")
 
-    def __prepare_lock(self, entity_name):
-        lock = self.__locks.get(entity_name)
-        if not lock:
-            lock = threading.Lock()
-            self.__locks[entity_name] = lock
-        return lock
+    def __prepare(self, data: dict, entity_name: str) -> tuple:
+        entity = self.__entity_repository.get_by_name(entity_name)
+        storage_object = self.__storage_provider.get(entity.type.class_name)
+        storage_object.is_valid(data, entity.fields)
+        config = storage_object.configure(entity)
+        try:
+            return storage_object, config, storage_object.prepare(data, config)
+        except Exception as e:
+            raise serializers.ValidationError(f"Error while creating record: {str(e)}")
+
+    def update_entity_type_batch(self, request, entity_name: str) -> list:
+        if not isinstance(request.data, list) or not request.data:
+            raise serializers.ValidationError("Request data must be a non-empty list of records.")
+        entity = self.__entity_repository.get_by_name(entity_name)
+        storage_object = self.__storage_provider.get(entity.type.class_name)
+        config = storage_object.configure(entity)
+        try:
+            return storage_object.consume_many(schema=self.__schema, name=entity_name, data=request.data,
+                                               config=config)
+        except Exception as e:
+            raise serializers.ValidationError(f"Error while creating records: {str(e)}")
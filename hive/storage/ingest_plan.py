@@ -0,0 +1,81 @@
+from hive.repository.storage_repository import StorageRepository
+
+
+class IngestPlan:
+    """Everything needed to write records of one entity, compiled once per entity definition."""
+
+    def __init__(self, entity_id: int, entity_name: str, fields: list, identities: list, primary_keys: list,
+                 processors: dict):
+        self.entity_id = entity_id
+        self.entity_name = entity_name
+        self.fields = fields
+        self.identities = identities
+        self.primary_keys = primary_keys
+        self.columns = [field['name'] for field in fields]
+        self.not_null_fields = [field['name'] for field in fields if not field['nullable']]
+        # field name -> (encode, validate_value, encode_many, validate_many, field config) bound once for the plan
+        self.__processors = processors
+        self.__upsert_queries = {}
+
+    def process(self, data: dict) -> dict:
+        processors = self.__processors
+        for key, value in data.items():
+            try:
+                encode, validate_value, _, _, config = processors[key]
+            except KeyError:
+                raise ValueError(f'Unknown field: {key}')
+            value = encode(value, config)
+            validate_value(value, config)
+            data[key] = value
+        return data
+
+    def process_many(self, records: list, positions: list) -> dict:
+        """Encodes and validates the records at the given positions in place, one column at a time.
+
+        Returns the error of every record that could not be processed, keyed by its position.
+        """
+        errors = {}
+        for position in positions:
+            unknown = [key for key in records[position] if key not in self.__processors]
+            if unknown:
+                errors[position] = ValueError(f'Unknown field: {unknown[0]}')
+        positions = [position for position in positions if position not in errors]
+        for column in self.columns:
+            encode, validate_value, encode_many, validate_many, config = self.__processors[column]
+            present = [position for position in positions if column in records[position]]
+            values = [records[position][column] for position in present]
+            try:
+                encoded = encode_many(values, config)
+                validate_many(encoded, config)
+            except Exception:
+                # at least one value is invalid, process the column value by value to find out which
+                encoded = []
+                for position, value in zip(present, values):
+                    try:
+                        value = encode(value, config)
+                        validate_value(value, config)
+                    except Exception as e:
+                        errors[position] = e
+                        continue
+                    encoded.append(value)
+                present = [position for position in present if position not in errors]
+                positions = [position for position in positions if position not in errors]
+            for position, value in zip(present, encoded):
+                records[position][column] = value
+        return errors
+
+    def get_primary_keys(self, data: dict) -> tuple:
+        try:
+            return tuple([data[pk] for pk in self.primary_keys])
+        except KeyError as e:
+            raise ValueError(f'Missing primary keys field: {e.args[0]}')
+
+    def get_values(self, data: dict) -> tuple:
+        return tuple([data[column] for column in self.columns])
+
+    def get_upsert_query(self, schema: str):
+        query = self.__upsert_queries.get(schema)
+        if query is None:
+            query = StorageRepository.build_upsert_query(schema, self.entity_name, self.columns, 1, self.primary_keys)
+            self.__upsert_queries[schema] = query
+        return query
@@ -0,0 +1,23 @@
+from hive.entity.entity_model import Entity
+from hive.storage.ingest_plan import IngestPlan
+
+
+class IngestPlanCache:
+    """In-process cache of compiled ingest plans, keyed by entity name."""
+
+    def __init__(self):
+        self.__plans = {}
+
+    def get(self, entity: Entity, compile_plan) -> IngestPlan:
+        plan = self.__plans.get(entity.name)
+        # a recreated entity keeps its name but gets a new id
+        if plan is None or plan.entity_id != entity.id:
+            plan = compile_plan(entity)
+            self.__plans[entity.name] = plan
+        return plan
+
+    def invalidate(self, name: str) -> None:
+        self.__plans.pop(name, None)
+
+    def clear(self) -> None:
+        self.__plans.clear()
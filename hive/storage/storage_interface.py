@@ -10,6 +10,22 @@ class StorageInterface(ABC):
     def consume(self, schema: str, name: str, data: dict, config: dict):
         pass
 
+    @abstractmethod
+    async def aconsume(self, schema: str, name: str, data: dict, config: dict):
+        pass
+
+    @abstractmethod
+    def prepare(self, data: dict, config: dict) -> dict:
+        pass
+
+    @abstractmethod
+    def consume_many(self, schema: str, name: str, data: list, config: dict) -> list:
+        pass
+
+    @abstractmethod
+    def prepare_many(self, data: list, config: dict) -> dict:
+        pass
+
     @abstractmethod
     def is_valid(self, data: dict, fields: list) -> bool:
         pass
@@ -1,8 +1,13 @@
-import threading
+from django.db import DatabaseError, transaction
+from rest_framework import serializers
 
+from hive.db.async_database import AsyncDatabase
 from hive.di.entity_field_type_provider import EntityFieldTypeProvider
 from hive.entity.entity_model import Entity
 from hive.repository.storage_repository import StorageRepository
+from hive.service.advisory_lock_manager import AdvisoryLockManager
+from hive.storage.ingest_plan import IngestPlan
+from hive.storage.ingest_plan_cache import IngestPlanCache
 from hive.storage.storage_interface import StorageInterface
 from hive.validator.storage_validator import StorageValidator
 
@@ -12,81 +17,114 @@ class UpdateStorage(StorageInterface):
                  storage_validator: StorageValidator,
                  storage_repository: StorageRepository,
                  entity_field_type_provider: EntityFieldTypeProvider,
+                 lock_manager: AdvisoryLockManager,
+                 ingest_plan_cache: IngestPlanCache,
+                 async_database: AsyncDatabase,
                  ):
         self.__storage_validator = storage_validator
         self.__storage_repository = storage_repository
         self.__entity_field_type_provider = entity_field_type_provider
-        self.__lock = threading.RLock()
+        self.__lock_manager = lock_manager
+        self.__ingest_plan_cache = ingest_plan_cache
+        self.__async_database = async_database
 
-    def configure(self, entity: Entity) -> dict:
-        not_null_fields = self.__get_not_null_fields(entity)
-        columns = self.__get_columns(entity)
-        config_dict = self.__prepare_config_dict(entity.fields)
-        return {
-            'identities': entity.identity,
-            'not_null_fields': not_null_fields,
-            'columns': columns,
-            'primary_keys': entity.primary_keys,
-            'config': config_dict
-        }
+    def configure(self, entity: Entity) -> IngestPlan:
+        return self.__ingest_plan_cache.get(entity, self.__compile_plan)
 
-    def consume(self, schema, name: str, data: dict, config: dict) -> dict:
+    def consume(self, schema, name: str, data: dict, config: IngestPlan) -> dict:
+        data = self.prepare(data, config)
+        primary_keys = config.get_primary_keys(data)
+        # insert the record or update the one with the same primary keys in a single statement
+        with transaction.atomic():
+            self.__lock_manager.lock(name, [primary_keys])
+            return self.__storage_repository.execute_upsert(schema, name, config.columns, config.get_values(data),
+                                                            config.primary_keys)
+
+    async def aconsume(self, schema, name: str, data: dict, config: IngestPlan) -> dict:
+        # data has been prepared already, reference lookups do not belong on the event loop
+        primary_keys = config.get_primary_keys(data)
+        async with self.__async_database.transaction() as async_connection:
+            await self.__lock_manager.alock(async_connection, name, [primary_keys])
+            return await self.__storage_repository.aexecute_upsert(async_connection, config.get_upsert_query(schema),
+                                                                   config.columns, config.get_values(data))
+
+    def prepare(self, data: dict, config: IngestPlan) -> dict:
         # encode and validate the data
-        data = self.__data_processes(data, config)
-        primary_keys = self.__get_primary_keys(data, config)
-        columns = config['columns']
-        # check if a record with the same identities already exists
-        existing_record = self.__storage_repository.find_by_keys(columns, primary_keys, name, schema)
-        # if no existing record, create a new one
-        if not existing_record:
-            return self.__storage_repository.create(schema=schema, table_name=name, columns=columns, data=data)
+        return config.process(data)
 
-        # update the existing record
-        return self.__storage_repository.update(schema=schema, table_name=name, columns=columns, data=data,
-                                                identities=primary_keys)
+    def consume_many(self, schema, name: str, data: list, config: IngestPlan) -> list:
+        results = [None] * len(data)
+        rows = {}
+        errors = self.prepare_many(data, config)
+        for index, record in enumerate(data):
+            try:
+                if index in errors:
+                    raise errors[index]
+                primary_keys = config.get_primary_keys(record)
+            except Exception as e:
+                results[index] = {'index': index, 'error': self.__error_message(e)}
+                continue
+            # the last record wins when the same primary keys appear more than once
+            indexes = rows.pop(primary_keys, ([], None))[0]
+            rows[primary_keys] = (indexes + [index], record)
 
-    def is_valid(self, data: dict, fields: list) -> bool:
-        self.__storage_validator.validate_request_data_types(data=data, fields=fields)
-        self.__storage_validator.validate_request_data_names(data, fields)
+        with transaction.atomic():
+            self.__lock_manager.lock(name, list(rows.keys()))
+            for indexes, record in self.__write_many(schema, name, list(rows.values()), config):
+                for index in indexes:
+                    results[index] = {'index': index, **record}
+        return results
 
-        return True
+    def __write_many(self, schema, name: str, rows: list, config: IngestPlan) -> list:
+        if not rows:
+            return []
+        try:
+            with transaction.atomic():
+                records = self.__storage_repository.upsert_many(schema=schema, table_name=name,
+                                                                columns=config.columns,
+                                                                rows=[record for _, record in rows],
+                                                                primary_keys=config.primary_keys)
+            return [(indexes, {'record': record}) for (indexes, _), record in zip(rows, records)]
+        except DatabaseError:
+            # fall back to one savepoint per record to find out which records were rejected
+            written = self.__storage_repository.upsert_each(config.get_upsert_query(schema), config.columns,
+                                                            [config.get_values(record) for _, record in rows])
+            return [(indexes, {'error': self.__error_message(record)} if isinstance(record, DatabaseError)
+                     else {'record': record}) for (indexes, _), record in zip(rows, written)]
 
     @staticmethod
-    def __prepare_config_dict(fields: dict) -> dict:
-        config_dict = {}
-        for field in fields:
-            config_dict[field['name']] = field['config']
-            config_dict[field['name']]['type'] = field['type']
-        return config_dict
+    def __error_message(error: Exception):
+        if isinstance(error, serializers.ValidationError):
+            return error.detail
+        return str(error).strip()
 
-    def __data_processes(self, data: dict, config: dict) -> dict:
-        for key, value in data.items():
-            type_ = config['config'][key]['type']
-            entity_field_type = self.__entity_field_type_provider.get(type_)
-            data[key] = entity_field_type.encode(value, config['config'][key])
-            entity_field_type.validate_value(data[key], config['config'][key])
-        return data
+    def prepare_many(self, data: list, config: IngestPlan) -> dict:
+        errors = {}
+        positions = []
+        for position, record in enumerate(data):
+            try:
+                if not isinstance(record, dict):
+                    raise serializers.ValidationError('Record is not an object.')
+                self.is_valid(record, config.fields)
+            except Exception as e:
+                errors[position] = e
+                continue
+            positions.append(position)
+        errors.update(config.process_many(data, positions))
+        return errors
 
-    @staticmethod
-    def __get_primary_keys(data: dict, config: dict) -> dict:
-        primary_keys = {}
-        for pk in config['primary_keys']:
-            if pk not in data:
-                raise ValueError(f'Missing primary keys field: {pk}')
-            primary_keys[pk] = data[pk]
-        return primary_keys
+    def is_valid(self, data: dict, fields: list) -> bool:
+        self.__storage_validator.validate_request_data_types(data=data, fields=fields)
+        self.__storage_validator.validate_request_data_names(data, fields)
 
-    @staticmethod
-    def __get_not_null_fields(entity: Entity) -> list:
-        not_null_fields = []
-        for field in entity.fields:
-            if not field['nullable']:
-                not_null_fields.append(field['name'])
-        return not_null_fields
+        return True
 
-    @staticmethod
-    def __get_columns(entity) -> list:
-        columns = []
+    def __compile_plan(self, entity: Entity) -> IngestPlan:
+        processors = {}
         for field in entity.fields:
-            columns.append(field['name'])
-        return columns
+            entity_field_type = self.__entity_field_type_provider.get(field['type'])
+            config = dict(field['config'], type=field['type'])
+            processors[field['name']] = (entity_field_type.encode, entity_field_type.validate_value,
+                                         entity_field_type.encode_many, entity_field_type.validate_many, config)
+        return IngestPlan(entity_id=entity.id, entity_name=entity.name, fields=entity.fields,
+                          identities=entity.identity, primary_keys=entity.primary_keys, processors=processors)
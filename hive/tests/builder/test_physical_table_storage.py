@@ -5,6 +5,7 @@ from django.test import TestCase
 from dotenv import load_dotenv
 
 from hive.builder.dto.field import Field
+from hive.builder.dto.table_definition import TableDefinition
 from hive.di.base_container import BaseContainer
 from hive.di.repository_container import RepositoryContainer
 
@@ -13,7 +14,7 @@ env_file = project_dir / '.env'
 load_dotenv(env_file)
 
 
-class TestPhysicalTableStorageBuilder(TestCase):
+class TestPhysicalTableStorage(TestCase):
     def setUp(self):
         self.__cursor = connection.cursor()
         self.__valid_payload = {
@@ -31,26 +32,17 @@ class TestPhysicalTableStorageBuilder(TestCase):
         base_container = BaseContainer()
         repository_container = RepositoryContainer()
         self.__entity_create_service = base_container.create_service()
-        self.__physical_table_storage_builder = base_container.physical_table_storage_builder()
+        self.__table_compiler = base_container.table_compiler()
         self.__physical_table_storage_repository = repository_container.physical_table_storage_repository()
 
-    def prepare_test(self, payload):
-        entity = self.__entity_create_service.create_entity(payload)
-        self.__physical_table_storage_builder.set_name(entity.name)
-        self.__physical_table_storage_builder.set_identity(entity.identity)
-        self.__physical_table_storage_builder.set_primary_keys(entity.primary_keys)
-        for field in entity.fields:
-            field = Field(name=field.get('name'), type=field.get('type'), config=field.get('config'),
-                          nullable=field.get('nullable'),
-                          default=field.get('default'))
-            self.__physical_table_storage_builder.add_field(field)
-        return entity
+    def alter_table(self, entity, add_fields: list, remove_fields: list):
+        existing_columns = self.__physical_table_storage_repository.get_existing_columns('hive', entity.name)
+        return self.__table_compiler.alter_table(entity.name, add_fields, remove_fields, existing_columns)
 
     def test_add_field(self):
-        entity = self.prepare_test(self.__valid_payload)
+        entity = self.__entity_create_service.create_entity(self.__valid_payload)
         field = Field(name='test_field', type='int', config={}, nullable=False, default=0)
-        self.__physical_table_storage_builder.add_field(field=field)
-        query = self.__physical_table_storage_builder.build()
+        query = self.alter_table(entity, [field], [])
         self.__physical_table_storage_repository.execute(query)
         excepted_columns = ['entity_id', 'name', 'age', 'test_field']
         query = f"SELECT column_name FROM information_schema.columns WHERE table_schema = 'hive' AND table_name = '{entity.name}'"
@@ -64,9 +56,7 @@ class TestPhysicalTableStorageBuilder(TestCase):
         entity = self.__entity_create_service.create_entity(self.__valid_payload)
         name = entity.name
         field = Field(name='age', type='int', config={}, nullable=False, default=0)
-        self.__physical_table_storage_builder.set_name(name=name)
-        self.__physical_table_storage_builder.remove_field(field=field)
-        query = self.__physical_table_storage_builder.build()
+        query = self.alter_table(entity, [], [field])
         self.__physical_table_storage_repository.execute(query)
         excepted_columns = ['entity_id', 'name']
         query = f"SELECT column_name FROM information_schema.columns WHERE table_schema = 'hive' AND table_name = '{name}'"
@@ -79,19 +69,13 @@ class TestPhysicalTableStorageBuilder(TestCase):
     def test_add_table(self):
 
         name = "test table ;)"
-        self.__physical_table_storage_builder.set_name(name)
-        self.__physical_table_storage_builder.set_identity(
-            ["kolumieńka", "nazwa"]
-        )
-        self.__physical_table_storage_builder.set_primary_keys(
-            ["kolumieńka", "nazwa"]
-        )
-        self.__physical_table_storage_builder.add_field(
-            Field(name="nazwa", type="str", config={"length": 200}, nullable=True, default="domślnie to"))
-        self.__physical_table_storage_builder.add_field(
-            Field(name="kolumieńka", type="str", config={"length": 200}, required=False, default="domślnie to",
-                  nullable=True))
-        query = self.__physical_table_storage_builder.build()
+        query = self.__table_compiler.create_table(TableDefinition(
+            name=name,
+            identity=["kolumieńka", "nazwa"],
+            primary_keys=["kolumieńka", "nazwa"],
+            fields=[Field(name="nazwa", type="str", config={"length": 200}, nullable=True, default="domślnie to"),
+                    Field(name="kolumieńka", type="str", config={"length": 200}, required=False,
+                          default="domślnie to", nullable=True)]))
         self.__physical_table_storage_repository.execute(query)
         excepted_columns = ['nazwa', 'kolumieńka']
         query = f"SELECT column_name FROM information_schema.columns WHERE table_schema = 'hive' AND table_name = '{name}'"
@@ -102,15 +86,13 @@ class TestPhysicalTableStorageBuilder(TestCase):
         self.assertEqual(excepted_columns, columns)
 
     def test_add_and_remove_field(self):
-        entity = self.prepare_test(self.__valid_payload)
-        self.__physical_table_storage_builder.add_field(
-            Field(name="nazwa", type="str", config={"length": 200}, nullable=True, default="domślnie to"))
-        self.__physical_table_storage_builder.add_field(
+        entity = self.__entity_create_service.create_entity(self.__valid_payload)
+        added_fields = [
+            Field(name="nazwa", type="str", config={"length": 200}, nullable=True, default="domślnie to"),
             Field(name="kolumienka", type="str", config={"length": 200}, required=False, default="domślnie to",
-                  nullable=True))
+                  nullable=True)]
         removed_field = Field(name='age', type='int', config={}, nullable=False, default=0)
-        self.__physical_table_storage_builder.remove_field(field=removed_field)
-        query = self.__physical_table_storage_builder.build()
+        query = self.alter_table(entity, added_fields, [removed_field])
         self.__physical_table_storage_repository.execute(query)
 
         excepted_columns = ['entity_id', 'name', 'nazwa', 'kolumienka']
@@ -125,7 +107,7 @@ class TestPhysicalTableStorageBuilder(TestCase):
         self.__entity_create_service.create_entity(self.__valid_payload)
         excepted_error = "[ErrorDetail(string='Name is required.', code='invalid')]"
         try:
-            query = self.__physical_table_storage_builder.build()
+            query = self.__table_compiler.alter_table(None, [], [], [])
             self.__physical_table_storage_repository.execute(query)
         except Exception as e:
             e = str(e)
@@ -133,10 +115,9 @@ class TestPhysicalTableStorageBuilder(TestCase):
 
     def test_build_without_add_fields(self):
         entity = self.__entity_create_service.create_entity(self.__valid_payload)
-        self.__physical_table_storage_builder.set_name(entity.name)
         excepted_error = "[ErrorDetail(string='No changes to apply.', code='invalid')]"
         try:
-            query = self.__physical_table_storage_builder.build()
+            query = self.alter_table(entity, [], [])
             self.__physical_table_storage_repository.execute(query)
         except Exception as e:
             e = str(e)
@@ -144,18 +125,12 @@ class TestPhysicalTableStorageBuilder(TestCase):
 
     def test_build_table_without_default(self):
         name = "test table ;)"
-        self.__physical_table_storage_builder.set_name(name)
-        self.__physical_table_storage_builder.set_identity(
-            ["kolumieńka", "nazwa"]
-        )
-        self.__physical_table_storage_builder.set_primary_keys(
-            ["kolumieńka", "nazwa"]
-        )
-        self.__physical_table_storage_builder.add_field(
-            Field(name="nazwa", type="str", config={"length": 200}, nullable=True))
-        self.__physical_table_storage_builder.add_field(
-            Field(name="kolumieńka", type="str", config={"length": 200}, required=False, nullable=True))
-        query = self.__physical_table_storage_builder.build()
+        query = self.__table_compiler.create_table(TableDefinition(
+            name=name,
+            identity=["kolumieńka", "nazwa"],
+            primary_keys=["kolumieńka", "nazwa"],
+            fields=[Field(name="nazwa", type="str", config={"length": 200}, nullable=True),
+                    Field(name="kolumieńka", type="str", config={"length": 200}, required=False, nullable=True)]))
         self.__physical_table_storage_repository.execute(query)
 
         table_name = f'hive.{name}'
@@ -180,15 +155,13 @@ class TestPhysicalTableStorageBuilder(TestCase):
             "primary_keys": ["entity_id"],
             "type": "Update"
         }
-        entity = self.prepare_test(valid_payload)
-        self.__physical_table_storage_builder.add_field(
-            Field(name="nazwa", type="str", config={"length": 200}, nullable=True, default="domślnie to"))
-        self.__physical_table_storage_builder.add_field(
+        entity = self.__entity_create_service.create_entity(valid_payload)
+        added_fields = [
+            Field(name="nazwa", type="str", config={"length": 200}, nullable=True, default="domślnie to"),
             Field(name="kolumienka", type="str", config={"length": 200}, required=False, default="domślnie to",
-                  nullable=True))
+                  nullable=True)]
         removed_field = Field(name='age', type='int', config={}, nullable=False, default=0)
-        self.__physical_table_storage_builder.remove_field(field=removed_field)
-        query = self.__physical_table_storage_builder.build()
+        query = self.alter_table(entity, added_fields, [removed_field])
         self.__physical_table_storage_repository.execute(query)
 
         table_name = f'hive.{entity.name}'
@@ -0,0 +1,62 @@
+from django.db import connection
+from django.test import TestCase
+from rest_framework import serializers
+
+from hive.builder.dto.field import Field
+from hive.builder.dto.partitioning import Partitioning
+from hive.builder.dto.table_definition import TableDefinition
+from hive.di.base_container import BaseContainer
+
+
+class TestTableCompiler(TestCase):
+
+    def setUp(self):
+        self.__table_compiler = BaseContainer().table_compiler()
+        self.__definition = TableDefinition(
+            name='test_entity_30',
+            identity=['entity_id'],
+            primary_keys=['entity_id'],
+            fields=[Field(name='entity_id', type='int', config={}, nullable=False, default=5),
+                    Field(name='name', type='str', config={'length': 10}, nullable=True, default='test'),
+                    Field(name='money', type='money', config={}, nullable=True)])
+        connection.ensure_connection()
+
+    @staticmethod
+    def __as_string(query) -> str:
+        return ' '.join(query.as_string(connection.connection).split())
+
+    def test_create_table(self):
+        query = self.__as_string(self.__table_compiler.create_table(self.__definition))
+        self.assertEqual(query, 'CREATE TABLE "hive"."test_entity_30" ("entity_id" int NOT NULL DEFAULT 5, '
+                                '"name" varchar(10) DEFAULT \'test\', "money" int ,PRIMARY KEY ("entity_id"), '
+                                'UNIQUE ("entity_id"));')
+
+    def test_create_hash_partitioned_table(self):
+        definition = self.__definition.copy(update={'partitioning': Partitioning(type='hash', partitions=2)})
+        query = self.__as_string(self.__table_compiler.create_table(definition))
+        self.assertIn('PARTITION BY HASH ("entity_id"); CREATE TABLE "hive"."test_entity_30_h0" PARTITION OF '
+                      '"hive"."test_entity_30" FOR VALUES WITH (MODULUS 2, REMAINDER 0)', query)
+        self.assertIn('"test_entity_30_h1"', query)
+
+    def test_compile_is_repeatable(self):
+        # nothing is kept between calls, so the same definition always gives the same DDL
+        first = self.__as_string(self.__table_compiler.create_table(self.__definition))
+        self.__table_compiler.alter_table('other', [Field(name='a', type='int', config={}, nullable=True)], [], [])
+        self.assertEqual(first, self.__as_string(self.__table_compiler.create_table(self.__definition)))
+
+    def test_alter_table(self):
+        query = self.__table_compiler.alter_table(
+            'test_entity_30', [Field(name='age', type='int', config={}, nullable=True),
+                               Field(name='name', type='str', config={'length': 10}, nullable=True)],
+            [Field(name='money', type='money', config={}, nullable=True)], ['entity_id', 'name', 'money'])
+        self.assertEqual(self.__as_string(query), 'ALTER TABLE "hive"."test_entity_30" ADD COLUMN "age" int , '
+                                                  'DROP COLUMN "money";')
+
+    def test_alter_table_without_changes(self):
+        with self.assertRaises(serializers.ValidationError):
+            self.__table_compiler.alter_table('test_entity_30', [], [Field(name='age', type='int', config={},
+                                                                           nullable=True)], ['entity_id'])
+
+    def test_drop_table(self):
+        self.assertEqual(self.__as_string(self.__table_compiler.drop_table('test_entity_30')),
+                         'DROP TABLE IF EXISTS "hive"."test_entity_30";')
@@ -0,0 +1,85 @@
+import json
+import os
+import pathlib
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from dotenv import load_dotenv
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from hive.entity.entity_type_model import EntityType
+from hive.repository.entity_repository import EntityRepository
+from hive.service.dto.request_data import RequestData
+
+project_dir = pathlib.Path(__file__).parent.resolve().parent.parent
+env_file = project_dir / '.env'
+load_dotenv(env_file)
+
+
+class TestAggregateStorageController(TestCase):
+
+    def setUp(self):
+        self.__client = APIClient()
+        self.__cursor = connection.cursor()
+        payload = {
+            'username': os.environ.get('HIVE_USER'),
+            'password': os.environ.get('HIVE_PASS')
+        }
+        token_res = self.__client.post(reverse('token_obtain_pair'), data=payload)
+        token = token_res.data.get('access')
+        self.__client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        entity_payload = {"name": "test_entity_26",
+                          "fields": [
+                              {"name": "entity_id", "type": "int", "config": {}, "nullable": False, "default": 0},
+                              {"name": "name", "type": "str", "config": {"length": 10}, "nullable": False,
+                               "default": "test"},
+                              {"name": "price", "type": "money", "config": {}, "nullable": False}],
+                          "identity": ["entity_id"],
+                          "primary_keys": ["entity_id"],
+                          "type": "Update"}
+        EntityRepository().create(RequestData(entity_payload), EntityType(2, 'Update', 'UpdateEntityType'))
+        self.__cursor.execute("CREATE TABLE hive.test_entity_26 (entity_id int NOT NULL, name varchar(10) NOT NULL,"
+                              " price int NOT NULL, PRIMARY KEY (entity_id))")
+        self.__cursor.execute("INSERT INTO hive.test_entity_26 SELECT i, 'name_' || (i % 2), i * 1999 "
+                              "FROM generate_series(1, 10) AS i")
+        self.__url = reverse('aggregate-records', args=['test_entity_26'])
+
+    def __post(self, payload: dict):
+        response = self.__client.post(self.__url, data=json.dumps(payload), content_type='application/json')
+        return response.status_code, json.loads(response.content)
+
+    def test_aggregate_with_group_by(self):
+        status_code, content = self.__post({
+            "group_by": ["name"],
+            "aggregates": [{"function": "count"}, {"function": "sum", "field": "price", "as": "total"},
+                           {"function": "max", "field": "entity_id"}, {"function": "avg", "field": "price"}]
+        })
+        self.assertEqual(status_code, status.HTTP_200_OK)
+        self.assertEqual(content, {"groups": [
+            {"name": "name_0", "count": 5, "total": 59970, "max_entity_id": 10, "avg_price": 11994.0},
+            {"name": "name_1", "count": 5, "total": 49975, "max_entity_id": 9, "avg_price": 9995.0}]})
+
+    def test_aggregate_with_filters(self):
+        status_code, content = self.__post({
+            "aggregates": [{"function": "sum", "field": "price"}, {"function": "min", "field": "name"}],
+            "filters": {"entity_id__in": [1, 2, 3], "name__prefix": "name_", "price__gte": "19.99"}
+        })
+        self.assertEqual(content, {"groups": [{"sum_price": 11994, "min_name": "name_0"}]})
+
+    def test_aggregate_with_invalid_request(self):
+        status_code, content = self.__post({"aggregates": [{"function": "median", "field": "price"}]})
+        self.assertEqual((status_code, content), (status.HTTP_400_BAD_REQUEST,
+                                                  ["Unknown aggregate function: median"]))
+        status_code, content = self.__post({"aggregates": [{"function": "sum", "field": "name"}]})
+        self.assertEqual(content, ["Aggregate function sum is not supported for field: name"])
+        status_code, content = self.__post({"group_by": ["colour"]})
+        self.assertEqual(content, ["Unknown field: colour"])
+        status_code, content = self.__post({"group_by": ["name"], "aggregates": [{"function": "count", "as": "name"}]})
+        self.assertEqual(content, ["Aggregate names must be unique and differ from group by fields."])
+
+    def tearDown(self):
+        self.__client.credentials()
+        self.__cursor.close()
+        super().tearDown()
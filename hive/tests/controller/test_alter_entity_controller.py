@@ -0,0 +1,182 @@
+import copy
+import json
+import os
+import pathlib
+
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from dotenv import load_dotenv
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from hive.entity.entity_model import Entity
+
+project_dir = pathlib.Path(__file__).parent.resolve().parent.parent
+env_file = project_dir / '.env'
+load_dotenv(env_file)
+
+
+class TestAlterEntityController(TestCase):
+
+    def setUp(self):
+        self.__client = APIClient()
+        self.__cursor = connection.cursor()
+        payload = {
+            'username': os.environ.get('HIVE_USER'),
+            'password': os.environ.get('HIVE_PASS')
+        }
+        token_res = self.__client.post(reverse('token_obtain_pair'), data=payload)
+        token = token_res.data.get('access')
+        self.__client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        self.__fields = [
+            {"name": "entity_id", "type": "int", "config": {}, "nullable": False, "default": 0},
+            {"name": "name", "type": "str", "config": {"length": 10}, "nullable": False, "default": "test"},
+            {"name": "age", "type": "int", "config": {}, "nullable": True},
+            {"name": "note", "type": "str", "config": {"length": 10}, "nullable": True}
+        ]
+        entity_payload = {
+            "name": "test_entity_29",
+            "fields": self.__fields,
+            "identity": ["entity_id"],
+            "primary_keys": ["entity_id"],
+            "indexes": [{"name": "test_entity_29_age", "fields": ["age"]}],
+            "type": "Update"
+        }
+        response = self.__client.post(reverse('create-entity'), data=json.dumps(entity_payload),
+                                      content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.__cursor.execute("INSERT INTO hive.test_entity_29 SELECT i, 'name_' || i, "
+                              "CASE WHEN i % 2 = 0 THEN i END, NULL FROM generate_series(1, 25) i")
+        self.__url = reverse('delete-entity', args=['test_entity_29'])
+
+    def tearDown(self):
+        apps.get_app_config('hive').base_container.repository.entity_cache().clear()
+
+    def __patch(self, fields: list):
+        return self.__client.patch(self.__url, data=json.dumps({"fields": fields}), content_type='application/json')
+
+    def __columns(self) -> dict:
+        self.__cursor.execute("SELECT column_name, data_type, character_maximum_length, is_nullable "
+                              "FROM information_schema.columns WHERE table_schema = 'hive' "
+                              "AND table_name = 'test_entity_29'")
+        return {name: (data_type, length, nullable) for name, data_type, length, nullable in self.__cursor.fetchall()}
+
+    def test_add_and_remove_fields(self):
+        fields = copy.deepcopy(self.__fields)[:3] + [
+            {"name": "Score", "type": "int", "config": {}, "nullable": False, "default": 7},
+            {"name": "comment", "type": "str", "config": {"length": 20}, "nullable": True}
+        ]
+        response = self.__patch(fields)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([field['name'] for field in response.data['fields']],
+                         ['entity_id', 'name', 'age', 'score', 'comment'])
+        self.assertNotIn('note', self.__columns())
+        self.__cursor.execute("SELECT count(*) FROM hive.test_entity_29 WHERE score = 7")
+        self.assertEqual(self.__cursor.fetchone()[0], 25)
+        self.assertEqual(Entity.objects.get(name='test_entity_29').fields, response.data['fields'])
+
+    def test_widen_varchar(self):
+        fields = copy.deepcopy(self.__fields)
+        fields[1]['config'] = {"length": 50}
+        response = self.__patch(fields)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.__columns()['name'], ('character varying', 50, 'NO'))
+
+    def test_change_type_through_shadow_column(self):
+        fields = copy.deepcopy(self.__fields)
+        fields[2] = {"name": "age", "type": "str", "config": {"length": 5}, "nullable": True}
+        response = self.__patch(fields)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.__columns()['age'], ('character varying', 5, 'YES'))
+        self.assertNotIn('_shadow_age', self.__columns())
+        self.__cursor.execute("SELECT age FROM hive.test_entity_29 WHERE entity_id IN (2, 3) ORDER BY entity_id")
+        self.assertEqual(self.__cursor.fetchall(), [('2',), (None,)])
+        # the index of the swapped column is built again and the sync trigger is gone
+        self.__cursor.execute("SELECT indexdef FROM pg_indexes WHERE indexname = 'test_entity_29_age'")
+        self.assertIn('(age)', self.__cursor.fetchone()[0])
+        self.__cursor.execute("SELECT count(*) FROM pg_trigger WHERE tgrelid = 'hive.test_entity_29'::regclass")
+        self.assertEqual(self.__cursor.fetchone()[0], 0)
+
+    def test_narrow_varchar_with_longer_values(self):
+        fields = copy.deepcopy(self.__fields)
+        fields[1]['config'] = {"length": 6}
+        response = self.__patch(fields)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, ['Values of field name are longer than 6 characters'])
+        self.assertEqual(self.__columns()['name'], ('character varying', 10, 'NO'))
+        self.assertNotIn('_shadow_name', self.__columns())
+        self.__cursor.execute("SELECT count(*) FROM pg_constraint WHERE conrelid = 'hive.test_entity_29'::regclass "
+                              "AND contype = 'c'")
+        self.assertEqual(self.__cursor.fetchone()[0], 0)
+        self.__cursor.execute("SELECT name FROM hive.test_entity_29 WHERE entity_id = 25")
+        self.assertEqual(self.__cursor.fetchone()[0], 'name_25')
+
+        fields[1]['config'] = {"length": 7}
+        response = self.__patch(fields)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.__columns()['name'], ('character varying', 7, 'NO'))
+        self.__cursor.execute("SELECT name FROM hive.test_entity_29 WHERE entity_id = 25")
+        self.assertEqual(self.__cursor.fetchone()[0], 'name_25')
+
+    def test_money_type_change(self):
+        fields = copy.deepcopy(self.__fields)
+        fields[2] = {"name": "age", "type": "money", "config": {}, "nullable": True}
+        response = self.__patch(fields)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, ['Field age cannot be changed from or to money'])
+        self.assertEqual(Entity.objects.get(name='test_entity_29').fields[2]['type'], 'int')
+        self.__cursor.execute("SELECT age FROM hive.test_entity_29 WHERE entity_id = 2")
+        self.assertEqual(self.__cursor.fetchone()[0], 2)
+
+        fields = copy.deepcopy(self.__fields) + [{"name": "price", "type": "money", "config": {}, "nullable": True}]
+        self.assertEqual(self.__patch(fields).status_code, status.HTTP_200_OK)
+        fields[4] = {"name": "price", "type": "float", "config": {}, "nullable": True}
+        response = self.__patch(fields)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, ['Field price cannot be changed from or to money'])
+
+    def test_set_not_null_backfills_default(self):
+        fields = copy.deepcopy(self.__fields)
+        fields[2] = {"name": "age", "type": "int", "config": {}, "nullable": False, "default": -1}
+        response = self.__patch(fields)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.__columns()['age'][2], 'NO')
+        self.__cursor.execute("SELECT count(*) FROM hive.test_entity_29 WHERE age = -1")
+        self.assertEqual(self.__cursor.fetchone()[0], 13)
+
+    def test_set_not_null_without_default_on_empty_values(self):
+        fields = copy.deepcopy(self.__fields)
+        fields[3]['nullable'] = False
+        response = self.__patch(fields)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.__columns()['note'][2], 'YES')
+
+    def test_failed_conversion_keeps_column(self):
+        fields = copy.deepcopy(self.__fields)
+        fields[1] = {"name": "name", "type": "int", "config": {}, "nullable": False, "default": 0}
+        response = self.__patch(fields)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.__columns()['name'][0], 'character varying')
+        self.assertNotIn('_shadow_name', self.__columns())
+        self.assertEqual(Entity.objects.get(name='test_entity_29').fields[1]['type'], 'str')
+
+    def test_invalid_changes(self):
+        changed_key = copy.deepcopy(self.__fields)
+        changed_key[0]['type'] = 'float'
+        new_not_null = copy.deepcopy(self.__fields) + [
+            {"name": "score", "type": "int", "config": {}, "nullable": False}]
+        for fields in (changed_key, new_not_null, copy.deepcopy(self.__fields)):
+            with self.subTest(fields=fields):
+                self.assertEqual(self.__patch(fields).status_code, status.HTTP_400_BAD_REQUEST)
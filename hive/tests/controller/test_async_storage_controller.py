@@ -0,0 +1,123 @@
+import asyncio
+import functools
+import json
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from hive.entity.entity_type_model import EntityType
+from hive.repository.entity_repository import EntityRepository
+from hive.service.dto.request_data import RequestData
+
+
+def closing_async_database(test):
+    # the async pool belongs to the event loop of the test, it has to be closed before the loop is gone
+    @functools.wraps(test)
+    async def wrapper(self):
+        try:
+            await test(self)
+        finally:
+            await apps.get_app_config('hive').base_container.repository.async_database().close()
+    return wrapper
+
+
+class TestAsyncStorageController(TransactionTestCase):
+    # the async path writes through its own connections, so the test data is committed and flushed afterwards
+    serialized_rollback = True
+
+    def setUp(self):
+        token = AccessToken()
+        token['user_id'] = 1
+        self.__authorization = 'Bearer ' + str(token)
+        entity_payload = {"name": "test_entity_34",
+                          "fields": [
+                              {"name": "entity_id", "type": "int", "config": {}, "nullable": False, "default": 0},
+                              {"name": "name", "type": "str", "config": {"length": 10}, "nullable": False,
+                               "default": "test"},
+                              {"name": "price", "type": "money", "config": {}, "nullable": False}],
+                          "identity": ["entity_id"],
+                          "primary_keys": ["entity_id"],
+                          "type": "Update"}
+        entity_type, _ = EntityType.objects.get_or_create(name='Update', defaults={'class_name': 'UpdateStorage',
+                                                                                   'file_name': 'update_storage'})
+        EntityRepository().create(RequestData(entity_payload), entity_type)
+        # money is stored in integer cents, the way the money field type encodes it
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE hive.test_entity_34 (entity_id int NOT NULL, name varchar(10) NOT NULL, "
+                           "price int NOT NULL, PRIMARY KEY (entity_id))")
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE hive.test_entity_34")
+        apps.get_app_config('hive').base_container.repository.entity_cache().clear()
+
+    async def __post(self, data, authorization=None):
+        return await self.async_client.post(reverse('async-create-record', args=['test_entity_34']),
+                                            json.dumps(data), content_type='application/json',
+                                            headers={'Authorization': authorization or self.__authorization})
+
+    async def __get(self, keys: str):
+        return await self.async_client.get(reverse('async-read-record', args=['test_entity_34', keys]),
+                                           headers={'Authorization': self.__authorization})
+
+    @closing_async_database
+    async def test_create_and_read_record(self):
+        response = await self.__post({"entity_id": 1, "name": "first", "price": "12.50"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json(), {"entity_id": 1, "name": "first", "price": 1250})
+
+        response = await self.__post({"entity_id": 1, "name": "second", "price": "3"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = await self.__get('1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"entity_id": 1, "name": "second", "price": 300})
+
+    @closing_async_database
+    async def test_concurrent_writes(self):
+        responses = await asyncio.gather(*[self.__post({"entity_id": i % 5, "name": f"name_{i}", "price": str(i)})
+                                           for i in range(40)])
+        self.assertEqual({response.status_code for response in responses}, {status.HTTP_201_CREATED})
+        for entity_id in range(5):
+            response = await self.__get(str(entity_id))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @closing_async_database
+    async def test_create_invalid_record(self):
+        response = await self.__post({"entity_id": 1, "name": "first", "price": "12.50", "age": 3})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = await self.async_client.post(reverse('async-create-record', args=['test_entity_34']), '{',
+                                                content_type='application/json',
+                                                headers={'Authorization': self.__authorization})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @closing_async_database
+    async def test_read_missing_record(self):
+        response = await self.__get('7')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json(), {"detail": "Record not exist"})
+
+    @closing_async_database
+    async def test_requires_token(self):
+        response = await self.__post({"entity_id": 1, "name": "first", "price": "1"}, 'Bearer invalid')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = await self.async_client.get(reverse('async-read-record', args=['test_entity_34', '1']))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @closing_async_database
+    async def test_rejects_inactive_user(self):
+        users = get_user_model().objects.filter(pk=1)
+        await sync_to_async(users.update)(is_active=False)
+        try:
+            response = await self.__get('1')
+        finally:
+            await sync_to_async(users.update)(is_active=True)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.json()['code'], 'user_inactive')
@@ -0,0 +1,107 @@
+import json
+import os
+import pathlib
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import resolve, reverse
+from dotenv import load_dotenv
+from psycopg import sql
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from hive.entity.entity_model import Entity
+from hive.entity.entity_type_model import EntityType
+from hive.repository.entity_repository import EntityRepository
+from hive.service.dto.request_data import RequestData
+
+project_dir = pathlib.Path(__file__).parent.resolve().parent.parent
+env_file = project_dir / '.env'
+load_dotenv(env_file)
+
+
+class TestBatchStorageController(TestCase):
+
+    def setUp(self):
+        self.__client = APIClient()
+        self.__cursor = connection.cursor()
+        self.__entity_repository = EntityRepository()
+        self.__entity_type_obj = EntityType(2, 'Update', 'UpdateEntityType')
+        payload = {
+            'username': os.environ.get('HIVE_USER'),
+            'password': os.environ.get('HIVE_PASS')
+        }
+        token_res = self.__client.post(reverse('token_obtain_pair'), data=payload)
+        token = token_res.data.get('access')
+        self.__client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        self.__valid_entity_payload = {"name": "test_entity_16",
+                                       "fields": [
+                                           {"name": "entity_id", "type": "int", "config": {}, "nullable": False,
+                                            "default": 0},
+                                           {"name": "name", "type": "str", "config": {"length": 10},
+                                            "nullable": False, "default": "test"},
+                                           {"name": "age", "type": "int", "config": {}, "nullable": False,
+                                            "default": 0}],
+                                       "identity": ["entity_id"],
+                                       "primary_keys": ["entity_id"],
+                                       "type": "Update"}
+        self.__url = reverse('create-records-batch', args=[self.__valid_entity_payload['name']])
+
+    def __create_table(self, entity: Entity):
+        query = sql.SQL("CREATE TABLE {}.{} (entity_id int NOT NULL, name varchar(10) NOT NULL, age int NOT NULL,"
+                        " PRIMARY KEY (entity_id))").format(sql.Identifier('hive'), sql.Identifier(entity.name))
+        self.__cursor.execute(query)
+
+    def __prepare_entity(self):
+        request_data = RequestData(self.__valid_entity_payload)
+        entity = self.__entity_repository.create(request_data, self.__entity_type_obj)
+        self.__create_table(entity)
+
+    def test_create_records_success(self):
+        self.__prepare_entity()
+        payload = [{"entity_id": 1, "name": "first", "age": 10}, {"entity_id": 2, "name": "second", "age": 20}]
+        response = self.__client.post(self.__url, data=json.dumps(payload), content_type='application/json')
+        excepted_response_content = b'{"records": [{"index": 0, "record": {"entity_id": 1, "name": "first", ' \
+                                    b'"age": 10}}, {"index": 1, "record": {"entity_id": 2, "name": "second", ' \
+                                    b'"age": 20}}]}'
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.content, excepted_response_content)
+
+    def test_batch_route_does_not_shadow_record_keys(self):
+        self.assertTrue(self.__url.endswith('/records:batch'))
+        self.assertEqual(resolve('/v1/entities/test_entity/records/batch').url_name, 'read-record')
+
+    def test_update_existing_and_duplicated_records(self):
+        self.__prepare_entity()
+        self.__cursor.execute("INSERT INTO hive.test_entity_16 VALUES (1, 'first', 10)")
+        payload = [{"entity_id": 1, "name": "first", "age": 11}, {"entity_id": 1, "name": "first", "age": 12}]
+        response = self.__client.post(self.__url, data=json.dumps(payload), content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.__cursor.execute("SELECT age FROM hive.test_entity_16 WHERE entity_id = 1")
+        self.assertEqual(self.__cursor.fetchone()[0], 12)
+
+    def test_invalid_records_do_not_fail_batch(self):
+        self.__prepare_entity()
+        payload = [{"entity_id": 1, "name": "first", "age": 10},
+                   {"entity_id": 2, "name": 1234, "age": 20},
+                   {"entity_id": 3, "name": "test123456789", "age": 30}]
+        response = self.__client.post(self.__url, data=json.dumps(payload), content_type='application/json')
+        records = json.loads(response.content)['records']
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(records[0], {"index": 0, "record": {"entity_id": 1, "name": "first", "age": 10}})
+        self.assertEqual(records[1], {"index": 1, "error": "Value: 1234 is not a string."})
+        self.assertIn("value too long for type character varying(10)", records[2]['error'])
+        self.__cursor.execute("SELECT count(*) FROM hive.test_entity_16")
+        self.assertEqual(self.__cursor.fetchone()[0], 1)
+
+    def test_post_request_with_invalid_payload(self):
+        self.__prepare_entity()
+        response = self.__client.post(self.__url, data=json.dumps({"entity_id": 1}), content_type='application/json')
+        excepted_response_content = b'["Request data must be a non-empty list of records."]'
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.content, excepted_response_content)
+
+    def tearDown(self):
+        self.__client.credentials()
+        self.__cursor.close()
+        super().tearDown()
@@ -0,0 +1,89 @@
+import gzip
+import json
+import os
+import pathlib
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from dotenv import load_dotenv
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from hive.entity.entity_type_model import EntityType
+from hive.repository.entity_repository import EntityRepository
+from hive.service.dto.request_data import RequestData
+
+project_dir = pathlib.Path(__file__).parent.resolve().parent.parent
+env_file = project_dir / '.env'
+load_dotenv(env_file)
+
+
+class TestExportStorageController(TestCase):
+
+    def setUp(self):
+        self.__client = APIClient()
+        self.__cursor = connection.cursor()
+        payload = {
+            'username': os.environ.get('HIVE_USER'),
+            'password': os.environ.get('HIVE_PASS')
+        }
+        token_res = self.__client.post(reverse('token_obtain_pair'), data=payload)
+        self.__authorization = 'Bearer ' + token_res.data.get('access')
+        self.__client.credentials(HTTP_AUTHORIZATION=self.__authorization)
+        entity_payload = {"name": "test_entity_24",
+                          "fields": [
+                              {"name": "entity_id", "type": "int", "config": {}, "nullable": False, "default": 0},
+                              {"name": "name", "type": "str", "config": {"length": 10}, "nullable": False,
+                               "default": "test"},
+                              {"name": "price", "type": "money", "config": {}, "nullable": False}],
+                          "identity": ["entity_id"],
+                          "primary_keys": ["entity_id"],
+                          "type": "Update"}
+        EntityRepository().create(RequestData(entity_payload), EntityType(2, 'Update', 'UpdateEntityType'))
+        # money is stored in integer cents, the way the money field type encodes it
+        self.__cursor.execute("CREATE TABLE hive.test_entity_24 (entity_id int NOT NULL, name varchar(10) NOT NULL,"
+                              " price int NOT NULL, PRIMARY KEY (entity_id))")
+        self.__cursor.execute("INSERT INTO hive.test_entity_24 VALUES (1, 'first', 10000), (2, 'sec,ond', 25000)")
+        self.__url = reverse('export-records', args=['test_entity_24'])
+
+    def test_export_ndjson(self):
+        response = self.__client.get(self.__url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(sorted(map(json.loads, lines), key=lambda record: record['entity_id']),
+                         [{"entity_id": 1, "name": "first", "price": 10000},
+                          {"entity_id": 2, "name": "sec,ond", "price": 25000}])
+
+    def test_export_ndjson_rendered_by_postgres(self):
+        response = self.__client.get(self.__url, data={'render': 'postgres', 'fields': 'price,entity_id'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(sorted(map(json.loads, lines), key=lambda record: record['entity_id']),
+                         [{"price": 10000, "entity_id": 1}, {"price": 25000, "entity_id": 2}])
+
+    async def test_export_streams_asynchronously_under_asgi(self):
+        response = await self.async_client.get(self.__url, headers={'Authorization': self.__authorization})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        lines = b''.join([chunk async for chunk in response.streaming_content]).decode().splitlines()
+        self.assertEqual(sorted(json.loads(line)['entity_id'] for line in lines), [1, 2])
+
+    def test_export_csv_with_gzip(self):
+        response = self.__client.get(self.__url, data={'output': 'csv', 'fields': 'name,entity_id',
+                                                       'compress': 'gzip'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="test_entity_24.csv.gz"')
+        lines = gzip.decompress(b''.join(response.streaming_content)).decode().splitlines()
+        self.assertEqual(lines[0], 'name,entity_id')
+        self.assertEqual(sorted(lines[1:]), ['"sec,ond",2', 'first,1'])
+
+    def test_export_with_unknown_format(self):
+        response = self.__client.get(self.__url, data={'output': 'xml'})
+        self.assertContains(response, 'Unknown export format: xml', status_code=status.HTTP_400_BAD_REQUEST)
+
+    def tearDown(self):
+        self.__client.credentials()
+        self.__cursor.close()
+        super().tearDown()
@@ -0,0 +1,118 @@
+import json
+import os
+import pathlib
+
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from dotenv import load_dotenv
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from hive.entity.entity_model import Entity
+
+project_dir = pathlib.Path(__file__).parent.resolve().parent.parent
+env_file = project_dir / '.env'
+load_dotenv(env_file)
+
+
+class TestIndexController(TestCase):
+
+    def setUp(self):
+        self.__client = APIClient()
+        self.__cursor = connection.cursor()
+        payload = {
+            'username': os.environ.get('HIVE_USER'),
+            'password': os.environ.get('HIVE_PASS')
+        }
+        token_res = self.__client.post(reverse('token_obtain_pair'), data=payload)
+        token = token_res.data.get('access')
+        self.__client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        self.__entity_payload = {
+            "name": "test_entity_27",
+            "fields": [
+                {"name": "entity_id", "type": "int", "config": {}, "nullable": False, "default": 0},
+                {"name": "name", "type": "str", "config": {"length": 10}, "nullable": False, "default": "test"},
+                {"name": "age", "type": "int", "config": {}, "nullable": False, "default": 0}
+            ],
+            "identity": ["entity_id"],
+            "primary_keys": ["entity_id"],
+            "indexes": [
+                {"fields": ["name", "age"]},
+                {"name": "test_entity_27_adults", "fields": ["age"], "where": {"age__gte": 18}}
+            ],
+            "type": "Update"
+        }
+        self.__url = reverse('entity-indexes', args=['test_entity_27'])
+
+    def __create_entity(self):
+        response = self.__client.post(reverse('create-entity'), data=json.dumps(self.__entity_payload),
+                                      content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def __index_definitions(self) -> dict:
+        self.__cursor.execute("SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = 'hive' "
+                              "AND tablename = 'test_entity_27'")
+        return dict(self.__cursor.fetchall())
+
+    def test_create_entity_with_indexes(self):
+        self.__create_entity()
+        definitions = self.__index_definitions()
+        self.assertIn('USING btree (name, age)', definitions['test_entity_27_name_age_idx'])
+        self.assertIn('WHERE (age >= 18)', definitions['test_entity_27_adults'])
+        entity = Entity.objects.get(name='test_entity_27')
+        self.assertEqual([index['name'] for index in entity.indexes],
+                         ['test_entity_27_name_age_idx', 'test_entity_27_adults'])
+
+    def test_add_and_drop_index(self):
+        self.__entity_payload['indexes'] = []
+        self.__create_entity()
+        response = self.__client.post(self.__url, data=json.dumps({"fields": ["name"], "method": "hash"}),
+                                      content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {'name': 'test_entity_27_name_idx', 'fields': ['name'], 'method': 'hash',
+                                         'unique': False, 'where': []})
+        self.assertIn('USING hash (name)', self.__index_definitions()['test_entity_27_name_idx'])
+        response = self.__client.get(self.__url)
+        self.assertEqual([index['name'] for index in response.data['indexes']], ['test_entity_27_name_idx'])
+
+        response = self.__client.delete(reverse('entity-index', args=['test_entity_27', 'test_entity_27_name_idx']))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('test_entity_27_name_idx', self.__index_definitions())
+        self.assertEqual(Entity.objects.get(name='test_entity_27').indexes, [])
+        response = self.__client.delete(reverse('entity-index', args=['test_entity_27', 'test_entity_27_name_idx']))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_add_invalid_index(self):
+        self.__create_entity()
+        cases = [
+            ({"fields": ["colour"]}, 'Invalid value - the index field colour is not in the "fields" field'),
+            ({"fields": ["age"], "method": "gin"}, 'Gin indexes support str fields only'),
+            ({"fields": ["age"], "method": "hash", "unique": True}, 'Only btree indexes can be unique'),
+            ({"fields": ["name", "age"]}, 'Index test_entity_27_name_age_idx already exists'),
+            ({"fields": ["age"], "where": {"age__gte": "x"}}, 'Invalid value of index condition age: x'),
+        ]
+        for index, message in cases:
+            response = self.__client.post(self.__url, data=json.dumps(index), content_type='application/json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data, [message])
+
+    def test_add_index_named_like_another_relation(self):
+        self.__create_entity()
+        self.__cursor.execute("CREATE TABLE hive.test_entity_36 (code int)")
+        self.__cursor.execute("CREATE INDEX test_entity_36_code_idx ON hive.test_entity_36 (code)")
+        response = self.__client.post(self.__url, data=json.dumps({"name": "test_entity_36_code_idx",
+                                                                   "fields": ["age"]}),
+                                      content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, ['Index test_entity_36_code_idx already exists'])
+        self.__cursor.execute("SELECT tablename FROM pg_indexes WHERE indexname = 'test_entity_36_code_idx'")
+        self.assertEqual(self.__cursor.fetchall(), [('test_entity_36',)])
+
+    def tearDown(self):
+        # the entities created through the API are rolled back, the cache must not keep them
+        apps.get_app_config('hive').base_container.repository.entity_cache().clear()
+        self.__client.credentials()
+        self.__cursor.close()
+        super().tearDown()
@@ -0,0 +1,105 @@
+import json
+import os
+import pathlib
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from dotenv import load_dotenv
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from hive.entity.entity_type_model import EntityType
+from hive.repository.entity_repository import EntityRepository
+from hive.service.dto.request_data import RequestData
+
+project_dir = pathlib.Path(__file__).parent.resolve().parent.parent
+env_file = project_dir / '.env'
+load_dotenv(env_file)
+
+
+class TestListStorageController(TestCase):
+
+    def setUp(self):
+        self.__client = APIClient()
+        self.__cursor = connection.cursor()
+        payload = {
+            'username': os.environ.get('HIVE_USER'),
+            'password': os.environ.get('HIVE_PASS')
+        }
+        token_res = self.__client.post(reverse('token_obtain_pair'), data=payload)
+        token = token_res.data.get('access')
+        self.__client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        entity_payload = {"name": "test_entity_23",
+                          "fields": [
+                              {"name": "entity_id", "type": "int", "config": {}, "nullable": False, "default": 0},
+                              {"name": "name", "type": "str", "config": {"length": 10}, "nullable": False,
+                               "default": "test"},
+                              {"name": "price", "type": "money", "config": {}, "nullable": False}],
+                          "identity": ["entity_id"],
+                          "primary_keys": ["entity_id"],
+                          "type": "Update"}
+        EntityRepository().create(RequestData(entity_payload), EntityType(2, 'Update', 'UpdateEntityType'))
+        self.__cursor.execute("CREATE TABLE hive.test_entity_23 (entity_id int NOT NULL, name varchar(10) NOT NULL,"
+                              " price int NOT NULL, PRIMARY KEY (entity_id))")
+        # money is stored in integer cents, the way the money field type encodes it
+        self.__cursor.execute("INSERT INTO hive.test_entity_23 SELECT i, 'name_' || (i % 3), i * 100 "
+                              "FROM generate_series(1, 10) AS i")
+        self.__cursor.execute("INSERT INTO hive.test_entity_23 VALUES (11, 'na%me', 1100)")
+        self.__url = reverse('create-record', args=['test_entity_23'])
+
+    def __get(self, parameters: dict):
+        response = self.__client.get(self.__url, data=parameters)
+        return response.status_code, json.loads(response.content)
+
+    def test_list_with_keyset_pagination(self):
+        ids = []
+        parameters = {'limit': 4, 'fields': 'entity_id'}
+        while True:
+            status_code, page = self.__get(parameters)
+            self.assertEqual(status_code, status.HTTP_200_OK)
+            ids.extend(record['entity_id'] for record in page['records'])
+            if page['next'] is None:
+                break
+            parameters['after'] = page['next']
+        self.assertEqual(ids, list(range(1, 12)))
+
+    def test_list_with_filters(self):
+        _, page = self.__get({'name': 'name_1', 'entity_id__gt': '1', 'fields': 'entity_id,price'})
+        self.assertEqual(page, {'records': [{'entity_id': 4, 'price': 400}, {'entity_id': 7, 'price': 700},
+                                            {'entity_id': 10, 'price': 1000}], 'next': None})
+        _, page = self.__get({'entity_id__in': '2,5,42', 'fields': 'entity_id'})
+        self.assertEqual(page['records'], [{'entity_id': 2}, {'entity_id': 5}])
+        _, page = self.__get({'price__gte': '9', 'price__lt': '11', 'fields': 'entity_id'})
+        self.assertEqual(page['records'], [{'entity_id': 9}, {'entity_id': 10}])
+        _, page = self.__get({'name__prefix': 'na%', 'fields': 'entity_id'})
+        self.assertEqual(page['records'], [{'entity_id': 11}])
+
+    def test_list_rendered_by_postgres(self):
+        parameters = {'limit': 4, 'name__prefix': 'name_', 'fields': 'price,name'}
+        while True:
+            page = self.__get(parameters)
+            self.assertEqual(self.__get(dict(parameters, render='postgres')), page)
+            if page[1]['next'] is None:
+                break
+            parameters['after'] = page[1]['next']
+        self.assertEqual(page[1]['records'][-1], {'price': 1000, 'name': 'name_1'})
+
+    def test_list_with_invalid_filters(self):
+        status_code, content = self.__get({'colour': 'red'})
+        self.assertEqual((status_code, content), (status.HTTP_400_BAD_REQUEST, ['Unknown field: colour']))
+        status_code, content = self.__get({'name__like': 'a'})
+        self.assertEqual((status_code, content), (status.HTTP_400_BAD_REQUEST, ['Unknown filter operator: like']))
+        status_code, content = self.__get({'entity_id__prefix': '1'})
+        self.assertEqual(content, ['Prefix filter is not supported for field: entity_id'])
+        status_code, content = self.__get({'entity_id': 'x'})
+        self.assertEqual(content, ['Invalid value of entity_id: x'])
+        status_code, content = self.__get({'limit': '5000'})
+        self.assertEqual(content, ['Limit must be between 1 and 1000.'])
+        status_code, content = self.__get({'after': 'not-a-cursor'})
+        self.assertEqual((status_code, content), (status.HTTP_400_BAD_REQUEST, ['Invalid cursor.']))
+
+    def tearDown(self):
+        self.__client.credentials()
+        self.__cursor.close()
+        super().tearDown()
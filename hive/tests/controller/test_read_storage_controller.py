@@ -0,0 +1,138 @@
+import json
+import os
+import pathlib
+
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from dotenv import load_dotenv
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from hive.entity.entity_type_model import EntityType
+from hive.repository.entity_repository import EntityRepository
+from hive.service.dto.request_data import RequestData
+
+project_dir = pathlib.Path(__file__).parent.resolve().parent.parent
+env_file = project_dir / '.env'
+load_dotenv(env_file)
+
+
+class TestReadStorageController(TestCase):
+
+    def setUp(self):
+        self.__client = APIClient()
+        self.__cursor = connection.cursor()
+        payload = {
+            'username': os.environ.get('HIVE_USER'),
+            'password': os.environ.get('HIVE_PASS')
+        }
+        token_res = self.__client.post(reverse('token_obtain_pair'), data=payload)
+        token = token_res.data.get('access')
+        self.__client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        entity_payload = {"name": "test_entity_22",
+                          "fields": [
+                              {"name": "entity_id", "type": "int", "config": {}, "nullable": False, "default": 0},
+                              {"name": "code", "type": "str", "config": {"length": 10}, "nullable": False,
+                               "default": "test"},
+                              {"name": "price", "type": "money", "config": {}, "nullable": False}],
+                          "identity": ["entity_id", "code"],
+                          "primary_keys": ["entity_id", "code"],
+                          "type": "Update"}
+        EntityRepository().create(RequestData(entity_payload), EntityType(2, 'Update', 'UpdateEntityType'))
+        # money is stored in integer cents, the way the money field type encodes it
+        self.__cursor.execute("CREATE TABLE hive.test_entity_22 (entity_id int NOT NULL, code varchar(10) NOT NULL,"
+                              " price int NOT NULL, PRIMARY KEY (entity_id, code))")
+        self.__cursor.execute("INSERT INTO hive.test_entity_22 VALUES (1, 'a', 10000), (1, 'b', 25000), (2, 'a', 500)")
+
+    def test_get_record(self):
+        response = self.__client.get(reverse('read-record', args=['test_entity_22', '1/b']))
+        self.assertContains(response, '{"entity_id": 1, "code": "b", "price": 25000}',
+                            status_code=status.HTTP_200_OK)
+
+    def test_get_record_with_selected_fields(self):
+        response = self.__client.get(reverse('read-record', args=['test_entity_22', '2/a']) + '?fields=price')
+        self.assertContains(response, '{"price": 500}', status_code=status.HTTP_200_OK)
+
+    def test_get_record_rendered_by_postgres(self):
+        url = reverse('read-record', args=['test_entity_22', '1/b'])
+        response = self.__client.get(url, data={'render': 'postgres'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content), json.loads(self.__client.get(url).content))
+        response = self.__client.get(reverse('read-record', args=['test_entity_22', '3/a']),
+                                     data={'render': 'postgres'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_rendered_by_postgres_on_created_entity(self):
+        entity_payload = {"name": "test_entity_37",
+                          "fields": [
+                              {"name": "entity_id", "type": "int", "config": {}, "nullable": False, "default": 0},
+                              {"name": "name", "type": "str", "config": {"length": 10}, "nullable": True},
+                              {"name": "price", "type": "money", "config": {}, "nullable": False},
+                              {"name": "created", "type": "date", "config": {}, "nullable": True}],
+                          "identity": ["entity_id"],
+                          "primary_keys": ["entity_id"],
+                          "type": "Update"}
+        response = self.__client.post(reverse('create-entity'), data=json.dumps(entity_payload),
+                                      content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # the price is written in cents and the date field is an SQL date, the way the field types store them
+        self.__cursor.execute("INSERT INTO hive.test_entity_37 VALUES (1, 'fir\"st', 1250, '2023-05-01'), "
+                              "(2, NULL, 300, NULL)")
+
+        for url in (reverse('read-record', args=['test_entity_37', '1']),
+                    reverse('read-record', args=['test_entity_37', '2']),
+                    reverse('create-record', args=['test_entity_37']),
+                    reverse('export-records', args=['test_entity_37'])):
+            with self.subTest(url=url):
+                expected = self.__content(self.__client.get(url))
+                self.assertEqual(self.__content(self.__client.get(url, data={'render': 'postgres'})), expected)
+        self.assertEqual(self.__content(self.__client.get(reverse('read-record', args=['test_entity_37', '1']))),
+                         {"entity_id": 1, "name": "fir\"st", "price": 1250, "created": "2023-05-01 00:00:00"})
+
+    @staticmethod
+    def __content(response):
+        if response.streaming:
+            lines = b''.join(response.streaming_content).decode().splitlines()
+            return sorted(map(json.loads, lines), key=lambda record: record['entity_id'])
+        return json.loads(response.content)
+
+    def test_get_record_not_found(self):
+        response = self.__client.get(reverse('read-record', args=['test_entity_22', '3/a']))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_record_with_invalid_key(self):
+        response = self.__client.get(reverse('read-record', args=['test_entity_22', 'x/a']))
+        self.assertContains(response, 'Invalid value of primary key entity_id: x',
+                            status_code=status.HTTP_400_BAD_REQUEST)
+        response = self.__client.get(reverse('read-record', args=['test_entity_22', '1']))
+        self.assertContains(response, 'Primary key must have values for: entity_id, code',
+                            status_code=status.HTTP_400_BAD_REQUEST)
+
+    def test_multiget_records(self):
+        payload = {"keys": [[2, "a"], {"entity_id": 1, "code": "a"}, [3, "a"], [2, "a"]],
+                   "fields": ["code", "price"]}
+        # authentication, entity and a single query for every key
+        with self.assertNumQueries(3):
+            response = self.__client.post(reverse('multiget-records', args=['test_entity_22']),
+                                          data=json.dumps(payload), content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), {"records": [{"code": "a", "price": 500},
+                                                                    {"code": "a", "price": 10000},
+                                                                    None,
+                                                                    {"code": "a", "price": 500}]})
+
+    def test_multiget_with_unknown_field(self):
+        payload = {"keys": [[1, "a"]], "fields": ["colour"]}
+        response = self.__client.post(reverse('multiget-records', args=['test_entity_22']),
+                                      data=json.dumps(payload), content_type='application/json')
+        self.assertContains(response, 'Unknown field: colour', status_code=status.HTTP_400_BAD_REQUEST)
+
+    def tearDown(self):
+        # the entities created through the API are rolled back, the cache must not keep them
+        apps.get_app_config('hive').base_container.repository.entity_cache().clear()
+        self.__client.credentials()
+        self.__cursor.close()
+        super().tearDown()
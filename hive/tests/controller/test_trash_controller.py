@@ -0,0 +1,119 @@
+import json
+import os
+import pathlib
+
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from dotenv import load_dotenv
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from hive.entity.entity_model import Entity
+
+project_dir = pathlib.Path(__file__).parent.resolve().parent.parent
+env_file = project_dir / '.env'
+load_dotenv(env_file)
+
+
+class TestTrashController(TestCase):
+
+    def setUp(self):
+        self.__client = APIClient()
+        self.__cursor = connection.cursor()
+        payload = {
+            'username': os.environ.get('HIVE_USER'),
+            'password': os.environ.get('HIVE_PASS')
+        }
+        token_res = self.__client.post(reverse('token_obtain_pair'), data=payload)
+        token = token_res.data.get('access')
+        self.__client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        self.__entity_payload = {
+            "name": "test_entity_32",
+            "fields": [
+                {"name": "entity_id", "type": "int", "config": {}, "nullable": False, "default": 0},
+                {"name": "name", "type": "str", "config": {"length": 10}, "nullable": False, "default": "test"}
+            ],
+            "identity": ["entity_id"],
+            "primary_keys": ["entity_id"],
+            "partitioning": {"type": "hash", "partitions": 2},
+            "type": "Update"
+        }
+        self.__create_entity()
+        self.__cursor.execute("INSERT INTO hive.test_entity_32 SELECT i, 'name_' || i FROM generate_series(1, 20) i")
+        self.__purge_service = apps.get_app_config('hive').base_container.purge_service()
+
+    def tearDown(self):
+        apps.get_app_config('hive').base_container.repository.entity_cache().clear()
+
+    def __create_entity(self):
+        response = self.__client.post(reverse('create-entity'), data=json.dumps(self.__entity_payload),
+                                      content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def __tables(self, schema: str) -> list:
+        self.__cursor.execute("SELECT c.relname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+                              "WHERE n.nspname = %s AND c.relname LIKE 'test_entity_32%%' AND c.relkind IN ('r', 'p') "
+                              "ORDER BY c.relname", [schema])
+        return [row[0] for row in self.__cursor.fetchall()]
+
+    def __trash(self):
+        return self.__client.delete(reverse('delete-entity', args=['test_entity_32']) + '?mode=trash')
+
+    def test_trash_entity(self):
+        response = self.__trash()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['trash']['status'], 'pending')
+        self.assertFalse(Entity.objects.filter(name='test_entity_32').exists())
+        self.assertEqual(self.__tables('hive'), [])
+        table_name = response.data['trash']['table_name']
+        self.assertEqual(self.__tables('hive_trash'), [table_name, table_name + '_0', table_name + '_1'])
+        self.__cursor.execute(f'SELECT count(*) FROM hive_trash."{table_name}"')
+        self.assertEqual(self.__cursor.fetchone()[0], 20)
+        # the name is free again right away
+        self.__create_entity()
+
+    def test_trash_same_entity_twice(self):
+        first = self.__trash().data['trash']['table_name']
+        self.__create_entity()
+        response = self.__trash()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        second = response.data['trash']['table_name']
+        self.assertEqual(len(self.__tables('hive_trash')), 6)
+        # the indexes and the key constraints moved with new names, none of them keeps the name of the entity
+        self.__cursor.execute("SELECT count(*) FROM pg_indexes WHERE schemaname = 'hive_trash' "
+                              "AND indexname LIKE 'test_entity_32%%' AND indexname NOT LIKE %s "
+                              "AND indexname NOT LIKE %s", [first[:53] + '_i%', second[:53] + '_i%'])
+        self.assertEqual(self.__cursor.fetchone()[0], 0)
+        self.__cursor.execute("SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'",
+                              [f'hive_trash."{second}"'])
+        self.assertTrue(self.__cursor.fetchone()[0].startswith(second[:53] + '_i'))
+
+    def test_purge_trashed_table(self):
+        trash_id = self.__trash().data['trash']['id']
+
+        purged = self.__purge_service.purge()
+
+        self.assertEqual([trashed_table.id for trashed_table in purged], [trash_id])
+        self.assertEqual(self.__tables('hive_trash'), [])
+        response = self.__client.get(reverse('trashed-table', args=[trash_id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'purged')
+        self.assertIsNotNone(response.data['purged_at'])
+        self.assertEqual(self.__purge_service.purge(), [])
+
+    def test_list_trashed_tables(self):
+        trash_id = self.__trash().data['trash']['id']
+        response = self.__client.get(reverse('trash'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([table['id'] for table in response.data['tables']], [trash_id])
+        self.assertEqual(self.__client.get(reverse('trashed-table', args=[trash_id + 1])).status_code,
+                         status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_delete_mode(self):
+        response = self.__client.delete(reverse('delete-entity', args=['test_entity_32']) + '?mode=later')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(Entity.objects.filter(name='test_entity_32').exists())
@@ -0,0 +1,75 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import TestCase
+
+from hive.db.postgresql.base import DatabaseWrapper
+
+
+class TestPooledDatabaseWrapper(TestCase):
+
+    def setUp(self):
+        self.__settings = {**connection.settings_dict,
+                           'OPTIONS': {'pool': {'min_size': 1, 'max_size': 1, 'max_lifetime': 60}}}
+
+    def tearDown(self):
+        DatabaseWrapper.close_pools(connection.settings_dict['NAME'])
+
+    def test_connections_are_reused(self):
+        wrapper = DatabaseWrapper(self.__settings, alias='pool_test')
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            pid = cursor.fetchone()[0]
+        wrapper.close()
+        self.assertIsNone(wrapper.connection)
+
+        other = DatabaseWrapper(self.__settings, alias='pool_test')
+        with other.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            self.assertEqual(cursor.fetchone()[0], pid)
+        self.assertIs(other.pool, wrapper.pool)
+
+        metrics = other.get_pool_metrics()
+        self.assertEqual(metrics['pool_max'], 1)
+        self.assertEqual(metrics['pool_used'], 1)
+        self.assertEqual(metrics['saturation'], 1)
+        self.assertFalse(metrics['pgbouncer'])
+        other.close()
+        self.assertEqual(other.get_pool_metrics()['pool_used'], 0)
+
+    def test_open_transaction_is_rolled_back_on_return(self):
+        wrapper = DatabaseWrapper(self.__settings, alias='pool_test')
+        wrapper.set_autocommit(False)
+        with wrapper.cursor() as cursor:
+            cursor.execute("CREATE TABLE hive.test_entity_33 (entity_id int)")
+        wrapper.close()
+
+        other = DatabaseWrapper(self.__settings, alias='pool_test')
+        with other.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('hive.test_entity_33') IS NULL")
+            self.assertTrue(cursor.fetchone()[0])
+        other.close()
+
+    def test_pgbouncer_mode(self):
+        self.__settings['OPTIONS'] = {**self.__settings['OPTIONS'], 'pgbouncer': True, 'prepare_threshold': 5}
+        wrapper = DatabaseWrapper(self.__settings, alias='pool_test')
+        params = wrapper.get_connection_params()
+        self.assertIsNone(params['prepare_threshold'])
+        self.assertNotIn('pool', params)
+        self.assertNotIn('pgbouncer', params)
+        with self.assertRaises(ImproperlyConfigured):
+            wrapper.get_direct_connection_params()
+
+        self.__settings['OPTIONS']['direct'] = {'host': 'postgres.internal', 'port': 5433}
+        wrapper = DatabaseWrapper(self.__settings, alias='pool_test')
+        self.assertNotIn('direct', wrapper.get_connection_params())
+        params = wrapper.get_direct_connection_params()
+        self.assertEqual((params['host'], params['port']), ('postgres.internal', 5433))
+        self.assertIsNone(params['prepare_threshold'])
+
+    def test_without_pool(self):
+        wrapper = DatabaseWrapper({**connection.settings_dict, 'OPTIONS': {}}, alias='pool_test')
+        self.assertIsNone(wrapper.pool)
+        self.assertEqual(wrapper.get_pool_metrics(), {})
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        wrapper.close()
@@ -0,0 +1,48 @@
+from django.test import TestCase
+from rest_framework import serializers
+
+from hive.entity_field_type.datatime_entity_field_type import DateTimeEntityFieldType
+from hive.entity_field_type.float_entity_field_type import FloatEntityFieldType
+from hive.entity_field_type.int_entity_field_type import IntEntityFieldType
+from hive.entity_field_type.money_field_type import MoneyFieldType
+from hive.entity_field_type.string_entity_field_type import StringEntityFieldType
+
+
+class TestEncodeValidateMany(TestCase):
+
+    def test_int_many(self):
+        int_field_type = IntEntityFieldType()
+        config = {"min": 0, "max": 100}
+        values = int_field_type.encode_many(['1', 2, 3.0], config)
+        self.assertEqual(values, [1, 2, 3])
+        int_field_type.validate_many(values, config)
+        with self.assertRaisesMessage(serializers.ValidationError, "Value is out of range."):
+            int_field_type.validate_many([1, 101], config)
+        with self.assertRaisesMessage(serializers.ValidationError, "Value: a is not an integer."):
+            int_field_type.validate_many([1, 'a'], config)
+
+    def test_money_many(self):
+        money_field_type = MoneyFieldType()
+        values = money_field_type.encode_many(['39,99', '23,345.57', '12345'], {})
+        self.assertEqual(values, [3999, 2334557, 1234500])
+        money_field_type.validate_many(values, {})
+
+    def test_float_many(self):
+        float_field_type = FloatEntityFieldType()
+        values = float_field_type.encode_many([1, '2.5'], {})
+        self.assertEqual(values, [1.0, 2.5])
+        float_field_type.validate_many(values, {})
+        with self.assertRaises(ValueError):
+            float_field_type.validate_many([1.0, 2], {})
+
+    def test_string_many(self):
+        string_field_type = StringEntityFieldType()
+        string_field_type.validate_many(['a', 'bc'], {"max_length": 2})
+        with self.assertRaisesMessage(ValueError, "Value is too long."):
+            string_field_type.validate_many(['a', 'abc'], {"max_length": 2})
+
+    def test_default_many_falls_back_to_single_value(self):
+        datetime_field_type = DateTimeEntityFieldType()
+        self.assertEqual(datetime_field_type.encode_many([None, ''], {}), [None, None])
+        with self.assertRaises(serializers.ValidationError):
+            datetime_field_type.validate_many(['2023-01-01 10:00:00', 'now'], {})
@@ -0,0 +1,87 @@
+from django.db import connection
+from django.test import TestCase
+from psycopg import sql
+
+from hive.entity.entity_type_model import EntityType
+from hive.entity_field_type.int_entity_field_type import IntEntityFieldType
+from hive.entity_field_type.ref_field_type import RefFieldType
+from hive.entity_field_type.string_entity_field_type import StringEntityFieldType
+from hive.repository.cached_entity_repository import CachedEntityRepository
+from hive.repository.entity_cache import EntityCache
+from hive.repository.entity_repository import EntityRepository
+from hive.repository.reference_cache import ReferenceCache
+from hive.repository.storage_repository import StorageRepository
+from hive.service.dto.request_data import RequestData
+
+
+class TestRefFieldType(TestCase):
+
+    def setUp(self):
+        self.__cursor = connection.cursor()
+        entity_payload = {"name": "test_entity_21",
+                          "fields": [
+                              {"name": "brand_id", "type": "int", "config": {}, "nullable": False, "default": 0},
+                              {"name": "name", "type": "str", "config": {"length": 10}, "nullable": False,
+                               "default": "test"}],
+                          "identity": ["brand_id"],
+                          "primary_keys": ["brand_id"],
+                          "type": "Update"}
+        EntityRepository().create(RequestData(entity_payload), EntityType(2, 'Update', 'UpdateEntityType'))
+        self.__cursor.execute(sql.SQL("CREATE TABLE hive.test_entity_21 (brand_id int NOT NULL, "
+                                      "name varchar(10) NOT NULL, PRIMARY KEY (brand_id))"))
+        self.__cursor.execute("INSERT INTO hive.test_entity_21 VALUES (1, 'first'), (2, 'second'), (3, 'third')")
+        self.__config = {"storage": "test_entity_21", "field": "brand_id"}
+        # the entity definition is cached the way the application reads it
+        self.__entity_repository = CachedEntityRepository(EntityCache())
+        self.__entity_repository.get_by_name("test_entity_21")
+
+    def __ref_field_type(self, reference_cache: ReferenceCache) -> RefFieldType:
+        return RefFieldType(storage_repository=StorageRepository(), entity_repository=self.__entity_repository,
+                            schema='hive', reference_cache=reference_cache,
+                            field_types={'int': IntEntityFieldType(), 'str': StringEntityFieldType()})
+
+    def test_encode_many_resolves_references_with_one_query(self):
+        ref_field_type = self.__ref_field_type(ReferenceCache(size=0, ttl=0))
+        values = [{"brand_id": 1}, {"brand_id": 2}, {"brand_id": 1}, 3]
+        with self.assertNumQueries(1):
+            self.assertEqual(ref_field_type.encode_many(values, self.__config), [1, 2, 1, 3])
+        with self.assertNumQueries(1):
+            encoded = ref_field_type.encode_many([{"brand_id": 1, "name": "first"},
+                                                  {"brand_id": 2, "name": "second"}], self.__config)
+        self.assertEqual(encoded, [1, 2])
+
+    def test_encode_many_normalizes_key_values(self):
+        reference_cache = ReferenceCache(size=10, ttl=60)
+        ref_field_type = self.__ref_field_type(reference_cache)
+        with self.assertNumQueries(1):
+            self.assertEqual(ref_field_type.encode_many(["1", {"brand_id": "2"}, 1], self.__config), [1, 2, 1])
+        with self.assertNumQueries(0):
+            self.assertEqual(ref_field_type.encode("2", self.__config), 2)
+
+    def test_encode_missing_reference(self):
+        ref_field_type = self.__ref_field_type(ReferenceCache(size=0, ttl=0))
+        with self.assertRaisesMessage(ValueError, "Referenced record {'brand_id': 4} does not exist"):
+            ref_field_type.encode_many([{"brand_id": 1}, {"brand_id": 4}], self.__config)
+        with self.assertRaisesMessage(ValueError, "Referenced record {'brand_id': 1, 'name': 'second'}"):
+            ref_field_type.encode({"brand_id": 1, "name": "second"}, self.__config)
+
+    def test_resolved_references_are_cached(self):
+        reference_cache = ReferenceCache(size=2, ttl=60)
+        ref_field_type = self.__ref_field_type(reference_cache)
+        ref_field_type.encode_many([1, 2, 3], self.__config)
+        with self.assertNumQueries(0):
+            self.assertEqual(ref_field_type.encode_many([2, 3], self.__config), [2, 3])
+        with self.assertNumQueries(1):
+            self.assertEqual(ref_field_type.encode(1, self.__config), 1)
+        reference_cache.invalidate('test_entity_21')
+        with self.assertNumQueries(1):
+            ref_field_type.encode(1, self.__config)
+
+    def test_decode_many(self):
+        ref_field_type = self.__ref_field_type(ReferenceCache(size=0, ttl=0))
+        self.assertEqual(ref_field_type.decode_many([2, 5], self.__config),
+                         [{"brand_id": 2, "name": "second"}, {}])
+
+    def tearDown(self):
+        self.__cursor.close()
+        super().tearDown()
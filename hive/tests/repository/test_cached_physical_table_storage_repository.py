@@ -0,0 +1,51 @@
+from django.db import connection
+from django.test import TestCase
+
+from hive.di.repository_container import RepositoryContainer
+
+
+class TestCachedPhysicalTableStorageRepository(TestCase):
+
+    def setUp(self):
+        repository_container = RepositoryContainer()
+        self.__repository = repository_container.physical_table_storage_repository()
+        self.__schema_snapshot = repository_container.schema_snapshot()
+        self.__cursor = connection.cursor()
+        self.__cursor.execute("CREATE TABLE hive.test_entity_31 (entity_id int NOT NULL, name varchar(10), "
+                              "PRIMARY KEY (entity_id))")
+
+    def test_catalog_probes(self):
+        self.assertTrue(self.__repository.table_exists('hive', 'test_entity_31'))
+        self.assertFalse(self.__repository.table_exists('hive', 'test_entity_31_missing'))
+        self.assertFalse(self.__repository.table_exists('public', 'test_entity_31'))
+        self.assertEqual(self.__repository.get_existing_columns('hive', 'test_entity_31'), ['entity_id', 'name'])
+        self.assertEqual(self.__repository.describe_table('hive', 'test_entity_31'),
+                         {'entity_id': 'integer', 'name': 'character varying(10)'})
+        self.assertIsNone(self.__repository.describe_table('hive', "test_entity_31' OR '1' = '1"))
+
+    def test_describe_schema(self):
+        self.__cursor.execute("ALTER TABLE hive.test_entity_31 DROP COLUMN name")
+        with self.assertNumQueries(1):
+            tables = self.__repository.describe_schema('hive')
+        self.assertEqual(tables['test_entity_31'], {'entity_id': 'integer'})
+
+    def test_ddl_drops_snapshot(self):
+        self.__schema_snapshot.load({'test_entity_31': {'entity_id': 'integer'}}, 0)
+        self.__repository.execute("ALTER TABLE hive.test_entity_31 ADD COLUMN age int")
+        self.assertFalse(self.__schema_snapshot.is_loaded())
+        # inside a transaction the catalog is always read, uncommitted DDL must not reach the snapshot
+        self.assertEqual(self.__repository.get_existing_columns('hive', 'test_entity_31'), ['entity_id', 'name', 'age'])
+        self.assertFalse(self.__schema_snapshot.is_loaded())
+
+    def test_snapshot_lookup(self):
+        generation = self.__schema_snapshot.get_generation()
+        self.__schema_snapshot.load({'a': {'id': 'integer'}}, generation)
+        self.assertEqual(self.__schema_snapshot.lookup('a'), (True, {'id': 'integer'}))
+        self.assertEqual(self.__schema_snapshot.lookup('b'), (True, None))
+
+        self.__schema_snapshot.invalidate('b')
+        self.assertEqual(self.__schema_snapshot.lookup('b'), (False, None))
+        self.__schema_snapshot.put('b', {'id': 'integer'}, generation)
+        self.assertEqual(self.__schema_snapshot.lookup('b'), (False, None))
+        self.__schema_snapshot.put('b', {'id': 'integer'}, self.__schema_snapshot.get_generation())
+        self.assertEqual(self.__schema_snapshot.lookup('b'), (True, {'id': 'integer'}))
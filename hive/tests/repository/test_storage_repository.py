@@ -0,0 +1,132 @@
+import json
+
+from django.db import DatabaseError, connection, transaction
+from django.test import TestCase, TransactionTestCase
+
+from hive.di.repository_container import RepositoryContainer
+from hive.repository.statement_cache import StatementCache
+from hive.repository.storage_repository import StorageRepository
+
+
+class TestStorageRepository(TestCase):
+
+    def setUp(self):
+        repository_container = RepositoryContainer()
+        self.__storage_repository = repository_container.storage_repository()
+        self.__physical_table_storage_repository = repository_container.physical_table_storage_repository()
+        self.__cursor = connection.cursor()
+        self.__cursor.execute("CREATE TABLE hive.test_entity_35 (entity_id int NOT NULL, code varchar(3), "
+                              "name varchar(10), PRIMARY KEY (entity_id))")
+
+    def test_upsert_many_in_chunks(self):
+        self.__storage_repository.MAX_PARAMETERS = 4
+        rows = [{'entity_id': i, 'code': f'c{i}', 'name': f'name {i}'} for i in range(5)]
+        records = self.__storage_repository.upsert_many('hive', 'test_entity_35', ['entity_id', 'code', 'name'],
+                                                        rows, ['entity_id'])
+        self.assertEqual(records, rows)
+
+    def test_upsert_each_keeps_valid_rows(self):
+        query = self.__storage_repository.build_upsert_query('hive', 'test_entity_35', ['entity_id', 'code'], 1,
+                                                             ['entity_id'])
+        results = self.__storage_repository.upsert_each(query, ['entity_id', 'code'],
+                                                        [(1, 'a'), (2, 'too long'), (3, 'c')])
+        self.assertEqual(results[0], {'entity_id': 1, 'code': 'a'})
+        self.assertIsInstance(results[1], DatabaseError)
+        self.assertEqual(results[2], {'entity_id': 3, 'code': 'c'})
+        self.__cursor.execute("SELECT entity_id FROM hive.test_entity_35 ORDER BY entity_id")
+        self.assertEqual(self.__cursor.fetchall(), [(1,), (3,)])
+
+    def test_find_many_by_key_sets(self):
+        self.__cursor.execute("INSERT INTO hive.test_entity_35 VALUES (1, 'a', 'first'), (2, 'b', 'second')")
+        with self.assertNumQueries(2):
+            found = self.__storage_repository.find_many_by_key_sets(
+                'hive', 'test_entity_35', {('entity_id',): [(1,), (3,)], ('code',): [('b',)]}, ['name'])
+        self.assertEqual(found, {('entity_id',): [{'entity_id': 1, 'name': 'first'}],
+                                 ('code',): [{'code': 'b', 'name': 'second'}]})
+
+    def test_create_indexes_in_transaction(self):
+        indexes = [
+            {'name': 'test_entity_35_code', 'fields': ['code'], 'method': 'btree', 'unique': True, 'where': []},
+            {'name': 'test_entity_35_name', 'fields': ['name'], 'method': 'hash', 'unique': False, 'where': []},
+        ]
+        self.__physical_table_storage_repository.create_indexes('hive', 'test_entity_35', indexes)
+        self.__cursor.execute("SELECT indexname FROM pg_indexes WHERE schemaname = 'hive' "
+                              "AND tablename = 'test_entity_35' ORDER BY indexname")
+        self.assertEqual([row[0] for row in self.__cursor.fetchall()],
+                         ['test_entity_35_code', 'test_entity_35_name', 'test_entity_35_pkey'])
+
+    def test_drop_index_of_another_table(self):
+        self.__cursor.execute("CREATE INDEX test_entity_35_code ON hive.test_entity_35 (code)")
+        self.__physical_table_storage_repository.drop_index('hive', 'test_entity_34', 'test_entity_35_code')
+        self.assertEqual(self.__physical_table_storage_repository.get_existing_relations(
+            'hive', ['test_entity_35_code', 'test_entity_35_name']), ['test_entity_35_code'])
+        self.__physical_table_storage_repository.drop_index('hive', 'test_entity_35', 'test_entity_35_code')
+        self.assertEqual(self.__physical_table_storage_repository.get_existing_relations(
+            'hive', ['test_entity_35_code']), [])
+
+    def test_prepared_statements(self):
+        storage_repository = StorageRepository(statement_cache=StatementCache(size=10, prepare_threshold=1))
+        columns = ['entity_id', 'code', 'name']
+        for entity_id in range(3):
+            record = storage_repository.create('hive', 'test_entity_35', columns,
+                                               {'entity_id': entity_id, 'code': 'a', 'name': 'first'})
+            self.assertEqual(record, {'entity_id': entity_id, 'code': 'a', 'name': 'first'})
+        record = storage_repository.update('hive', 'test_entity_35', columns, {'name': 'second'}, {'entity_id': 2})
+        self.assertEqual(record, {'entity_id': 2, 'code': 'a', 'name': 'second'})
+        self.assertEqual(storage_repository.find_by_keys(columns, {'entity_id': 2}, 'test_entity_35', 'hive'), record)
+        self.assertEqual(storage_repository.find_by_keys(columns, {'entity_id': 5}, 'test_entity_35', 'hive'), {})
+
+        self.assertEqual(storage_repository.get_statement_metrics(),
+                         {'size': 3, 'hits': 3, 'misses': 3, 'hit_ratio': 0.5, 'prepare_threshold': 1})
+        # the insert ran three times, the second and the third execution used the prepared statement
+        self.__cursor.execute("SELECT count(*) FROM pg_prepared_statements WHERE statement LIKE 'INSERT INTO%%'")
+        self.assertEqual(self.__cursor.fetchone(), (1,))
+
+    def test_statement_cache_is_bounded(self):
+        statement_cache = StatementCache(size=1, prepare_threshold=-1)
+        self.assertEqual(statement_cache.get(('hive', 'a', (), 'select'), lambda: 'a'), ('a', False))
+        self.assertEqual(statement_cache.get(('hive', 'b', (), 'select'), lambda: 'b'), ('b', False))
+        self.assertEqual(statement_cache.get(('hive', 'b', (), 'select'), lambda: 'c'), ('b', False))
+        self.assertEqual(statement_cache.get(('hive', 'a', (), 'select'), lambda: 'd'), ('d', False))
+        statement_cache.invalidate('a')
+        self.assertEqual(statement_cache.get_metrics()['size'], 0)
+
+    def test_records_rendered_by_postgres(self):
+        self.__cursor.execute("ALTER TABLE hive.test_entity_35 ADD COLUMN created timestamp")
+        self.__cursor.execute("INSERT INTO hive.test_entity_35 VALUES (1, 'a', 'fir\"st', '2023-05-01 10:20:30'), "
+                              "(2, 'b', NULL, NULL)")
+        formats = {'created': 'YYYY-MM-DD HH24:MI:SS'}
+        record = self.__storage_repository.find_json_by_keys('hive', 'test_entity_35', {'entity_id': 1},
+                                                             ['name', 'created'], formats)
+        self.assertEqual(json.loads(record), {'name': 'fir"st', 'created': '2023-05-01 10:20:30'})
+        self.assertIsNone(self.__storage_repository.find_json_by_keys('hive', 'test_entity_35', {'entity_id': 3},
+                                                                      ['name'], formats))
+        with transaction.atomic():
+            batches = list(self.__storage_repository.stream_json('hive', 'test_entity_35', ['entity_id', 'created'],
+                                                                 1, formats))
+        self.assertEqual(sorted(json.loads(batch[0])['entity_id'] for batch in batches), [1, 2])
+        rows = self.__storage_repository.find_page_json('hive', 'test_entity_35', ['created'], [('code', 'eq', 'b')],
+                                                        ['entity_id'], None, 10, formats)
+        self.assertEqual(rows, [('{"created":null}', (2,))])
+
+
+class TestConcurrentIndexBuild(TransactionTestCase):
+    # CREATE INDEX CONCURRENTLY cannot run in the transaction of a TestCase
+    serialized_rollback = True
+
+    def setUp(self):
+        self.__physical_table_storage_repository = RepositoryContainer().physical_table_storage_repository()
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE hive.test_entity_35 (entity_id int NOT NULL, code varchar(3))")
+            cursor.execute("INSERT INTO hive.test_entity_35 VALUES (1, 'a'), (2, 'a')")
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE hive.test_entity_35")
+
+    def test_failed_build_drops_the_invalid_index(self):
+        index = {'name': 'test_entity_35_code', 'fields': ['code'], 'method': 'btree', 'unique': True, 'where': []}
+        with self.assertRaises(DatabaseError):
+            self.__physical_table_storage_repository.create_index('hive', 'test_entity_35', index)
+        self.assertEqual(self.__physical_table_storage_repository.get_existing_relations(
+            'hive', ['test_entity_35_code']), [])
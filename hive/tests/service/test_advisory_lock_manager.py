@@ -0,0 +1,54 @@
+import psycopg
+from django.db import connection, transaction
+from django.test import TestCase
+
+from hive.repository.advisory_lock_repository import AdvisoryLockRepository
+from hive.service.advisory_lock_manager import AdvisoryLockManager
+
+
+class TestAdvisoryLockManager(TestCase):
+
+    def setUp(self):
+        self.__lock_manager = AdvisoryLockManager(AdvisoryLockRepository())
+
+    def __held_advisory_locks(self) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' AND pid = pg_backend_pid()")
+            return cursor.fetchone()[0]
+
+    @staticmethod
+    def __can_lock_elsewhere(key: int) -> bool:
+        with psycopg.connect(**connection.get_connection_params()) as other_connection:
+            return other_connection.execute("SELECT pg_try_advisory_xact_lock(%s)", (key,)).fetchone()[0]
+
+    def test_migration_lock(self):
+        key = AdvisoryLockManager.ddl_key('entity')
+        options = connection.settings_dict['OPTIONS']
+        saved = dict(options)
+        try:
+            # the session lock, and the transaction lock of a connection of its own behind pgbouncer
+            for pgbouncer in (False, True):
+                options['pgbouncer'] = pgbouncer
+                with AdvisoryLockRepository.try_migration_lock(key) as locked:
+                    self.assertTrue(locked)
+                    self.assertFalse(self.__can_lock_elsewhere(key))
+                self.assertTrue(self.__can_lock_elsewhere(key))
+        finally:
+            options.clear()
+            options.update(saved)
+
+    def test_key_is_stable_and_depends_on_entity_and_primary_keys(self):
+        key = AdvisoryLockManager.key('entity', (1, 'a'))
+        self.assertEqual(key, AdvisoryLockManager.key('entity', (1, 'a')))
+        self.assertNotEqual(key, AdvisoryLockManager.key('entity', (2, 'a')))
+        self.assertNotEqual(key, AdvisoryLockManager.key('other_entity', (1, 'a')))
+        self.assertTrue(-2 ** 63 <= key < 2 ** 63)
+
+    def test_lock_per_primary_keys(self):
+        with transaction.atomic():
+            self.__lock_manager.lock('entity', [(1,), (2,), (1,)])
+            self.assertEqual(self.__held_advisory_locks(), 2)
+        metrics = self.__lock_manager.get_metrics()
+        self.assertEqual(metrics['acquisitions'], 1)
+        self.assertEqual(metrics['keys'], 2)
+        self.assertEqual(metrics['contended_acquisitions'], 0)
@@ -0,0 +1,53 @@
+from django.db import connection
+from django.test import TestCase
+from psycopg import sql
+
+from hive.di.base_container import BaseContainer
+from hive.entity.entity_type_model import EntityType
+from hive.repository.entity_repository import EntityRepository
+from hive.service.dto.request_data import RequestData
+
+
+class TestBulkLoadService(TestCase):
+
+    def setUp(self):
+        self.__cursor = connection.cursor()
+        self.__bulk_load_service = BaseContainer().bulk_load_service()
+        entity_payload = {"name": "test_entity_17",
+                          "fields": [
+                              {"name": "entity_id", "type": "int", "config": {}, "nullable": False, "default": 0},
+                              {"name": "name", "type": "str", "config": {"length": 10}, "nullable": False,
+                               "default": "test"}],
+                          "identity": ["entity_id"],
+                          "primary_keys": ["entity_id"],
+                          "type": "Update"}
+        EntityRepository().create(RequestData(entity_payload), EntityType(2, 'Update', 'UpdateEntityType'))
+        self.__cursor.execute(sql.SQL("CREATE TABLE hive.test_entity_17 (entity_id int NOT NULL, "
+                                      "name varchar(10) NOT NULL, PRIMARY KEY (entity_id))"))
+
+    def __count(self):
+        self.__cursor.execute("SELECT count(*) FROM hive.test_entity_17")
+        return self.__cursor.fetchone()[0]
+
+    def test_load_records_in_batches(self):
+        records = ({"entity_id": i % 25, "name": f"name_{i % 25}"} for i in range(30))
+        summary = self.__bulk_load_service.load('test_entity_17', records, batch_size=10)
+        self.assertEqual(summary, {'loaded': 30, 'rejected': 0})
+        self.assertEqual(self.__count(), 25)
+
+    def test_load_rejects_invalid_records(self):
+        rejected = []
+        records = [{"entity_id": 1, "name": "first"},
+                   {"entity_id": 2, "name": 1234},
+                   '{"entity_id": 3',
+                   {"entity_id": 4, "name": "test123456789"},
+                   {"entity_id": 5, "name": "fifth"}]
+        summary = self.__bulk_load_service.load('test_entity_17', records, batch_size=10,
+                                                on_reject=lambda number, record, error: rejected.append(number))
+        self.assertEqual(summary, {'loaded': 2, 'rejected': 3})
+        self.assertEqual(rejected, [2, 3, 4])
+        self.assertEqual(self.__count(), 2)
+
+    def tearDown(self):
+        self.__cursor.close()
+        super().tearDown()
@@ -0,0 +1,48 @@
+from django.test import TestCase
+
+from hive.di.base_container import BaseContainer
+from hive.entity.entity_type_model import EntityType
+from hive.repository.entity_repository import EntityRepository
+from hive.service.dto.request_data import RequestData
+
+
+class TestEntityChangeService(TestCase):
+
+    def setUp(self):
+        base_container = BaseContainer()
+        self.__entity_change_service = base_container.entity_change_service()
+        self.__entity_repository = base_container.repository.entity_repository()
+        self.__entity_cache = base_container.repository.entity_cache()
+        self.__payload = {"name": "test_entity_19",
+                          "fields": [{"name": "entity_id", "type": "int", "config": {}, "nullable": False}],
+                          "identity": ["entity_id"],
+                          "primary_keys": ["entity_id"],
+                          "type": "Update"}
+        EntityRepository().create(RequestData(self.__payload), EntityType(2, 'Update', 'UpdateEntityType'))
+
+    def test_entity_is_read_from_cache(self):
+        entity = self.__entity_repository.get_by_name('test_entity_19')
+        with self.assertNumQueries(0):
+            self.assertIs(entity, self.__entity_repository.get_by_name('test_entity_19'))
+            self.assertTrue(self.__entity_repository.is_exist('test_entity_19'))
+
+    def test_publish_invalidates_cache_and_bumps_version(self):
+        entity = self.__entity_repository.get_by_name('test_entity_19')
+        version = self.__entity_change_service.publish('test_entity_19')
+        self.assertFalse(self.__entity_cache.contains('test_entity_19'))
+        self.assertIsNot(entity, self.__entity_repository.get_by_name('test_entity_19'))
+        self.assertEqual(self.__entity_change_service.publish('test_entity_19'), version + 1)
+
+    def test_notification_invalidates_changed_entity(self):
+        self.__entity_change_service.handle('1:other_entity')
+        self.__entity_repository.get_by_name('test_entity_19')
+        self.__entity_change_service.handle('2:other_entity')
+        self.assertTrue(self.__entity_cache.contains('test_entity_19'))
+        self.__entity_change_service.handle('3:test_entity_19')
+        self.assertFalse(self.__entity_cache.contains('test_entity_19'))
+
+    def test_missed_notification_clears_cache(self):
+        self.__entity_change_service.handle('1:other_entity')
+        self.__entity_repository.get_by_name('test_entity_19')
+        self.__entity_change_service.handle('5:other_entity')
+        self.assertFalse(self.__entity_cache.contains('test_entity_19'))
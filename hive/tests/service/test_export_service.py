@@ -0,0 +1,78 @@
+import datetime
+import gzip
+import io
+import json
+import tempfile
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+from hive.di.base_container import BaseContainer
+from hive.entity.entity_type_model import EntityType
+from hive.repository.entity_repository import EntityRepository
+from hive.service.dto.request_data import RequestData
+
+
+class TestExportService(TestCase):
+
+    def setUp(self):
+        self.__cursor = connection.cursor()
+        self.__export_service = BaseContainer().export_service()
+        entity_payload = {"name": "test_entity_25",
+                          "fields": [
+                              {"name": "entity_id", "type": "int", "config": {}, "nullable": False, "default": 0},
+                              {"name": "name", "type": "str", "config": {"length": 10}, "nullable": False,
+                               "default": "test"},
+                              {"name": "price", "type": "money", "config": {}, "nullable": False},
+                              {"name": "created", "type": "date", "config": {}, "nullable": True}],
+                          "identity": ["entity_id"],
+                          "primary_keys": ["entity_id"],
+                          "type": "Update"}
+        EntityRepository().create(RequestData(entity_payload), EntityType(2, 'Update', 'UpdateEntityType'))
+        self.__cursor.execute("CREATE TABLE hive.test_entity_25 (entity_id int NOT NULL, name varchar(10) NOT NULL,"
+                              " price int NOT NULL, created date, PRIMARY KEY (entity_id))")
+        self.__cursor.execute("INSERT INTO hive.test_entity_25 SELECT i, 'name_' || i, i * 100, '2023-01-01'::date + i "
+                              "FROM generate_series(1, 25) i")
+
+    def test_export_in_batches(self):
+        chunks = list(self.__export_service.export('test_entity_25', batch_size=10))
+        self.assertEqual(len(chunks), 3)
+        records = [json.loads(line) for line in b''.join(chunks).decode().splitlines()]
+        self.assertEqual(sorted(record['entity_id'] for record in records), list(range(1, 26)))
+
+    def test_export_arrow(self):
+        chunks = list(self.__export_service.export('test_entity_25', 'arrow', batch_size=10))
+        reader = pa.ipc.open_stream(b''.join(chunks))
+        self.assertEqual(reader.schema, pa.schema([('entity_id', pa.int32()), ('name', pa.utf8()),
+                                                   ('price', pa.int64()), ('created', pa.timestamp('us'))]))
+        batches = list(reader)
+        self.assertEqual([batch.num_rows for batch in batches], [10, 10, 5])
+        table = pa.Table.from_batches(batches).sort_by('entity_id')
+        self.assertEqual(table.slice(0, 1).to_pylist(), [{'entity_id': 1, 'name': 'name_1', 'price': 100,
+                                                          'created': datetime.datetime(2023, 1, 2)}])
+
+    def test_export_parquet(self):
+        chunks = self.__export_service.export('test_entity_25', 'parquet', fields=['price'], batch_size=10)
+        parquet_file = pq.ParquetFile(io.BytesIO(b''.join(chunks)))
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+        self.assertEqual(sum(parquet_file.read().column('price').to_pylist()), 32500)
+
+    def test_export_command(self):
+        with tempfile.NamedTemporaryFile(suffix='.csv.gz') as output:
+            call_command('hive_export', 'test_entity_25', format='csv', fields='entity_id', gzip=True,
+                         output=output.name)
+            lines = gzip.decompress(output.read()).decode().splitlines()
+        self.assertEqual(lines[0], 'entity_id')
+        self.assertEqual(len(lines), 26)
+
+    def test_export_command_with_unknown_entity(self):
+        with self.assertRaisesMessage(CommandError, 'Entity test_entity_unknown does not exist.'):
+            call_command('hive_export', 'test_entity_unknown')
+
+    def tearDown(self):
+        self.__cursor.close()
+        super().tearDown()
@@ -101,3 +101,24 @@ class TestMoneyParser(TestCase):
         with self.assertRaises(FormatNotSupportedException):
             money_parser.convert(None)
 
+    def test_convert_many(self):
+        money_parser = MoneyParser()
+        result = money_parser.convert_many(['39,99', '23.345,57', '123 456 789.123', '234.5', '123.'])
+        self.assertEqual(result, [3999, 2334557, 12345678912, 23450, 12300])
+
+    def test_convert_many_without_penny(self):
+        money_parser = MoneyParser()
+        result = money_parser.convert_many(['76,873', '123 456 789.123'], append_penny=False)
+        self.assertEqual(result, [76873, 123456789])
+
+    def test_convert_many_with_invalid_value(self):
+        money_parser = MoneyParser()
+        with self.assertRaises(FormatNotSupportedException):
+            money_parser.convert_many(['39,99', None])
+
+    def test_convert_repeated_value_from_cache(self):
+        money_parser = MoneyParser()
+        money_parser.convert('98 765.432')
+        hits = MoneyParser.cache_info().hits
+        self.assertEqual(MoneyParser().convert('98 765.432'), 9876543)
+        self.assertEqual(MoneyParser.cache_info().hits, hits + 1)
@@ -0,0 +1,92 @@
+import copy
+import datetime
+
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase
+from rest_framework import serializers
+
+
+class TestPartitionService(TestCase):
+
+    def setUp(self):
+        self.__cursor = connection.cursor()
+        container = apps.get_app_config('hive').base_container
+        self.__create_service = container.create_service()
+        self.__partition_service = container.partition_service()
+        self.__entity_payload = {
+            "name": "test_entity_28",
+            "fields": [
+                {"name": "entity_id", "type": "int", "config": {}, "nullable": False, "default": 0},
+                {"name": "created", "type": "date", "config": {}, "nullable": False},
+                {"name": "name", "type": "str", "config": {"length": 10}, "nullable": False, "default": "test"}
+            ],
+            "identity": ["entity_id", "created"],
+            "primary_keys": ["entity_id", "created"],
+            "partitioning": {"type": "range", "field": "created", "interval": "month", "premake": 2},
+            "type": "Update"
+        }
+
+    def tearDown(self):
+        apps.get_app_config('hive').base_container.repository.entity_cache().clear()
+
+    def __partitions(self) -> list:
+        self.__cursor.execute("SELECT child.relname FROM pg_inherits "
+                              "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                              "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                              "WHERE parent.relname = 'test_entity_28' ORDER BY child.relname")
+        return [row[0] for row in self.__cursor.fetchall()]
+
+    def __create_entity(self, changes: dict):
+        payload = copy.deepcopy(self.__entity_payload)
+        payload.update(changes)
+        return self.__create_service.create_entity(payload)
+
+    def test_create_range_partitioned_entity(self):
+        entity = self.__create_entity({})
+        start = datetime.date.today().replace(day=1)
+        self.assertEqual(entity.partitioning,
+                         {'type': 'range', 'field': 'created', 'interval': 'month', 'premake': 2})
+        self.assertIn('test_entity_28_default', self.__partitions())
+        self.assertIn(f'test_entity_28_p{start:%Y%m%d}', self.__partitions())
+        self.assertEqual(len(self.__partitions()), 4)
+
+        self.__cursor.execute("INSERT INTO hive.test_entity_28 VALUES (1, %s, 'a') RETURNING tableoid::regclass",
+                              [datetime.date.today()])
+        self.assertEqual(self.__cursor.fetchone()[0], f'hive.test_entity_28_p{start:%Y%m%d}')
+
+    def test_create_all_partitions_pre_creates_upcoming_periods(self):
+        self.__create_entity({})
+        created = self.__partition_service.create_all_partitions(datetime.date(2099, 11, 15))
+        self.assertEqual(created['test_entity_28'], ['test_entity_28_p20991101', 'test_entity_28_p20991201',
+                                                     'test_entity_28_p21000101'])
+        self.assertEqual(len(self.__partitions()), 7)
+        # existing partitions are skipped
+        self.__partition_service.create_all_partitions(datetime.date(2099, 11, 15))
+        self.assertEqual(len(self.__partitions()), 7)
+
+    def test_create_hash_partitioned_entity(self):
+        self.__create_entity({"partitioning": {"type": "hash", "partitions": 4}})
+        self.assertEqual(self.__partitions(), [f'test_entity_28_h{i}' for i in range(4)])
+
+        self.__cursor.execute("INSERT INTO hive.test_entity_28 SELECT i, CURRENT_DATE, 'a' "
+                              "FROM generate_series(1, 100) i")
+        self.__cursor.execute("SELECT count(*) FROM hive.test_entity_28_h0")
+        self.assertGreater(self.__cursor.fetchone()[0], 0)
+
+    def test_create_entity_with_invalid_partitioning(self):
+        invalid = [
+            {"type": "list"},
+            {"type": "range", "field": "name"},
+            {"type": "range", "field": "created", "interval": "hour"},
+            {"type": "range", "field": "created", "premake": -1},
+            {"type": "hash", "partitions": 1},
+        ]
+        for partitioning in invalid:
+            with self.subTest(partitioning=partitioning):
+                with self.assertRaises(serializers.ValidationError):
+                    self.__create_entity({"partitioning": partitioning})
+
+    def test_range_partitioning_field_must_be_in_primary_keys(self):
+        with self.assertRaises(serializers.ValidationError):
+            self.__create_entity({"identity": ["entity_id"], "primary_keys": ["entity_id"]})
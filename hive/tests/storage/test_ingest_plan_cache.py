@@ -0,0 +1,46 @@
+from django.test import TestCase
+from rest_framework import serializers
+
+from hive.di.base_container import BaseContainer
+from hive.entity.entity_model import Entity
+
+
+class TestIngestPlanCache(TestCase):
+
+    def setUp(self):
+        base_container = BaseContainer()
+        self.__update_storage = base_container.update_storage()
+        self.__ingest_plan_cache = base_container.ingest_plan_cache()
+        self.__entity = self.__prepare_entity(entity_id=1)
+
+    @staticmethod
+    def __prepare_entity(entity_id: int) -> Entity:
+        return Entity(id=entity_id, name='test_entity_18',
+                      fields=[{"name": "entity_id", "type": "int", "config": {"min": 0, "max": 100},
+                               "nullable": False},
+                              {"name": "money", "type": "money", "config": {}, "nullable": True}],
+                      identity=['entity_id'], primary_keys=['entity_id'])
+
+    def test_plan_is_compiled_once(self):
+        plan = self.__update_storage.configure(self.__entity)
+        self.assertIs(plan, self.__update_storage.configure(self.__prepare_entity(entity_id=1)))
+        self.assertEqual(plan.columns, ['entity_id', 'money'])
+        self.assertEqual(plan.not_null_fields, ['entity_id'])
+
+    def test_plan_is_recompiled_after_invalidation_or_recreation(self):
+        plan = self.__update_storage.configure(self.__entity)
+        self.assertIsNot(plan, self.__update_storage.configure(self.__prepare_entity(entity_id=2)))
+        plan = self.__update_storage.configure(self.__entity)
+        self.__ingest_plan_cache.invalidate(self.__entity.name)
+        self.assertIsNot(plan, self.__update_storage.configure(self.__entity))
+
+    def test_plan_encodes_and_validates_record(self):
+        plan = self.__update_storage.configure(self.__entity)
+        record = plan.process({"entity_id": 10, "money": "12,50"})
+        self.assertEqual(record, {"entity_id": 10, "money": 1250})
+        self.assertEqual(plan.get_primary_keys(record), (10,))
+        self.assertEqual(plan.get_values(record), (10, 1250))
+        with self.assertRaises(serializers.ValidationError):
+            plan.process({"entity_id": 101, "money": "1"})
+        with self.assertRaises(ValueError):
+            plan.process({"entity_id": 1, "unknown": 1})
@@ -91,6 +91,9 @@ class EntityValidator:
         if not self.__entity_type_repository.get(entity_type):
             raise serializers.ValidationError('Entity type does not exist')
 
+    def validate_fields(self, fields: list) -> None:
+        self.__validate_fields(fields)
+
     def validate_request_data(self, request_data: RequestData) -> None:
 
         self.__validate_name(request_data.name)
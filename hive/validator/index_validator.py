@@ -0,0 +1,92 @@
+import re
+
+from rest_framework import serializers
+
+from hive.di.entity_field_type_provider import EntityFieldTypeProvider
+
+
+class IndexValidator:
+    METHODS = ('btree', 'hash', 'gin')
+    OPERATORS = ('eq', 'gt', 'gte', 'lt', 'lte', 'in')
+    NAME_PATTERN = re.compile(r'^[a-z_][a-z0-9_]{0,62}$')
+
+    def __init__(self, entity_field_type_provider: EntityFieldTypeProvider):
+        self.__entity_field_type_provider = entity_field_type_provider
+
+    def validate(self, table_name: str, index, fields: list, indexes: list) -> dict:
+        """Checks an index definition against the entity fields and returns it in its stored form."""
+        if not isinstance(index, dict):
+            raise serializers.ValidationError('Index is not a dictionary')
+        columns = index.get('fields')
+        if not isinstance(columns, list) or not columns or not all(isinstance(name, str) for name in columns):
+            raise serializers.ValidationError('Invalid value - the "fields" of an index must be a list of fields')
+        columns = [name.lower() for name in columns]
+        fields = {field['name']: field for field in fields}
+        for name in columns:
+            if name not in fields:
+                raise serializers.ValidationError(f'Invalid value - the index field {name} is not in the "fields" field')
+        if len(set(columns)) != len(columns):
+            raise serializers.ValidationError('Index fields are not unique')
+        method = str(index.get('method', 'btree')).lower()
+        unique = index.get('unique', False)
+        self.__validate_method(method, unique, columns, fields)
+        name = index.get('name') or self.__default_name(table_name, columns)
+        if not isinstance(name, str) or not self.NAME_PATTERN.match(name):
+            raise serializers.ValidationError(f'Invalid index name: {name}')
+        if any(item['name'] == name for item in indexes):
+            raise serializers.ValidationError(f'Index {name} already exists')
+        return {
+            'name': name,
+            'fields': columns,
+            'method': method,
+            'unique': unique,
+            'where': self.__validate_where(index.get('where') or {}, fields),
+        }
+
+    @staticmethod
+    def __validate_method(method: str, unique, columns: list, fields: dict):
+        if method not in IndexValidator.METHODS:
+            raise serializers.ValidationError(f'Invalid index method: {method}')
+        if not isinstance(unique, bool):
+            raise serializers.ValidationError('Invalid value - the "unique" field of an index must be a boolean')
+        if unique and method != 'btree':
+            raise serializers.ValidationError('Only btree indexes can be unique')
+        if method == 'hash' and len(columns) > 1:
+            raise serializers.ValidationError('Hash indexes support a single field only')
+        if method == 'gin' and any(fields[name]['type'] != 'str' for name in columns):
+            # trigram operator class, it speeds up prefix and substring searches on text
+            raise serializers.ValidationError('Gin indexes support str fields only')
+
+    def __validate_where(self, where, fields: dict) -> list:
+        if not isinstance(where, dict):
+            raise serializers.ValidationError('Invalid value - the "where" field of an index must be a dictionary')
+        conditions = []
+        for parameter, value in where.items():
+            name, _, operator = parameter.partition('__')
+            operator = operator or 'eq'
+            if name not in fields:
+                raise serializers.ValidationError(f'Invalid value - the index condition field {name} does not exist')
+            if operator not in self.OPERATORS:
+                raise serializers.ValidationError(f'Invalid index condition operator: {operator}')
+            if operator == 'in':
+                if not isinstance(value, list) or not value:
+                    raise serializers.ValidationError(f'Index condition {parameter} requires a list of values')
+                value = [self.__encode(fields[name], item) for item in value]
+            elif value is not None or operator != 'eq':
+                value = self.__encode(fields[name], value)
+            conditions.append([name, operator, value])
+        return conditions
+
+    def __encode(self, field: dict, value):
+        field_type = self.__entity_field_type_provider.get(field['type'])
+        try:
+            encoded = field_type.encode(value, field['config'])
+            encoded = value if encoded is None else encoded
+            field_type.validate_value(encoded, field['config'])
+        except (TypeError, ValueError, serializers.ValidationError):
+            raise serializers.ValidationError(f"Invalid value of index condition {field['name']}: {value}")
+        return encoded
+
+    @staticmethod
+    def __default_name(table_name: str, columns: list) -> str:
+        return f"{table_name}_{'_'.join(columns)}"[:59] + '_idx'
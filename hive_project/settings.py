@@ -13,6 +13,8 @@ import datetime
 import os.path
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -90,6 +92,35 @@ DATABASES = {
 
 }
 
+# Django turns prepared statements off, the storage repository prepares its statements once they are hot
+STATEMENT_PREPARE_THRESHOLD = int(os.getenv('STATEMENT_PREPARE_THRESHOLD', 5))
+DATABASES['default']['OPTIONS'] = {
+    'prepare_threshold': STATEMENT_PREPARE_THRESHOLD if STATEMENT_PREPARE_THRESHOLD >= 0 else None,
+}
+
+if DATABASES['default']['ENGINE'] == 'hive.db.postgresql':
+    DATABASES['default']['OPTIONS'].update({
+        'pool': {
+            'min_size': int(os.getenv('DATABASE_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.getenv('DATABASE_POOL_MAX_SIZE', 10)),
+            'max_lifetime': float(os.getenv('DATABASE_POOL_MAX_LIFETIME', 1800)),
+            'max_idle': float(os.getenv('DATABASE_POOL_MAX_IDLE', 600)),
+            'timeout': float(os.getenv('DATABASE_POOL_TIMEOUT', 30)),
+        },
+        'pgbouncer': os.getenv('DATABASE_PGBOUNCER', 'false').lower() in ('1', 'true', 'yes'),
+    })
+    if os.getenv('DATABASE_DIRECT_HOST'):
+        # PostgreSQL itself, past pgbouncer, for the entity change listener
+        DATABASES['default']['OPTIONS']['direct'] = {
+            'host': os.getenv('DATABASE_DIRECT_HOST'),
+            'port': int(os.getenv('DATABASE_DIRECT_PORT', 5432)),
+        }
+    elif DATABASES['default']['OPTIONS']['pgbouncer']:
+        # without the listener the cached entity definitions of a worker would never be refreshed
+        raise ImproperlyConfigured('DATABASE_PGBOUNCER needs DATABASE_DIRECT_HOST for the entity change listener')
+    # named cursors do not survive a transaction pooler handing the session to another client
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = DATABASES['default']['OPTIONS']['pgbouncer']
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -18,9 +18,19 @@ from django.urls import path
 from rest_framework.authtoken.views import obtain_auth_token
 from rest_framework_simplejwt import views as jwt_views
 
+from hive.controllers.aggregate_storage_controller import AggregateStorageController
+from hive.controllers.async_read_storage_controller import AsyncReadStorageController
+from hive.controllers.async_storage_controller import AsyncStorageController
+from hive.controllers.batch_storage_controller import BatchStorageController
 from hive.controllers.create_controller import CreateController
 from hive.controllers.delete_controller import DeleteController
+from hive.controllers.export_storage_controller import ExportStorageController
+from hive.controllers.index_controller import IndexController
+from hive.controllers.metrics_controller import MetricsController
+from hive.controllers.multiget_storage_controller import MultigetStorageController
+from hive.controllers.read_storage_controller import ReadStorageController
 from hive.controllers.storage_controller import StorageController
+from hive.controllers.trash_controller import TrashController
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('v1/entities', CreateController.as_view(), name='create-entity'),
@@ -29,4 +39,19 @@ urlpatterns = [
     path('api/token/', jwt_views.TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', jwt_views.TokenRefreshView.as_view(), name='token_refresh'),
     path('v1/entities/<str:entity_name>/records', StorageController.as_view(), name='create-record'),
+    path('v1/entities/<str:entity_name>/records:batch', BatchStorageController.as_view(), name='create-records-batch'),
+    path('v1/entities/<str:entity_name>/records:multiget', MultigetStorageController.as_view(),
+         name='multiget-records'),
+    path('v1/entities/<str:entity_name>/records:export', ExportStorageController.as_view(), name='export-records'),
+    path('v1/entities/<str:entity_name>/records/<path:keys>', ReadStorageController.as_view(), name='read-record'),
+    path('v1/entities/<str:entity_name>/aggregate', AggregateStorageController.as_view(), name='aggregate-records'),
+    path('v1/entities/<str:name>/indexes', IndexController.as_view(), name='entity-indexes'),
+    path('v1/entities/<str:name>/indexes/<str:index_name>', IndexController.as_view(), name='entity-index'),
+    path('v1/async/entities/<str:entity_name>/records', AsyncStorageController.as_view(),
+         name='async-create-record'),
+    path('v1/async/entities/<str:entity_name>/records/<path:keys>', AsyncReadStorageController.as_view(),
+         name='async-read-record'),
+    path('v1/trash', TrashController.as_view(), name='trash'),
+    path('v1/trash/<int:trash_id>', TrashController.as_view(), name='trashed-table'),
+    path('v1/metrics', MetricsController.as_view(), name='metrics'),
 ]
@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/4.1/howto/deployment/wsgi/
 
 import os
 
+from django.apps import apps
+from django.core.signals import request_started
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hive_project.settings')
 
 application = get_wsgi_application()
+
+# keep the entity caches of this worker in sync with changes made by other workers, the listener starts with the
+# first request so that every worker process started by a preloading server gets its own
+request_started.connect(apps.get_app_config('hive').base_container.entity_change_service().on_request_started,
+                        weak=False)